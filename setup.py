@@ -30,6 +30,7 @@ setup(
             "pdoc",
             "pre-commit",
         ],
+        "numpy": ["numpy"],
     },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
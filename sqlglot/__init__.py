@@ -10,6 +10,11 @@ import logging
 import typing as t
 
 from sqlglot import expressions as exp
+from sqlglot.cache import (
+    DiskStore as DiskStore,
+    OptimizeCache as OptimizeCache,
+    ParseCache as ParseCache,
+)
 from sqlglot.dialects.dialect import Dialect as Dialect, Dialects as Dialects
 from sqlglot.diff import diff as diff
 from sqlglot.errors import (
@@ -17,6 +22,7 @@ from sqlglot.errors import (
     ParseError as ParseError,
     TokenError as TokenError,
     UnsupportedError as UnsupportedError,
+    concat_messages,
 )
 from sqlglot.expressions import (
     Expression as Expression,
@@ -48,6 +54,7 @@ from sqlglot.tokens import Tokenizer as Tokenizer, TokenType as TokenType
 if t.TYPE_CHECKING:
     from sqlglot._typing import E
     from sqlglot.dialects.dialect import DialectType as DialectType
+    from sqlglot.tokens import Token
 
 logger = logging.getLogger("sqlglot")
 
@@ -66,6 +73,12 @@ pretty = False
 schema = MappingSchema()
 """The default schema used by SQLGlot (e.g. in the optimizer)."""
 
+parse_cache: t.Optional[ParseCache] = None
+"""The cache of syntax trees used by `parse` and `parse_one`, if any (see `ParseCache`)."""
+
+optimize_cache: t.Optional[OptimizeCache] = None
+"""The cache of optimized syntax trees used by the optimizer, if any (see `OptimizeCache`)."""
+
 
 def parse(sql: str, read: DialectType = None, **opts) -> t.List[t.Optional[Expression]]:
     """
@@ -80,6 +93,8 @@ def parse(sql: str, read: DialectType = None, **opts) -> t.List[t.Optional[Expre
         The resulting syntax tree collection.
     """
     dialect = Dialect.get_or_raise(read)()
+    if parse_cache is not None:
+        return parse_cache.parse(dialect, sql, **opts)
     return dialect.parse(sql, **opts)
 
 
@@ -111,7 +126,9 @@ def parse_one(
 
     dialect = Dialect.get_or_raise(read)()
 
-    if into:
+    if parse_cache is not None:
+        result = parse_cache.parse(dialect, sql, into=into, **opts)
+    elif into:
         result = dialect.parse_into(into, sql, **opts)
     else:
         result = dialect.parse(sql, **opts)
@@ -149,7 +166,227 @@ def transpile(
         The list of transpiled SQL statements.
     """
     write = (read if write is None else write) if identity else write
+    # A single generator is used for all statements, because some dialects carry state from one
+    # statement to the next, e.g. NuoDB qualifies tables with the schema of a CREATE DATABASE
+    generator = Dialect.get_or_raise(write)().generator(**opts)
     return [
-        Dialect.get_or_raise(write)().generate(expression, **opts)
+        generator.generate(expression, **opts)
         for expression in parse(sql, read, error_level=error_level)
     ]
+
+
+def transpile_stream(
+    sql: t.IO[str],
+    read: DialectType = None,
+    write: DialectType = None,
+    identity: bool = True,
+    error_level: t.Optional[ErrorLevel] = None,
+    chunk_size: int = 1024 * 1024,
+    **opts,
+) -> t.Iterator[str]:
+    """
+    Lazily transpiles the SQL statements read from a file-like object, one statement at a time.
+
+    Unlike `transpile`, the input is never fully loaded into memory: each statement is tokenized,
+    parsed and generated before the next one is read, so memory usage is bounded by the size of
+    the largest statement rather than the size of the input. This is useful for converting large
+    scripts, such as database dumps.
+
+    Example:
+        >>> import io
+        >>> list(transpile_stream(io.StringIO("SELECT 1; SELECT 2"), write="spark"))
+        ['SELECT 1', 'SELECT 2']
+
+    Args:
+        sql: a file-like object opened in text mode, from which the SQL code is read.
+        read: the source dialect used to parse the input string (eg. "spark", "hive", "presto", "mysql").
+        write: the target dialect into which the input should be transformed (eg. "spark", "hive", "presto", "mysql").
+        identity: if set to `True` and if the target dialect is not specified the source dialect will be used as both:
+            the source and the target dialect.
+        error_level: the desired error level of the parser.
+        chunk_size: the number of characters to read from `sql` at a time.
+        **opts: other `sqlglot.generator.Generator` options.
+
+    Yields:
+        The transpiled SQL statements, in the same order as they appear in the input.
+    """
+    write = (read if write is None else write) if identity else write
+    generator = Dialect.get_or_raise(write)().generator(**opts)
+    for expression in Dialect.get_or_raise(read)().parse_stream(
+        sql, chunk_size=chunk_size, error_level=error_level
+    ):
+        yield generator.generate(expression, **opts)
+
+
+def transpile_parallel(
+    sql: str,
+    read: DialectType = None,
+    write: DialectType = None,
+    identity: bool = True,
+    error_level: t.Optional[ErrorLevel] = None,
+    workers: t.Optional[int] = None,
+    batch_size: t.Optional[int] = None,
+    **opts,
+) -> t.List[str]:
+    """
+    Like `transpile`, but the statements are parsed and generated by a pool of worker processes.
+
+    The input is tokenized once in order to find the top-level semicolons, and the tokens of the
+    statements between them are sent to the workers in batches, so that they're only parsed and
+    generated there. The transpiled statements are returned in the same order as they appear in
+    the input. Since each batch is transpiled by a different generator, this is only suitable for
+    inputs whose statements are independent of each other. The tokenization still happens serially
+    in the calling process, which also pickles the tokens of every statement, so the speedup is
+    bounded by the time spent parsing and generating, rather than by the number of workers.
+
+    Errors are reported per statement, with the same line and column numbers that they would have
+    if the whole input was parsed at once: with `ErrorLevel.IMMEDIATE` the error of the first
+    invalid statement is raised, whereas with `ErrorLevel.RAISE` a single error that contains the
+    errors of all invalid statements is raised. If the input can't be tokenized, the statements
+    that precede the one that can't be tokenized are still transpiled. When that's the only error,
+    e.g. with `ErrorLevel.WARN`, it's raised as a `ValueError`, like `transpile` does.
+
+    Args:
+        sql: the SQL code string to transpile.
+        read: the source dialect used to parse the input string (eg. "spark", "hive", "presto", "mysql").
+        write: the target dialect into which the input should be transformed (eg. "spark", "hive", "presto", "mysql").
+        identity: if set to `True` and if the target dialect is not specified the source dialect will be used as both:
+            the source and the target dialect.
+        error_level: the desired error level of the parser.
+        workers: the number of worker processes, which defaults to the number of CPUs.
+        batch_size: the number of statements sent to a worker at a time. By default, the
+            statements are split into a few batches per worker.
+        **opts: other `sqlglot.generator.Generator` options.
+
+    Returns:
+        The list of transpiled SQL statements.
+    """
+    import math
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    write = (read if write is None else write) if identity else write
+    error_level = error_level or ErrorLevel.IMMEDIATE
+    tokenizer = Dialect.get_or_raise(read)().tokenizer_class()
+    token_error: t.Optional[ValueError] = None
+
+    try:
+        tokens = tokenizer.tokenize(sql)
+    except ValueError as e:
+        # The tokens that precede the error are kept, so that the statements they make up can
+        # still be transpiled, and the error is reported as the error of the last statement
+        tokens = t.cast("t.List[Token]", tokenizer.tokens)
+        token_error = e
+
+    # Statements are split the same way Parser._parse does it. Their tokens' offsets are made
+    # relative to their own SQL string, so that only that string needs to be sent to a worker.
+    statements: t.List[t.Tuple[str, _PackedTokens]] = []
+    start = 0
+    statement: t.List[Token] = []
+
+    for token in tokens:
+        statement.append(token)
+
+        if token.token_type == TokenType.SEMICOLON:
+            statements.append((sql[start : token.end + 1], _pack_tokens(statement, start)))
+            start = token.end + 1
+            statement = []
+
+    if token_error is None and (not tokens or tokens[-1].token_type != TokenType.SEMICOLON):
+        statements.append((sql[start:], _pack_tokens(statement, start)))
+
+    workers = workers or os.cpu_count() or 1
+    batch_size = batch_size or math.ceil(len(statements) / (workers * 4))
+    batches = [statements[i : i + batch_size] for i in range(0, len(statements), batch_size)]
+    transpile_batch = partial(_transpile_batch, read, write, error_level, opts)
+
+    if workers == 1 or len(batches) == 1:
+        results = [transpile_batch(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(transpile_batch, batches))
+
+    transpiled = []
+    errors: t.List[Exception] = []
+    statement_results = [result for batch in results for result in batch]
+
+    if token_error:
+        statement_results.append((None, token_error))
+
+    for result, error in statement_results:
+        if error:
+            if error_level == ErrorLevel.IMMEDIATE:
+                raise error
+            errors.append(error)
+        else:
+            transpiled.append(t.cast(str, result))
+
+    if len(errors) == 1:
+        raise errors[0]
+    if errors:
+        raise ParseError(
+            concat_messages(errors, 3),
+            errors=[
+                e_dict
+                for error in errors
+                for e_dict in (
+                    error.errors if isinstance(error, ParseError) else [{"description": str(error)}]
+                )
+            ],
+        )
+
+    return transpiled
+
+
+# The attributes of a list of tokens, one list per attribute, which are much faster to pickle
+_PackedTokens = t.Tuple[
+    t.List[TokenType],
+    t.List[str],
+    t.List[int],
+    t.List[int],
+    t.List[int],
+    t.List[int],
+    t.List[t.List[str]],
+]
+
+
+def _pack_tokens(tokens: t.List[Token], offset: int) -> _PackedTokens:
+    return (
+        [token.token_type for token in tokens],
+        [token.text for token in tokens],
+        [token.line for token in tokens],
+        [token.col for token in tokens],
+        [token.start - offset for token in tokens],
+        [token.end - offset for token in tokens],
+        [token.comments for token in tokens],
+    )
+
+
+def _unpack_tokens(packed: _PackedTokens) -> t.List[Token]:
+    from sqlglot.tokens import Token
+
+    return [Token(*attributes) for attributes in zip(*packed)]
+
+
+def _transpile_batch(
+    read: DialectType,
+    write: DialectType,
+    error_level: ErrorLevel,
+    opts: t.Dict[str, t.Any],
+    statements: t.List[t.Tuple[str, _PackedTokens]],
+) -> t.List[t.Tuple[t.Optional[str], t.Optional[Exception]]]:
+    dialect = Dialect.get_or_raise(read)()
+    generator = Dialect.get_or_raise(write)().generator(**opts)
+    parser = dialect.parser(error_level=error_level)
+    results: t.List[t.Tuple[t.Optional[str], t.Optional[Exception]]] = []
+
+    for sql, packed in statements:
+        try:
+            expressions = parser.parse(_unpack_tokens(packed), sql)
+        except ParseError as e:
+            results.append((None, e))
+        else:
+            results.append((generator.generate(expressions[0], **opts), None))
+
+    return results
@@ -5,6 +5,7 @@ import sys
 import typing as t
 
 import sqlglot
+from sqlglot.optimizer import RuleProfile
 
 parser = argparse.ArgumentParser(description="Transpile SQL")
 parser.add_argument(
@@ -51,6 +52,18 @@ parser.add_argument(
     action="store_true",
     help="Tokenize and return the tokens list",
 )
+parser.add_argument(
+    "--optimize",
+    dest="optimize",
+    action="store_true",
+    help="Optimize the statements before transpiling them",
+)
+parser.add_argument(
+    "--profile",
+    dest="profile",
+    action="store_true",
+    help="Print the time spent in each optimizer rule to stderr, implies --optimize",
+)
 parser.add_argument(
     "--error-level",
     dest="error_level",
@@ -63,10 +76,15 @@ parser.add_argument(
 args = parser.parse_args()
 error_level = sqlglot.ErrorLevel[args.error_level.upper()]
 
-sql = sys.stdin.read() if args.sql == "-" else args.sql
+optimize = args.optimize or args.profile
+profiles: t.List[RuleProfile] = []
+
+sql = (
+    sys.stdin.read() if args.sql == "-" and (args.parse or args.tokenize or optimize) else args.sql
+)
 
 if args.parse:
-    objs: t.Union[t.List[str], t.List[sqlglot.tokens.Token]] = [
+    objs: t.Iterable[t.Union[str, sqlglot.tokens.Token]] = [
         repr(expression)
         for expression in sqlglot.parse(
             sql,
@@ -76,6 +94,26 @@ if args.parse:
     ]
 elif args.tokenize:
     objs = sqlglot.Dialect.get_or_raise(args.read)().tokenize(sql)
+elif optimize:
+    objs = [
+        sqlglot.optimizer.optimize(
+            expression,
+            dialect=args.read,
+            profile=profiles.append if args.profile else None,
+        ).sql(dialect=args.write, identify=args.identify, pretty=args.pretty)
+        for expression in sqlglot.parse(sql, read=args.read, error_level=error_level)
+        if expression
+    ]
+elif args.sql == "-":
+    # Stdin is transpiled one statement at a time, so that large inputs aren't loaded into memory
+    objs = sqlglot.transpile_stream(
+        sys.stdin,
+        read=args.read,
+        write=args.write,
+        identify=args.identify,
+        pretty=args.pretty,
+        error_level=error_level,
+    )
 else:
     objs = sqlglot.transpile(
         sql,
@@ -88,3 +126,29 @@ else:
 
 for obj in objs:
     print(obj)
+
+if profiles:
+    # The profiles of each rule are summed over all of the statements
+    rows = [("rule", "time (ms)", "nodes before", "nodes after", "scopes")]
+
+    for rule in dict.fromkeys(profile.rule for profile in profiles):
+        rule_profiles = [profile for profile in profiles if profile.rule == rule]
+        rows.append(
+            (
+                rule,
+                f"{sum(profile.time for profile in rule_profiles) * 1000:.3f}",
+                str(sum(profile.nodes_before for profile in rule_profiles)),
+                str(sum(profile.nodes_after for profile in rule_profiles)),
+                str(sum(profile.scopes for profile in rule_profiles)),
+            )
+        )
+
+    rows.append(("total", f"{sum(profile.time for profile in profiles) * 1000:.3f}", "", "", ""))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+
+    for name, *values in rows:
+        print(
+            name.ljust(widths[0]),
+            *(value.rjust(width) for value, width in zip(values, widths[1:])),
+            file=sys.stderr,
+        )
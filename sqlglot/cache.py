@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import abc
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import typing as t
+from collections import OrderedDict
+
+from sqlglot import expressions as exp, serde
+
+if t.TYPE_CHECKING:
+    from sqlglot.dialects.dialect import Dialect, DialectType
+    from sqlglot.schema import Schema
+
+    ParseResult = t.List[t.Optional[exp.Expression]]
+
+
+class ParseCache:
+    """
+    A size-bounded cache of syntax trees, keyed by the SQL string, the dialect and the parser
+    options that produced them. The least recently used entries are evicted first.
+
+    The cache is used by `sqlglot.parse`, `sqlglot.parse_one` and the functions that call them,
+    such as `sqlglot.transpile` and `sqlglot.expressions.maybe_parse`, when it's assigned to
+    `sqlglot.parse_cache`:
+
+        >>> import sqlglot
+        >>> sqlglot.parse_cache = ParseCache(max_entries=100)
+        >>> _ = sqlglot.parse_one("SELECT 1"), sqlglot.parse_one("SELECT 1")
+        >>> sqlglot.parse_cache.stats()
+        {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'size': 8}
+        >>> sqlglot.parse_cache = None
+
+    Callers receive copies of the cached trees, so that they can freely mutate them. Inputs that
+    fail to parse or produce any errors aren't cached. The cache can be used from multiple threads.
+
+    Args:
+        max_entries: the maximum number of SQL strings whose trees are cached.
+        max_size: the maximum total length of the cached SQL strings, which is a proxy for the
+            memory used by their trees. By default, the size is unbounded.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_size: t.Optional[int] = None) -> None:
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries: OrderedDict[t.Hashable, t.Tuple[ParseResult, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> t.Dict[str, int]:
+        """Returns the cache's counters, along with its current number of entries and size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size": self.size,
+        }
+
+    def clear(self) -> None:
+        """Removes all the entries of the cache and resets its counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.size = 0
+
+    def parse(
+        self,
+        dialect: Dialect,
+        sql: str,
+        into: t.Optional[exp.IntoType] = None,
+        **opts,
+    ) -> ParseResult:
+        """
+        Returns copies of the syntax trees of `sql`, parsing it with `dialect` if it isn't cached.
+
+        Args:
+            dialect: the dialect used to tokenize and parse `sql`.
+            sql: the SQL code string to parse.
+            into: the SQLGlot Expression type(s) to parse `sql` into, if any.
+            **opts: other `sqlglot.parser.Parser` options.
+
+        Returns:
+            The resulting syntax tree collection.
+        """
+        try:
+            key: t.Optional[t.Hashable] = (
+                sql,
+                type(dialect),
+                tuple(into) if isinstance(into, list) else into,
+                frozenset((k, v) for k, v in opts.items() if v is not None),
+            )
+            hash(key)
+        except TypeError:
+            key = None
+
+        if key is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            if entry:
+                return _copy(entry[0])
+
+        parser = dialect.parser(**opts)
+        tokens = dialect.tokenize(sql)
+        expressions = parser.parse_into(into, tokens, sql) if into else parser.parse(tokens, sql)
+
+        if key is not None and not parser.errors:
+            self._put(key, _copy(expressions), len(sql))
+
+        return expressions
+
+    def _put(self, key: t.Hashable, expressions: ParseResult, size: int) -> None:
+        if self.max_size is not None and size > self.max_size:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.size -= previous[1]
+
+            self._entries[key] = (expressions, size)
+            self.size += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_size is not None and self.size > self.max_size
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+
+def _copy(expressions: ParseResult) -> ParseResult:
+    return [expression.copy() if expression else None for expression in expressions]
+
+
+class OptimizeStore(abc.ABC):
+    """
+    A persistent store of optimized syntax trees, serialized as JSON strings, which backs an
+    `OptimizeCache` so that processes can reuse the optimizations of the ones that ran before.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> t.Optional[str]:
+        """Returns the serialized tree that's stored under `key`, if any."""
+
+    @abc.abstractmethod
+    def put(self, key: str, value: str) -> None:
+        """Stores a serialized tree under `key`."""
+
+
+class DiskStore(OptimizeStore):
+    """
+    Stores each optimized syntax tree in its own file in a directory. The files are written
+    atomically, so that the store can be shared by concurrent processes.
+
+    Args:
+        directory: the directory of the store, which is created if it doesn't exist.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> t.Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        fd, path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(value)
+            os.replace(path, self._path(key))
+        except BaseException:
+            os.remove(path)
+            raise
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+
+class OptimizeCache:
+    """
+    A size-bounded cache of optimized syntax trees, keyed by a fingerprint of the syntax tree that
+    was optimized, the dialect, the optimizer rules and options and the schema. The least recently
+    used entries are evicted first.
+
+    The cache is used by `sqlglot.optimizer.optimize` when it's assigned to
+    `sqlglot.optimize_cache`:
+
+        >>> import sqlglot
+        >>> from sqlglot.optimizer import optimize
+        >>> sqlglot.optimize_cache = OptimizeCache(max_entries=100)
+        >>> _ = optimize("SELECT a FROM x"), optimize("select a from x")
+        >>> sqlglot.optimize_cache.stats()
+        {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 1, 'store_hits': 0}
+        >>> sqlglot.optimize_cache = None
+
+    The fingerprints don't depend on the process, so the entries can also be written to a
+    persistent `OptimizeStore`, such as a `DiskStore`, from which the misses are read back.
+
+    The schema is fingerprinted by `Schema.fingerprint`, which is only computed again once the
+    schema's version has changed, e.g. after `MappingSchema.add_table`. Queries that are optimized
+    against schemas that can't be fingerprinted, or with rules or options that can't be identified
+    across processes, e.g. lambdas, aren't cached.
+
+    Callers receive copies of the cached trees, so that they can freely mutate them. The cache can
+    be used from multiple threads.
+
+    Args:
+        max_entries: the maximum number of optimized trees that are cached in memory.
+        store: an optional persistent store for the optimized trees.
+    """
+
+    def __init__(self, max_entries: int = 1024, store: t.Optional[OptimizeStore] = None) -> None:
+        self.max_entries = max_entries
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.store_hits = 0
+        self._entries: OrderedDict[str, exp.Expression] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> t.Dict[str, int]:
+        """Returns the cache's counters, along with its current number of entries."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "store_hits": self.store_hits,
+        }
+
+    def clear(self) -> None:
+        """Removes all the entries of the cache, but not of its store, and resets its counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.store_hits = 0
+
+    def key(
+        self,
+        expression: exp.Expression,
+        dialect: DialectType,
+        rules: t.Sequence[t.Callable],
+        schema: Schema,
+        **options: t.Any,
+    ) -> t.Optional[str]:
+        """
+        Returns the key of the optimization of a syntax tree, or None if it can't be cached.
+
+        Args:
+            expression: the syntax tree to optimize.
+            dialect: the dialect of the syntax tree.
+            rules: the optimizer rules.
+            schema: the schema that the syntax tree is optimized against.
+            **options: the other options of the optimizer, which must be serializable as JSON.
+        """
+        from sqlglot.dialects.dialect import Dialect
+
+        fingerprint = schema.fingerprint()
+        rule_names = [f"{rule.__module__}.{rule.__qualname__}" for rule in rules]
+
+        if fingerprint is None or any("<" in name for name in rule_names):
+            return None
+
+        dialect_class = Dialect.get_or_raise(dialect)
+
+        try:
+            key = json.dumps(
+                [
+                    serde.dump(expression),
+                    f"{dialect_class.__module__}.{dialect_class.__qualname__}",
+                    rule_names,
+                    fingerprint,
+                    options,
+                ],
+                sort_keys=True,
+            )
+        except (TypeError, ValueError):
+            return None
+
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str) -> t.Optional[exp.Expression]:
+        """Returns a copy of the optimized syntax tree that's cached under `key`, if any."""
+        with self._lock:
+            expression = self._entries.get(key)
+            if expression is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if expression is not None:
+            return expression.copy()
+
+        value = self.store.get(key) if self.store is not None else None
+
+        if value is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        expression = t.cast(exp.Expression, serde.load(json.loads(value)))
+
+        with self._lock:
+            self.hits += 1
+            self.store_hits += 1
+
+        self._put(key, expression.copy())
+        return expression
+
+    def put(self, key: str, expression: exp.Expression) -> None:
+        """Caches a copy of an optimized syntax tree under `key`, and writes it to the store."""
+        if self.store is not None:
+            self.store.put(key, json.dumps(serde.dump(expression)))
+
+        self._put(key, expression.copy())
+
+    def _put(self, key: str, expression: exp.Expression) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = expression
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
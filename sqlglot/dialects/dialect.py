@@ -278,6 +278,13 @@ class Dialect(metaclass=_Dialect):
     def parse(self, sql: str, **opts) -> t.List[t.Optional[exp.Expression]]:
         return self.parser(**opts).parse(self.tokenize(sql), sql)
 
+    def parse_stream(
+        self, sql: t.IO[str], chunk_size: int = 1024 * 1024, **opts
+    ) -> t.Iterator[t.Optional[exp.Expression]]:
+        parser = self.parser(**opts)
+        for tokens, text in self.tokenizer_class().tokenize_stream(sql, chunk_size=chunk_size):
+            yield from parser.parse(tokens, text)
+
     def parse_into(
         self, expression_type: exp.IntoType, sql: str, **opts
     ) -> t.List[t.Optional[exp.Expression]]:
@@ -287,7 +294,8 @@ class Dialect(metaclass=_Dialect):
         return self.generator(**opts).generate(expression, **opts)
 
     def transpile(self, sql: str, **opts) -> t.List[str]:
-        return [self.generate(expression, **opts) for expression in self.parse(sql)]
+        generator = self.generator(**opts)
+        return [generator.generate(expression, **opts) for expression in self.parse(sql)]
 
     def tokenize(self, sql: str) -> t.List[Token]:
         return self.tokenizer.tokenize(sql)
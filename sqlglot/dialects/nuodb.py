@@ -1,13 +1,12 @@
 from __future__ import annotations
 
+import typing as t
+
 from sqlglot import exp, generator, parser, tokens, transforms
 from sqlglot.dialects.dialect import Dialect, no_comment_column_constraint_sql
 from sqlglot.errors import UnsupportedError
 from sqlglot.tokens import Tokenizer, TokenType
 
-global schema_name
-schema_name = None
-
 
 def _parse_introducer(self: generator.Generator, expression: exp.Expression) -> exp.Expression:
     expression.args["this"] = None
@@ -64,10 +63,10 @@ def no_properties_sql(self: generator.Generator, expression: exp.Properties) ->
     self.unsupported("Properties unsupported")
     return ""
 
-def _parse_fk(self: generator.Generator, expression: exp.Expression) -> exp.Expression | None:
+def _parse_fk(self: NuoDB.Generator, expression: exp.Expression) -> exp.Expression | None:
     if expression.parent:
         if isinstance(expression.parent.parent, exp.Create):
-            global schema_name
+            schema_name = self.schema_name
             index_foreign_key_sql = ""
             alter_table = ""
             key_name = ""
@@ -134,17 +133,17 @@ def _parse_fk(self: generator.Generator, expression: exp.Expression) -> exp.Expr
                 index_name = index_name.replace('"', "")
                 index_foreign_key_sql = f"CREATE INDEX {index_name} ON {tbl_name} ({column_name})"
                 expression.parent.set("foreign_key_index", index_foreign_key_sql)
-    if generator.exclude_fk_constraint:
+    if self.fk_constraint_in_create:
         return None
 
     return expression
 
 def _parse_foreign_key_index(
-    self: generator.Generator, expression: exp.Expression
+    self: NuoDB.Generator, expression: exp.Expression
 ) -> exp.Expression | None:
     if expression.parent:
         if isinstance(expression.parent.parent, exp.Create):
-            global schema_name
+            schema_name = self.schema_name
             index_foreign_key_sql = ""
             alter_table = ""
             key_name = ""
@@ -210,7 +209,7 @@ def _parse_foreign_key_index(
                 index_name = index_name.replace('"', "")
                 index_foreign_key_sql = f"CREATE INDEX {index_name} ON {tbl_name} ({column_name})"
                 expression.parent.set("foreign_key_index", index_foreign_key_sql)
-    if generator.exclude_fk_constraint:
+    if self.fk_constraint_in_create:
         return None
 
     return expression
@@ -334,11 +333,10 @@ def _parse_partition_range(self: generator.Generator, expression: exp.Expression
                 processed_functions.add(fun)
 
 
-def replace_db_to_schema(self: generator.Generator, expression: exp.Create) -> str:
+def replace_db_to_schema(self: NuoDB.Generator, expression: exp.Create) -> str:
     if isinstance(expression, (exp.Create)) and expression.args["kind"] == "DATABASE":
         expression.args["kind"] = "SCHEMA"
-        global schema_name
-        schema_name = expression.args["this"]
+        self.schema_name = expression.args["this"]
 
     isinstance(expression.this, exp.Schema)
     is_partitionable = expression.args.get("kind") in ("TABLE", "VIEW")
@@ -378,7 +376,6 @@ def _parse_unique(self: generator.Generator, expression: exp.Expression) -> str:
 def _remove_collate(expression: exp.Expression) -> exp.Expression:
     column_constraint = expression.find(exp.ColumnConstraint)
     if column_constraint:
-        expression = expression.copy()
         collateProp = column_constraint.find(exp.CollateColumnConstraint)
         charsetProp = column_constraint.find(exp.CharacterSetColumnConstraint)
         onUpdateColumnConstraint = column_constraint.find(exp.OnUpdateColumnConstraint)
@@ -509,6 +506,14 @@ class NuoDB(Dialect):
             )
 
     class Generator(generator.Generator):
+        def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+            super().__init__(*args, **kwargs)
+
+            # The schema created by the last CREATE DATABASE statement generated by this instance,
+            # which qualifies the tables of the foreign key constraints that are moved out of the
+            # CREATE TABLE statements that follow it
+            self.schema_name: t.Optional[exp.Expression] = None
+
         TRANSFORMS = {
             **generator.Generator.TRANSFORMS,
             exp.ColumnDef: transforms.preprocess([_auto_increment_to_generated_by_default]),
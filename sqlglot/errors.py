@@ -37,6 +37,10 @@ class ParseError(SqlglotError):
         super().__init__(message)
         self.errors = errors or []
 
+    def __reduce__(self) -> t.Tuple[t.Any, ...]:
+        # Keep the errors when pickling, e.g. when they're raised in another process
+        return (self.__class__, (*self.args, self.errors))
+
     @classmethod
     def new(
         cls,
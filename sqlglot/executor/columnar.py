@@ -0,0 +1,934 @@
+"""
+A columnar execution engine for `sqlglot.executor`, which requires NumPy (`pip install
+"sqlglot[numpy]"`).
+
+Instead of evaluating each expression once per row, like `PythonExecutor` does, this engine stores
+every column of a table in a NumPy array and evaluates each expression once per step, on whole
+columns. Expressions are compiled by the `Columnar` dialect, which produces the same code as the
+`Python` dialect, except that the functions it calls operate on arrays. Whenever an operation
+can't be vectorized, e.g. because a column contains NULLs, the corresponding scalar function of
+`sqlglot.executor.env` is applied to each value instead, so the results are the same as the
+ones of `PythonExecutor`, up to the order of the rows of unordered results.
+
+Only the evaluation of expressions is vectorized: planning, hashing rows for joins and
+aggregations, and converting the results back to rows still run in Python. As a result, queries
+over large tables typically run about 1.5x faster end to end than with `PythonExecutor`, while
+small queries can be slower.
+
+It's used by passing `engine="columnar"` to `sqlglot.executor.execute`.
+
+----
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import re
+import typing as t
+
+import numpy as np
+
+from sqlglot import exp
+from sqlglot.executor.env import ENV, reverse_key
+from sqlglot.executor.python import Python, PythonExecutor, _hashable, _rename
+from sqlglot.executor.table import MAPPED_FORMATS, MappedTable, Table
+
+# Arrays of these kinds (bool, int, uint, float, datetime, timedelta) support arithmetic
+_NUMERIC_KINDS = "biufmM"
+# Arrays of these kinds can also be compared, sorted and grouped without Python objects
+_NATIVE_KINDS = "biufmMU"
+_UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+class ColumnarTable:
+    """
+    A table whose columns are stored in NumPy arrays of the same length.
+
+    Columns can also be given as functions that return their array, in which case they're only
+    computed when they're first accessed. This way, scans of large tables only convert the columns
+    that are actually referenced, and filters only copy the rows of these columns.
+    """
+
+    def __init__(
+        self,
+        columns: t.Iterable[str],
+        arrays: t.Iterable[np.ndarray | t.Callable[[], np.ndarray]],
+        length: int,
+    ) -> None:
+        self.columns = tuple(columns)
+        self.length = length
+        self._arrays = list(arrays)
+        self._index = {column: i for i, column in enumerate(self.columns)}
+
+    @classmethod
+    def from_rows(cls, columns: t.Iterable[str], rows: t.Sequence[t.Tuple]) -> ColumnarTable:
+        columns = tuple(columns)
+        return cls(
+            columns,
+            (
+                (lambda i: lambda: to_array([row[i] for row in rows]))(i)
+                for i in range(len(columns))
+            ),
+            len(rows),
+        )
+
+    @classmethod
+    def from_table(cls, table: Table) -> ColumnarTable:
+        if isinstance(table, MappedTable):
+            return cls(
+                table.columns,
+                (
+                    (lambda layout: lambda: mapped_array(table, layout))(layout)
+                    for layout in table.header["layout"]
+                ),
+                len(table),
+            )
+        return cls.from_rows(table.columns, table.rows)
+
+    @classmethod
+    def combine(cls, tables: t.Sequence[ColumnarTable]) -> ColumnarTable:
+        """Returns a table with the columns of all the given tables, which have the same length."""
+        return cls(
+            (column for table in tables for column in table.columns),
+            (
+                (lambda table, i: lambda: table.array(i))(table, i)
+                for table in tables
+                for i in range(len(table.columns))
+            ),
+            len(tables[0]),
+        )
+
+    @property
+    def arrays(self) -> t.List[np.ndarray]:
+        return [self.array(i) for i in range(len(self._arrays))]
+
+    def array(self, index: int) -> np.ndarray:
+        array = self._arrays[index]
+        if not isinstance(array, np.ndarray):
+            array = self._arrays[index] = array()
+        return array
+
+    def to_table(self) -> Table:
+        rows = list(zip(*(array.tolist() for array in self.arrays)))
+        return Table(self.columns, rows if self.columns else [()] * self.length)
+
+    def take(self, indices: np.ndarray) -> ColumnarTable:
+        """Returns a table with the given rows. Rows whose index is -1 are filled with NULLs."""
+        missing = indices < 0
+        nulls = bool(missing.any())
+
+        def take(index: int) -> np.ndarray:
+            array = self.array(index)
+            if not nulls:
+                return array[indices]
+            array = array.astype(object)[indices] if len(array) else _nulls(len(indices))
+            array[missing] = None
+            return array
+
+        return ColumnarTable(
+            self.columns,
+            ((lambda i: lambda: take(i))(i) for i in range(len(self._arrays))),
+            len(indices),
+        )
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.array(self._index[column])
+
+    def __len__(self) -> int:
+        return self.length
+
+
+class ColumnarContext:
+    """The tables that are visible in a step, by name."""
+
+    def __init__(self, tables: t.Dict[t.Optional[str], ColumnarTable]) -> None:
+        self.tables = tables
+
+    def __len__(self) -> int:
+        return len(next(iter(self.tables.values()))) if self.tables else 1
+
+    def __contains__(self, table: str) -> bool:
+        return table in self.tables
+
+
+class ColumnarExecutor(PythonExecutor):
+    def __init__(self, env=None, tables=None, workers=1, schema=None, memory_limit=None):
+        if memory_limit is not None:
+            raise ValueError("The columnar engine doesn't support a memory limit")
+        super().__init__(env=env, tables=tables, workers=workers, schema=schema)
+        self.generator = Columnar().generator(identify=True, comments=False)
+        self.env = {**COLUMNAR_ENV, **(env or {})}
+        self._columnar_tables: t.Dict[int, ColumnarTable] = {}
+
+    def execute(self, plan):
+        with np.errstate(all="ignore"):
+            return super().execute(plan).to_table()
+
+    def _execute_step(self, node, tables):
+        # the error state is local to each thread, so it's set for every step
+        with np.errstate(all="ignore"):
+            return super()._execute_step(node, tables)
+
+    def context(self, tables):
+        return ColumnarContext(tables)
+
+    def generate(self, expression):
+        code = super().generate(expression)
+
+        # Lambdas are called with the values of other columns in the same row, so they can't be
+        # vectorized and the expressions that contain them are evaluated one row at a time
+        if code and expression.find(exp.Lambda):
+            return RowCode(code)
+        return code
+
+    def evaluate(self, code, context, length, env=None):
+        """Evaluates compiled code against the tables of a context, as an array of `length`."""
+        if not length:
+            # Like in PythonExecutor, expressions aren't evaluated if there are no rows
+            return to_array([])
+
+        env = {**(env or self.env), "scope": context.tables}
+
+        if isinstance(code, RowCode):
+            readers = {name: RowReader(table) for name, table in context.tables.items()}
+            env["scope"] = readers
+            values = []
+
+            for i in range(length):
+                for reader in readers.values():
+                    reader.index = i
+                values.append(eval(code.code, env))
+
+            return to_array(values)
+
+        return broadcast(eval(code, env), length)
+
+    def scan(self, step, context):
+        source = step.source
+
+        if source and isinstance(source, exp.Expression):
+            source = source.name or source.alias
+
+        if source is None:
+            # the single row is filtered along with the context, e.g. by a WHERE FALSE
+            table = ColumnarTable((), (), 1)
+            context = self.context({None: table})
+        elif source in context:
+            if not step.projections and not step.condition:
+                return self.context({step.name: context.tables[source]})
+            table = context.tables[source]
+        elif isinstance(step.source, exp.Table) and isinstance(step.source.this, exp.ReadCSV):
+            table = self.scan_csv(step)
+            context = self.context({step.source.alias: table})
+        else:
+            table = self.columnar(self.tables.find(step.source))
+            context = self.context({step.source.alias_or_name: table})
+
+        return self.context({step.name: self._project_and_filter(context, step, table)})
+
+    def columnar(self, table: Table) -> ColumnarTable:
+        key = id(table)
+        if key not in self._columnar_tables:
+            self._columnar_tables[key] = ColumnarTable.from_table(table)
+        return self._columnar_tables[key]
+
+    def _select(self, context, condition, limit=math.inf):
+        """Returns the indices of the rows that satisfy a condition, or None if all of them do."""
+        length = len(context)
+        indices = None
+
+        if condition:
+            indices = np.flatnonzero(truth(self.evaluate(condition, context, length)))
+        if limit < length:
+            indices = (np.arange(length) if indices is None else indices)[: int(limit)]
+
+        return indices
+
+    def _filter(self, context, condition, limit=math.inf):
+        indices = self._select(context, condition, limit)
+        if indices is None:
+            return context
+        return self.context({name: table.take(indices) for name, table in context.tables.items()})
+
+    def _project(self, context, projections):
+        length = len(context)
+        return ColumnarTable(
+            (p.alias_or_name for p in projections),
+            (self.evaluate(self.generate(p), context, length) for p in projections),
+            length,
+        )
+
+    def _project_and_filter(self, context, step, table):
+        if not step.projections:
+            indices = self._select(context, self.generate(step.condition), step.limit)
+            return table if indices is None else table.take(indices)
+
+        context = self._filter(context, self.generate(step.condition), step.limit)
+        return self._project(context, step.projections)
+
+    def scan_csv(self, step):
+        chunks = self._csv_chunks(step)
+        columns = next(chunks)
+        arrays: t.List[t.List[np.ndarray]] = [[] for _ in columns]
+
+        for chunk in chunks:
+            for column, array in zip(arrays, chunk):
+                column.append(array)
+
+        return ColumnarTable(
+            columns,
+            (concat_all(column) if column else to_array([]) for column in arrays),
+            sum(len(array) for array in arrays[0]) if arrays else 0,
+        )
+
+    def _csv_column(self, type_, values):
+        if type_ in (int, float):
+            try:
+                return np.array(values, dtype=np.int64 if type_ is int else np.float64)
+            except (ValueError, OverflowError):
+                pass
+        return to_array(super()._csv_column(type_, values))
+
+    def join(self, step, context):
+        tables = {step.name: context.tables[step.name]}
+
+        for name, join in step.joins.items():
+            source_context = self.context(tables)
+            join_context = self.context({name: context.tables[name]})
+
+            if join.get("source_key"):
+                left, right = self.hash_join(join, source_context, join_context)
+            else:
+                left, right = self.nested_loop_join(join, source_context, join_context)
+
+            tables = {n: table.take(left) for n, table in tables.items()}
+            tables[name] = context.tables[name].take(right)
+            tables = self._filter(self.context(tables), self.generate(join["condition"])).tables
+
+        source_context = self.context(tables)
+
+        if not step.condition and not step.projections:
+            return source_context
+
+        source_context = self._filter(source_context, self.generate(step.condition), step.limit)
+
+        if step.projections:
+            return self.context({step.name: self._project(source_context, step.projections)})
+        return source_context
+
+    def nested_loop_join(self, _join, source_context, join_context):
+        """Returns the indices of the rows of both sides of a cross join."""
+        a, b = len(source_context), len(join_context)
+        return np.repeat(np.arange(a), b), np.tile(np.arange(b), a)
+
+    def hash_join(self, join, source_context, join_context):
+        """Returns the indices of the matching rows of both sides, where -1 stands for NULLs."""
+        source_keys = [
+            self.evaluate(code, source_context, len(source_context))
+            for code in self.generate_tuple(join["source_key"])
+        ]
+        join_keys = [
+            self.evaluate(code, join_context, len(join_context))
+            for code in self.generate_tuple(join["join_key"])
+        ]
+
+        # Both sides are encoded together, so that equal keys get the same code
+        codes, _ = factorize([concat(a, b) for a, b in zip(source_keys, join_keys)])
+        size = len(source_context)
+        source_codes, join_codes = codes[:size], codes[size:]
+
+        if join.get("side") == "RIGHT":
+            right, left = _match(join_codes, source_codes, outer=True)
+            return left, right
+        return _match(source_codes, join_codes, outer=join.get("side") == "LEFT")
+
+    def aggregate(self, step, context):
+        length = len(context)
+        tables = dict(context.tables)
+
+        if step.operands:
+            tables[None] = self._project(context, step.operands)
+
+        context = self.context(tables)
+        keys = [
+            self.evaluate(code, context, length)
+            for code in self.generate_tuple(step.group.values())
+        ]
+
+        if keys:
+            codes, size = factorize(keys)
+        else:
+            codes, size = np.zeros(length, dtype=np.int64), 1 if step.limit > 0 else 0
+
+        groups = Groups(codes, size)
+        env = {**self.env, **groups.env()}
+        columns = list(step.group) + [a.alias_or_name for a in step.aggregations]
+        arrays = [key[groups.first] for key in keys] + [
+            self.evaluate(code, context, size, env)
+            for code in self.generate_tuple(step.aggregations)
+        ]
+
+        table = ColumnarTable(columns, arrays, size)
+
+        if step.condition:
+            mask = truth(self.evaluate(self.generate(step.condition), context, size, env))
+            table = table.take(np.flatnonzero(mask))
+        if step.limit < len(table):
+            table = table.take(np.arange(int(step.limit)))
+
+        context = self.context({step.name: table, **{name: table for name in tables}})
+
+        if step.projections:
+            return self.scan(step, context)
+        return context
+
+    def sort(self, step, context):
+        length = len(context)
+        projections = self._project(context, step.projections)
+        tables = {id(table): table for table in context.tables.values()}
+        sink = ColumnarTable.combine([*tables.values(), projections])
+
+        sort_context = self.context({None: sink, **{name: sink for name in context.tables}})
+        keys = [
+            (
+                self.evaluate(self.generate(key.this), sort_context, length),
+                bool(key.args.get("desc")),
+            )
+            for key in step.key
+        ]
+
+        indices = sort_indices(keys)
+        if not math.isinf(step.limit):
+            indices = indices[: step.limit]
+
+        return self.context({step.name: projections.take(indices)})
+
+    def set_operation(self, step, context):
+        left = context.tables[step.left]
+        right = context.tables[step.right]
+
+        if issubclass(step.op, exp.Union) and not step.distinct:
+            arrays = [concat(a, b) for a, b in zip(left.arrays, right.arrays)]
+            sink = ColumnarTable(left.columns, arrays, len(left) + len(right))
+        else:
+            left_rows = set(left.to_table().rows)
+            right_rows = set(right.to_table().rows)
+
+            if issubclass(step.op, exp.Intersect):
+                rows = left_rows.intersection(right_rows)
+            elif issubclass(step.op, exp.Except):
+                rows = left_rows.difference(right_rows)
+            else:
+                rows = left_rows.union(right_rows)
+
+            sink = ColumnarTable.from_rows(left.columns, list(rows))
+
+        return self.context({step.name: sink})
+
+
+def _match(
+    codes: np.ndarray, other_codes: np.ndarray, outer: bool
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the indices of all pairs of rows with the same codes, ordered by the first side. If
+    `outer` is set, the rows of the first side without a match are paired with -1.
+    """
+    order = np.argsort(other_codes, kind="stable")
+    sorted_codes = other_codes[order]
+    starts = np.searchsorted(sorted_codes, codes, "left")
+    counts = np.searchsorted(sorted_codes, codes, "right") - starts
+    repeats = np.maximum(counts, 1) if outer else counts
+
+    left = np.repeat(np.arange(len(codes)), repeats)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    positions = np.repeat(starts, repeats) + offsets
+
+    if not len(order):
+        return left, np.full(len(left), -1)
+
+    right = order[np.minimum(positions, len(order) - 1)]
+    if outer:
+        right[np.repeat(counts == 0, repeats)] = -1
+
+    return left, right
+
+
+class RowCode:
+    """Compiled code that must be evaluated one row at a time."""
+
+    def __init__(self, code: t.Any) -> None:
+        self.code = code
+
+
+class RowReader:
+    """Reads the values of a single row of a table, as Python objects."""
+
+    def __init__(self, table: ColumnarTable) -> None:
+        self.table = table
+        self.index = 0
+        self._columns: t.Dict[str, t.List] = {}
+
+    def __getitem__(self, column: str) -> t.Any:
+        if column not in self._columns:
+            self._columns[column] = self.table[column].tolist()
+        return self._columns[column][self.index]
+
+
+class Groups:
+    """The rows of a table, partitioned by their group codes."""
+
+    def __init__(self, codes: np.ndarray, size: int) -> None:
+        self.codes = codes
+        self.size = size
+        self.order = np.argsort(codes, kind="stable")
+
+        sorted_codes = codes[self.order]
+        self.starts = np.flatnonzero(np.diff(sorted_codes, prepend=-1))
+        self.counts = np.diff(self.starts, append=len(codes))
+        self.first = self.order[self.starts]
+
+    def split(self, values: np.ndarray) -> t.List[t.List]:
+        if not len(self.codes):
+            return [[] for _ in range(self.size)]
+        return [chunk.tolist() for chunk in np.split(values[self.order], self.starts[1:])]
+
+    def reduce(self, name: str, values: t.Any) -> np.ndarray:
+        func = ENV[name]
+
+        if isinstance(values, Distinct):
+            values = broadcast(values.values, len(self.codes))
+            if name == "COUNT" and values.dtype.kind in _NATIVE_KINDS and len(values):
+                pairs, _ = factorize([self.codes, values])
+                return np.bincount(self.codes[self.first_of(pairs)], minlength=self.size)
+            return to_array([func(set(chunk)) for chunk in self.split(values)])
+
+        values = broadcast(values, len(self.codes))
+
+        if name == "COUNT" and len(values):
+            if values.dtype == object:
+                values = np.fromiter((v is not None for v in values), bool, len(values))
+                return np.add.reduceat(values[self.order].astype(np.int64), self.starts)
+            return self.counts
+        if name in ("SUM", "AVG", "MIN", "MAX") and len(values):
+            if values.dtype.kind in _NUMERIC_KINDS:
+                return self._reduce_native(name, values)
+            if values.dtype == object:
+                # The NULLs are left out, so that the other values can be reduced natively if
+                # they all have the same type
+                present = np.fromiter((v is not None for v in values), bool, len(values))
+                present_values = to_array(values[present].tolist())
+                if present_values.dtype.kind in _NUMERIC_KINDS:
+                    return self._reduce_native(name, present_values, self.codes[present])
+
+        return to_array([func(chunk) for chunk in self.split(values)])
+
+    def _reduce_native(
+        self, name: str, values: np.ndarray, codes: t.Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Reduces the values of each group with a NumPy ufunc. If the group codes of the values are
+        given, they're a subset of the rows and the groups without values are NULL.
+        """
+        if codes is None:
+            order, starts, counts = self.order, self.starts, self.counts
+        else:
+            order = np.argsort(codes, kind="stable")
+            starts = np.flatnonzero(np.diff(codes[order], prepend=-1))
+            counts = np.diff(starts, append=len(codes))
+
+        if values.dtype.kind == "b" and name in ("SUM", "AVG"):
+            values = values.astype(np.int64)
+
+        ufunc = np.minimum if name == "MIN" else np.maximum if name == "MAX" else np.add
+        result = ufunc.reduceat(values[order], starts) if len(values) else values
+        if name == "AVG":
+            result = result / counts
+
+        if codes is None or len(result) == self.size:
+            return result
+
+        # the results are converted into Python values, like the NULLs they're mixed with
+        results = _nulls(self.size)
+        results[codes[order][starts]] = result
+        return results
+
+    def first_of(self, codes: np.ndarray) -> np.ndarray:
+        _, first = np.unique(codes, return_index=True)
+        return first
+
+    def env(self) -> t.Dict[str, t.Callable]:
+        return {
+            name: (lambda name: lambda values: self.reduce(name, values))(name)
+            for name in ("ARRAYAGG", "AVG", "COUNT", "MAX", "MIN", "SUM")
+        }
+
+
+class Distinct:
+    """The operand of an aggregate function whose duplicate values are ignored."""
+
+    def __init__(self, values: t.Any) -> None:
+        self.values = values
+
+
+def to_array(values: t.Sequence) -> np.ndarray:
+    """Converts a sequence of Python values into an array with the most specific type."""
+    types = set(map(type, values))
+
+    try:
+        if types == {int}:
+            return np.array(values, dtype=np.int64)
+        if types in ({float}, {bool}, {str}):
+            return np.array(values)
+        if types == {datetime.date}:
+            return np.array(values, dtype="datetime64[D]")
+    except OverflowError:
+        pass
+
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def mapped_array(table: MappedTable, layout: t.Dict) -> np.ndarray:
+    """
+    Returns the array of a column of a `MappedTable`. Numeric and bool columns without NULLs are
+    read from the mapped file without copying them.
+    """
+    kind = layout["kind"]
+    length = len(table)
+
+    if kind == "null":
+        return _nulls(length)
+
+    array = np.asarray(table.section(layout["values"], MAPPED_FORMATS[kind]))
+
+    if kind == "str":
+        array = to_array(table.dictionary(layout) or [""])[array]
+    elif kind == "date":
+        array = (array - _UNIX_EPOCH_ORDINAL).astype("datetime64[D]")
+
+    if layout.get("nulls"):
+        array = array.astype(object)
+        array[np.asarray(table.section(layout["nulls"], "?"))] = None
+
+    return array
+
+
+def broadcast(value: t.Any, length: int) -> np.ndarray:
+    if isinstance(value, np.ndarray):
+        return value
+    if isinstance(value, np.generic):
+        value = value.item()
+    return to_array([value] * length)
+
+
+def concat(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return concat_all([a, b])
+
+
+def concat_all(arrays: t.Sequence[np.ndarray]) -> np.ndarray:
+    kinds = "".join(sorted({array.dtype.kind for array in arrays}))
+    if kinds in ("b", "U", "M", "m") or all(kind in "iuf" for kind in kinds):
+        return np.concatenate(arrays)
+    return np.concatenate([array.astype(object) for array in arrays])
+
+
+def truth(value: t.Any) -> t.Any:
+    """Returns the truth values of an array, like `bool` does for Python values."""
+    if not isinstance(value, np.ndarray):
+        return bool(value)
+    if value.dtype == bool:
+        return value
+    if value.dtype.kind in "iuf":
+        return value != 0
+    if value.dtype.kind == "U":
+        return value != ""
+    return np.fromiter((bool(v) for v in value), bool, len(value))
+
+
+def factorize(arrays: t.List[np.ndarray]) -> t.Tuple[np.ndarray, int]:
+    """
+    Encodes the rows of the given columns as integers, so that equal rows have the same code. The
+    codes follow the order of the rows when all values can be sorted.
+    """
+    codes = np.zeros(len(arrays[0]) if arrays else 0, dtype=np.int64)
+    size = 1
+
+    for array in arrays:
+        try:
+            if array.dtype == object:
+                raise TypeError
+            uniques, array_codes = np.unique(array, return_inverse=True)
+            count = len(uniques)
+        except TypeError:
+            mapping: t.Dict[t.Any, int] = {}
+            values = array.tolist()
+            try:
+                array_codes = np.fromiter(
+                    (mapping.setdefault(v, len(mapping)) for v in values), np.int64, len(values)
+                )
+            except TypeError:
+                # Values that can't be hashed, e.g. arrays, are hashed by a hashable copy
+                mapping.clear()
+                array_codes = np.fromiter(
+                    (mapping.setdefault(_hashable(v), len(mapping)) for v in values),
+                    np.int64,
+                    len(values),
+                )
+            count = len(mapping)
+
+        uniques, codes = np.unique(codes * count + array_codes.ravel(), return_inverse=True)
+        codes, size = codes.ravel(), len(uniques)
+
+    return codes, size
+
+
+def sort_indices(keys: t.List[t.Tuple[np.ndarray, bool]]) -> np.ndarray:
+    """Returns the indices that stably sort rows by the given (values, descending) keys."""
+    length = len(keys[0][0]) if keys else 0
+
+    try:
+        ranks = []
+        for values, desc in keys:
+            if values.dtype.kind not in _NATIVE_KINDS:
+                raise TypeError
+            rank = np.unique(values, return_inverse=True)[1].ravel()
+            ranks.append(-rank if desc else rank)
+        return np.lexsort(ranks[::-1]) if ranks else np.arange(length)
+    except TypeError:
+        columns = [values.tolist() for values, _ in keys]
+        descending = [desc for _, desc in keys]
+
+        def sort_key(i: int) -> t.Tuple:
+            return tuple(
+                reverse_key(column[i]) if desc else column[i]
+                for column, desc in zip(columns, descending)
+            )
+
+        return np.array(sorted(range(length), key=sort_key), dtype=np.int64)
+
+
+def _nulls(length: int) -> np.ndarray:
+    return np.full(length, None, dtype=object)
+
+
+def _native(value: t.Any) -> t.Any:
+    """Converts Python scalars into their NumPy equivalent, so that they can be mixed with arrays."""
+    if isinstance(value, datetime.timedelta):
+        if not value % datetime.timedelta(days=1):
+            return np.timedelta64(value.days, "D")
+        return np.timedelta64(value)
+    if isinstance(value, datetime.date):
+        return np.datetime64(value)
+    return value
+
+
+def _is_native(value: t.Any, kinds: str) -> bool:
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind in kinds
+    return value is not None and not isinstance(value, (list, tuple, dict, Distinct))
+
+
+def _has_array(*args: t.Any) -> bool:
+    return any(isinstance(arg, np.ndarray) for arg in args)
+
+
+def elementwise(func: t.Callable) -> t.Callable:
+    """Applies a scalar function to each value of its array arguments."""
+
+    def _func(*args):
+        if not _has_array(*args):
+            return func(*args)
+
+        values = list(args)
+        positions = [i for i, arg in enumerate(args) if isinstance(arg, np.ndarray)]
+        results = []
+
+        for row in zip(*(args[i].tolist() for i in positions)):
+            for i, value in zip(positions, row):
+                values[i] = value
+            results.append(func(*values))
+
+        return to_array(results)
+
+    return _func
+
+
+def _vectorized(op: t.Callable, name: str, kinds: str = _NUMERIC_KINDS) -> t.Callable:
+    scalar = ENV[name]
+    fallback = elementwise(scalar)
+
+    def _func(*args):
+        if not _has_array(*args):
+            return scalar(*args)
+        if all(_is_native(arg, kinds) for arg in args):
+            try:
+                return op(*(_native(arg) for arg in args))
+            except TypeError:
+                pass
+        return fallback(*args)
+
+    return _func
+
+
+def _and(this: t.Any, other: t.Any) -> t.Any:
+    if not _has_array(this, other):
+        return this and other
+    return truth(this) & truth(other)
+
+
+def _or(this: t.Any, other: t.Any) -> t.Any:
+    if not _has_array(this, other):
+        return this or other
+    return truth(this) | truth(other)
+
+
+def _not(this: t.Any) -> t.Any:
+    if not isinstance(this, np.ndarray):
+        return not this
+    return ~truth(this)
+
+
+def _is(this: t.Any, other: t.Any) -> t.Any:
+    if not isinstance(this, np.ndarray):
+        return this is other
+    if this.dtype == object:
+        return np.fromiter((v is other for v in this), bool, len(this))
+    if other is None:
+        return np.zeros(len(this), dtype=bool)
+    return this == other
+
+
+def _in(this: t.Any, *values: t.Any) -> t.Any:
+    if not isinstance(this, np.ndarray):
+        return this in values
+    if this.dtype.kind in _NATIVE_KINDS and not _has_array(*values):
+        return np.isin(this, [_native(v) for v in values])
+    return elementwise(lambda this, *values: this in values)(this, *values)
+
+
+def _like(this: t.Any, pattern: t.Any) -> t.Any:
+    if not isinstance(this, np.ndarray) or isinstance(pattern, np.ndarray) or pattern is None:
+        return elementwise(ENV["LIKE"])(this, pattern)
+    if this.dtype.kind != "U":
+        return elementwise(ENV["LIKE"])(this, pattern)
+
+    match = re.compile(pattern.replace("_", ".").replace("%", ".*")).match
+    return np.fromiter((match(v) is not None for v in this.tolist()), bool, len(this))
+
+
+def _case(default: t.Any, *branches: t.Any) -> t.Any:
+    conditions, values = branches[::2], branches[1::2]
+
+    if not _has_array(*branches):
+        return next((v for c, v in zip(conditions, values) if c), default)
+
+    length = next(len(a) for a in branches if isinstance(a, np.ndarray))
+    result = broadcast(default, length)
+
+    for condition, value in reversed(list(zip(conditions, values))):
+        mask = broadcast(truth(condition), length)
+        value = broadcast(value, length)
+        try:
+            result = np.where(mask, value, result)
+        except TypeError:
+            result = np.where(mask, value.astype(object), result.astype(object))
+
+    return result
+
+
+def _cast(this: t.Any, to: exp.DataType.Type) -> t.Any:
+    if not isinstance(this, np.ndarray):
+        return ENV["CAST"](this, to)
+
+    if this.dtype.kind in "UM":
+        if to == exp.DataType.Type.DATE:
+            return this.astype("datetime64[D]")
+        if to == exp.DataType.Type.DATETIME:
+            return this.astype("datetime64[us]")
+    if this.dtype.kind in _NATIVE_KINDS:
+        try:
+            if to in exp.DataType.TEXT_TYPES:
+                return this.astype(str)
+            if to in {exp.DataType.Type.FLOAT, exp.DataType.Type.DOUBLE}:
+                return this.astype(np.float64)
+            if to in exp.DataType.NUMERIC_TYPES and this.dtype.kind != "M":
+                return this.astype(np.int64)
+        except ValueError:
+            pass
+
+    return elementwise(ENV["CAST"])(this, to)
+
+
+def _extract(unit: str, this: t.Any) -> t.Any:
+    if not isinstance(this, np.ndarray) or this.dtype.kind != "M":
+        return elementwise(ENV["EXTRACT"])(unit, this)
+
+    if unit == "year":
+        return this.astype("datetime64[Y]").astype(np.int64) + 1970
+    if unit == "month":
+        return this.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    if unit == "day":
+        return (this - this.astype("datetime64[M]")).astype("timedelta64[D]").astype(np.int64) + 1
+    return elementwise(ENV["EXTRACT"])(unit, this)
+
+
+COLUMNAR_ENV = {
+    **{
+        name: elementwise(func) if callable(func) and name.isupper() else func
+        for name, func in ENV.items()
+    },
+    "ABS": _vectorized(np.abs, "ABS"),
+    "ADD": _vectorized(np.add, "ADD"),
+    "AND": _and,
+    "ARRAY": elementwise(lambda *values: list(values)),
+    "BETWEEN": _vectorized(lambda this, low, high: (this >= low) & (this <= high), "BETWEEN"),
+    "CASE": _case,
+    "CAST": _cast,
+    "DISTINCT": Distinct,
+    "DIV": _vectorized(np.true_divide, "DIV"),
+    "EQ": _vectorized(np.equal, "EQ", _NATIVE_KINDS),
+    "EXTRACT": _extract,
+    "GT": _vectorized(np.greater, "GT", _NATIVE_KINDS),
+    "GTE": _vectorized(np.greater_equal, "GTE", _NATIVE_KINDS),
+    "IF": lambda predicate, true, false: _case(false, predicate, true),
+    "IN": _in,
+    "INTDIV": _vectorized(np.floor_divide, "INTDIV"),
+    "IS": _is,
+    "LIKE": _like,
+    "LT": _vectorized(np.less, "LT", _NATIVE_KINDS),
+    "LTE": _vectorized(np.less_equal, "LTE", _NATIVE_KINDS),
+    "MOD": _vectorized(np.mod, "MOD"),
+    "MUL": _vectorized(np.multiply, "MUL"),
+    "NEQ": _vectorized(np.not_equal, "NEQ", _NATIVE_KINDS),
+    "NOT": _not,
+    "OR": _or,
+    "SUB": _vectorized(np.subtract, "SUB"),
+}
+
+
+def _case_sql(self, expression: exp.Case) -> str:
+    this = self.sql(expression, "this")
+    args = [self.sql(expression, "default") or "None"]
+
+    for e in expression.args["ifs"]:
+        condition = self.sql(e, "this")
+        args.append(f"EQ({this}, {condition})" if this else condition)
+        args.append(self.sql(e, "true"))
+
+    return f"CASE({', '.join(args)})"
+
+
+class Columnar(Python):
+    class Generator(Python.Generator):
+        TRANSFORMS = {
+            **Python.Generator.TRANSFORMS,
+            exp.And: lambda self, e: self.func("AND", e.this, e.expression),
+            exp.Array: lambda self, e: self.func("ARRAY", *e.expressions),
+            exp.Between: _rename,
+            exp.Case: _case_sql,
+            exp.Distinct: lambda self, e: self.func("DISTINCT", *e.expressions),
+            exp.In: lambda self, e: self.func("IN", e.this, *e.expressions),
+            exp.Is: lambda self, e: self.func("IS", e.this, e.expression),
+            exp.Not: lambda self, e: self.func("NOT", e.this),
+            exp.Or: lambda self, e: self.func("OR", e.this, e.expression),
+        }
@@ -42,6 +42,8 @@ class Context:
         if self._table is None:
             self._table = list(self.tables.values())[0]
             for other in self.tables.values():
+                if other is self._table:
+                    continue
                 if self._table.columns != other.columns:
                     raise Exception(f"Columns are different.")
                 if len(self._table.rows) != len(other.rows):
@@ -76,11 +78,17 @@ class Context:
             table.rows = rows
 
     def sort(self, key) -> None:
+        """Sorts the rows of the context's table by compiled expressions or a function."""
+        self.table.rows.sort(key=key if callable(key) else self.sort_key(key))
+
+    def sort_key(self, key) -> t.Callable[[t.Tuple], t.Tuple]:
+        """Returns a function that evaluates the given key on a row of the context's table."""
+
         def sort_key(row: t.Tuple) -> t.Tuple:
             self.set_row(row)
             return self.eval_tuple(key)
 
-        self.table.rows.sort(key=sort_key)
+        return sort_key
 
     def set_row(self, row: t.Tuple) -> None:
         for table in self.tables.values():
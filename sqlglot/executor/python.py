@@ -1,84 +1,290 @@
 import ast
 import collections
+import datetime
+import heapq
 import itertools
 import math
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
 
 from sqlglot import exp, generator, planner, tokens
 from sqlglot.dialects.dialect import Dialect, inline_array_sql
 from sqlglot.errors import ExecuteError
 from sqlglot.executor.context import Context
-from sqlglot.executor.env import ENV
-from sqlglot.executor.table import RowReader, Table
+from sqlglot.executor.env import ENV, reverse_key
+from sqlglot.executor.spill import MemoryTracker, Partitions, Spill
+from sqlglot.executor.table import Table, TableStream
 from sqlglot.helper import csv_reader, subclasses
+from sqlglot.schema import ensure_schema
+
+# The initial value, update and final result functions of the aggregate functions that can be
+# computed incrementally, one row at a time. They have the same semantics as their ENV functions.
+ACCUMULATORS = {
+    exp.Avg: (
+        (0, 0),
+        lambda acc, v: (acc[0] + v, acc[1] + 1),
+        lambda acc: acc[0] / acc[1] if acc[1] else None,
+    ),
+    exp.Count: (0, lambda acc, v: acc + 1, lambda acc: acc),
+    exp.Max: (None, lambda acc, v: v if acc is None or v > acc else acc, lambda acc: acc),
+    exp.Min: (None, lambda acc, v: v if acc is None or v < acc else acc, lambda acc: acc),
+    exp.Sum: (None, lambda acc, v: (0 if acc is None else acc) + v, lambda acc: acc),
+}
+
+# The number of rows that are sent to a worker process at a time, when morsels are enabled
+MORSEL_SIZE = 10000
+
+# The number of rows of a CSV file that are read and converted at a time
+CSV_CHUNK_SIZE = 10000
+
+
+def _parse_bool(value):
+    return value.lower() in ("1", "t", "true", "y", "yes")
+
+
+# The functions that convert the values of the CSV columns whose type is declared in the schema
+CSV_TYPES = {
+    **{data_type: int for data_type in exp.DataType.INTEGER_TYPES},
+    **{data_type: float for data_type in exp.DataType.FLOAT_TYPES},
+    **{data_type: str for data_type in exp.DataType.TEXT_TYPES},
+    exp.DataType.Type.DECIMAL: float,
+    exp.DataType.Type.BOOLEAN: _parse_bool,
+    exp.DataType.Type.DATE: datetime.date.fromisoformat,
+    exp.DataType.Type.DATETIME: datetime.datetime.fromisoformat,
+    exp.DataType.Type.TIMESTAMP: datetime.datetime.fromisoformat,
+}
 
 
 class PythonExecutor:
-    def __init__(self, env=None, tables=None):
+    """
+    Executes the steps of a plan in Python.
+
+    Args:
+        env: additional functions that can be called by the executed expressions.
+        tables: the tables that are queried.
+        workers: the number of threads that execute steps concurrently. Steps are executed as
+            soon as all of the steps they depend on are done, so e.g. the different tables of a
+            join or the two sides of a set operation are computed at the same time.
+
+            If some table that's scanned has more than `MORSEL_SIZE` rows, the rows of scans and
+            hash joins are also split into morsels that are filtered, projected and hashed by a
+            pool of `workers` processes, unless `env` is given. The results are still returned
+            in the same order, regardless of the number of workers.
+        schema: the schema of the queried tables. The values of the CSV files that are read with
+            `READ_CSV(...) AS name` are converted to the types it declares for the table `name`,
+            and to the type of the first value of their column otherwise.
+        memory_limit: the number of bytes that the rows held by a hash join, an aggregation or a
+            sort can use, as estimated from samples. Beyond it, their rows are written to
+            temporary files: sorts merge sorted runs, while hash joins and aggregations are split
+            into partitions by key, which are processed one by one.
+    """
+
+    def __init__(self, env=None, tables=None, workers=1, schema=None, memory_limit=None):
         self.generator = Python().generator(identify=True, comments=False)
         self.env = {**ENV, **(env or {})}
         self.tables = tables or {}
+        self.workers = workers
+        self.schema = ensure_schema(schema)
+        self.memory_limit = memory_limit
+        self._spill = Spill()
+        self._generator_lock = threading.Lock()
+        # custom functions may not be picklable, so they disable morsels
+        self._pool = None
+        self._morsels = not env
 
     def execute(self, plan):
-        running = set()
+        try:
+            if self.workers > 1 and self._morsels and self._has_large_scans(plan):
+                with multiprocessing.Pool(self.workers) as self._pool:
+                    try:
+                        return self._execute(plan)
+                    finally:
+                        self._pool = None
+
+            return self._execute(plan)
+        finally:
+            self._spill.close()
+
+    def _has_large_scans(self, plan):
+        for step in plan.dag:
+            if isinstance(step, planner.Scan) and isinstance(step.source, exp.Table):
+                if isinstance(step.source.this, exp.ReadCSV):
+                    return True
+                table = self.tables.find(step.source)
+                if table and len(table.rows) > MORSEL_SIZE:
+                    return True
+        return False
+
+    def _execute(self, plan):
         finished = set()
-        queue = set(plan.leaves)
         contexts = {}
 
-        while queue:
-            node = queue.pop()
-            try:
-                context = self.context(
-                    {
-                        name: table
-                        for dep in node.dependencies
-                        for name, table in contexts[dep].tables.items()
-                    }
-                )
-                running.add(node)
-
-                if isinstance(node, planner.Scan):
-                    contexts[node] = self.scan(node, context)
-                elif isinstance(node, planner.Aggregate):
-                    contexts[node] = self.aggregate(node, context)
-                elif isinstance(node, planner.Join):
-                    contexts[node] = self.join(node, context)
-                elif isinstance(node, planner.Sort):
-                    contexts[node] = self.sort(node, context)
-                elif isinstance(node, planner.SetOperation):
-                    contexts[node] = self.set_operation(node, context)
-                else:
-                    raise NotImplementedError
+        def done(node, context):
+            contexts[node] = context
+            finished.add(node)
+
+            for dep in node.dependencies:
+                if all(d in finished for d in dep.dependents):
+                    contexts.pop(dep)
+
+            return [dep for dep in node.dependents if all(d in finished for d in dep.dependencies)]
+
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {
+                    pool.submit(self._execute_step, node, self._inputs(node, contexts)): node
+                    for node in plan.leaves
+                }
+
+                while futures:
+                    completed, _ = wait(futures, return_when=FIRST_COMPLETED)
 
-                running.remove(node)
-                finished.add(node)
+                    for future in completed:
+                        node = futures.pop(future)
 
-                for dep in node.dependents:
-                    if dep not in running and all(d in contexts for d in dep.dependencies):
-                        queue.add(dep)
+                        for dep in done(node, future.result()):
+                            future = pool.submit(
+                                self._execute_step, dep, self._inputs(dep, contexts)
+                            )
+                            futures[future] = dep
+        else:
+            queue = list(plan.leaves)
 
-                for dep in node.dependencies:
-                    if all(d in finished for d in dep.dependents):
-                        contexts.pop(dep)
-            except Exception as e:
-                raise ExecuteError(f"Step '{node.id}' failed: {e}") from e
+            while queue:
+                node = queue.pop()
+                queue.extend(done(node, self._execute_step(node, self._inputs(node, contexts))))
 
         root = plan.root
-        return contexts[root].tables[root.name]
+        table = contexts[root].tables[root.name]
+
+        if isinstance(table, TableStream):
+            return Table(table.columns, table.rows)
+        return table
+
+    def _inputs(self, node, contexts):
+        """Returns the tables produced by the dependencies of a step."""
+        tables = {}
+
+        for dep in node.dependencies:
+            for name, table in contexts[dep].tables.items():
+                # the readers of a shared table each get their own view of it, since they can be
+                # executed concurrently and a table's reader points to a single row at a time
+                if len(dep.dependents) > 1 and isinstance(table, Table):
+                    table = Table(table.columns, table.rows, table.column_range)
+                tables[name] = table
+
+        return tables
+
+    def _execute_step(self, node, tables):
+        try:
+            context = self.context(tables)
+
+            if isinstance(node, planner.Scan):
+                context = self.scan(node, context)
+            elif isinstance(node, planner.Aggregate):
+                context = self.aggregate(node, context)
+            elif isinstance(node, planner.Join):
+                context = self.join(node, context)
+            elif isinstance(node, planner.Sort):
+                context = self.sort(node, context)
+            elif isinstance(node, planner.SetOperation):
+                context = self.set_operation(node, context)
+            else:
+                raise NotImplementedError
+
+            # A pipelined table can only be read once, so it's stored if it has several readers.
+            # When steps are executed concurrently, it's also stored if it's one of the inputs of
+            # a step, so that the inputs are computed at the same time rather than one by one,
+            # unless memory is limited.
+            if len(node.dependents) > 1 or (
+                self.workers > 1
+                and self.memory_limit is None
+                and any(len(dep.dependencies) > 1 for dep in node.dependents)
+            ):
+                for table in context.tables.values():
+                    if isinstance(table, TableStream):
+                        table.rows
+
+            return context
+        except Exception as e:
+            raise ExecuteError(f"Step '{node.id}' failed: {e}") from e
 
     def generate(self, expression):
         """Convert a SQL expression into literal Python code and compile it into bytecode."""
         if not expression:
             return None
 
-        sql = self.generator.generate(expression)
+        sql = self.generate_source(expression)
         return compile(sql, sql, "eval", optimize=2)
 
+    def generate_source(self, expression):
+        """Convert a SQL expression into literal Python code."""
+        if not expression:
+            return None
+
+        with self._generator_lock:
+            return self.generator.generate(expression)
+
     def generate_tuple(self, expressions):
         """Convert an array of SQL expressions into tuple of Python byte code."""
         if not expressions:
             return tuple()
         return tuple(self.generate(expression) for expression in expressions)
 
+    def generate_rows(self, context, expressions=(), condition=None, output="values"):
+        """
+        Compile a single Python function that iterates over rows of a context's tables, skips the
+        ones that don't satisfy a condition and, depending on `output`, yields the tuple of values
+        of the expressions ("values"), each row along with this tuple ("pairs") or the row itself
+        ("rows"). Columns are read from each row by index, rather than through the context.
+
+        Returns None if the expressions can't be bound to the rows, e.g. because they reference
+        lambda parameters, in which case they have to be evaluated with the context instead.
+        """
+        source = self.generate_rows_source(context, expressions, condition, output)
+        return source and _define(source, self.env)
+
+    def generate_rows_source(self, context, expressions=(), condition=None, output="values"):
+        """Convert the function compiled by `generate_rows` into literal Python code."""
+        try:
+            codes = [self._generate_row_source(context, e) for e in expressions]
+            condition = condition and self._generate_row_source(context, condition)
+        except KeyError:
+            return None
+
+        values = f"({', '.join(codes)},)" if codes else "()"
+        result = {"values": values, "pairs": f"row, {values}", "rows": "row"}[output]
+        lines = ["def _step(rows):", "    for row in rows:"]
+        if condition:
+            lines += [f"        if not ({condition}):", "            continue"]
+        lines.append(f"        yield {result}")
+        return "\n".join(lines)
+
+    def generate_key(self, context, expressions):
+        """
+        Compile a function that returns the tuple of values of the expressions on a row, e.g. to
+        sort rows by. Returns None if the expressions can't be bound to the rows.
+        """
+        try:
+            codes = [self._generate_row_source(context, e) for e in expressions]
+        except KeyError:
+            return None
+        return _define(f"def _step(row):\n    return ({', '.join(codes)},)", self.env)
+
+    def _generate_row_source(self, context, expression):
+        if expression.find(exp.Lambda):
+            raise KeyError(expression)
+
+        def bind(node):
+            if isinstance(node, exp.Column):
+                index = context.tables[node.table or None].reader.columns[node.name]
+                return exp.var(f"row[{index}]")
+            return node
+
+        return self.generate_source(expression.transform(bind))
+
     def context(self, tables):
         return Context(tables, env=self.env)
 
@@ -95,210 +301,370 @@ class PythonExecutor:
             source = source.name or source.alias
 
         if source is None:
-            context, table_iter = self.static()
+            context, rows = self.static()
         elif source in context:
             if not step.projections and not step.condition:
                 return self.context({step.name: context.tables[source]})
-            table_iter = context.table_iter(source)
+            rows = context.tables[source].iter_rows()
         elif isinstance(step.source, exp.Table) and isinstance(step.source.this, exp.ReadCSV):
-            table_iter = self.scan_csv(step)
-            context = next(table_iter)
+            rows = self.scan_csv(step)
+            context = next(rows)
         else:
-            context, table_iter = self.scan_table(step)
+            context, rows = self.scan_table(step)
+
+        return self.context({step.name: self._project_and_filter(context, step, rows)})
+
+    def _project_and_filter(self, context, step, rows):
+        """
+        Returns a table that lazily filters and projects `rows`, so that they're streamed to the
+        next step instead of being stored, and stops reading them at the limit.
+
+        The condition and projections are compiled into a single function over the rows, unless
+        they can't be bound to them, in which case they're evaluated with the context.
+        """
+        columns = self.table(step.projections if step.projections else context.columns).columns
+        output = "values" if step.projections else "rows"
+
+        if self._pool and math.isinf(step.limit) and context.tables:
+            source = self.generate_rows_source(context, step.projections, step.condition, output)
+            if source:
+                rows = (
+                    row
+                    for _, result in self._map_morsels(_evaluate_morsel, source, rows)
+                    for row in result
+                )
+                return TableStream(columns, self._stream(step, rows))
+
+        func = self.generate_rows(context, step.projections, step.condition, output)
+        rows = func(rows) if func else self._evaluate(context, step, rows)
 
-        return self.context({step.name: self._project_and_filter(context, step, table_iter)})
+        if step.limit < math.inf:
+            rows = itertools.islice(rows, max(int(step.limit), 0))
 
-    def _project_and_filter(self, context, step, table_iter):
-        sink = self.table(step.projections if step.projections else context.columns)
+        return TableStream(columns, self._stream(step, rows))
+
+    def _evaluate(self, context, step, rows):
         condition = self.generate(step.condition)
         projections = self.generate_tuple(step.projections)
 
-        for reader in table_iter:
-            if len(sink) >= step.limit:
-                break
-
+        for row in rows:
+            context.set_row(row)
             if condition and not context.eval(condition):
                 continue
+            yield context.eval_tuple(projections) if projections else row
+
+    def _map_morsels(self, func, source, rows):
+        """
+        Splits `rows` into morsels and yields each one along with the result of
+        `func(source, morsel)`. The morsels are processed in parallel by the process pool, but
+        they're yielded in order.
+
+        Morsels are submitted from the consuming thread, at most `2 * workers` at a time, so that
+        reading `rows` never happens in the pool's own threads; `rows` may itself be a stream of
+        morsels being processed by the same pool.
+        """
+        pending = collections.deque()
+        func = partial(func, source)
+        rows = iter(rows)
+
+        while True:
+            while len(pending) < 2 * self.workers:
+                morsel = list(itertools.islice(rows, MORSEL_SIZE))
+                if not morsel:
+                    break
+                pending.append((morsel, self._pool.apply_async(func, (morsel,))))
 
-            if projections:
-                sink.append(context.eval_tuple(projections))
-            else:
-                sink.append(reader.row)
+            if not pending:
+                return
 
-        return sink
+            morsel, result = pending.popleft()
+            yield morsel, result.get()
+
+    def _stream(self, step, rows):
+        """Attributes the errors raised while the rows of a pipelined step are read to that step."""
+        try:
+            yield from rows
+        except ExecuteError:
+            raise
+        except Exception as e:
+            raise ExecuteError(f"Step '{step.id}' failed: {e}") from e
 
     def static(self):
-        return self.context({}), [RowReader(())]
+        return self.context({}), [()]
 
     def scan_table(self, step):
         table = self.tables.find(step.source)
-        context = self.context({step.source.alias_or_name: table})
-        return context, iter(table)
+        # a table can be scanned by several steps at once, so each scan gets its own reader
+        context = self.context(
+            {step.source.alias_or_name: Table(table.columns, column_range=table.column_range)}
+        )
+        return context, iter(table.rows)
 
     def scan_csv(self, step):
         alias = step.source.alias
-        source = step.source.this
-
-        with csv_reader(source) as reader:
+        chunks = self._csv_chunks(step)
+        yield self.context({alias: Table(next(chunks))})
+
+        for chunk in chunks:
+            yield from zip(*chunk)
+
+    def _csv_chunks(self, step):
+        """
+        Reads the CSV file of a scan `CSV_CHUNK_SIZE` rows at a time. Yields its header and then
+        the columns of each chunk, converted by `_csv_column`.
+        """
+        with csv_reader(step.source.this) as reader:
             columns = next(reader)
-            table = Table(columns)
-            context = self.context({alias: table})
-            yield context
-            types = []
-
-            for row in reader:
-                if not types:
-                    for v in row:
-                        try:
-                            types.append(type(ast.literal_eval(v)))
-                        except (ValueError, SyntaxError):
-                            types.append(str)
-                context.set_row(tuple(t(v) for t, v in zip(types, row)))
-                yield context.table.reader
+            yield columns
+            types = None
+
+            while True:
+                rows = list(itertools.islice(reader, CSV_CHUNK_SIZE))
+                if not rows:
+                    return
+                if types is None:
+                    types = self._csv_types(step.source.alias, columns, rows[0])
+                yield [self._csv_column(type_, values) for type_, values in zip(types, zip(*rows))]
+
+    def _csv_types(self, alias, columns, row):
+        """Returns the functions that convert the values of the columns of a CSV file."""
+        table = exp.Table(this=exp.to_identifier(alias))
+        types = []
+
+        for column, value in zip(columns, row):
+            data_type = self.schema.get_column_type(table, column).this
+
+            if data_type in CSV_TYPES:
+                types.append(CSV_TYPES[data_type])
+            else:
+                try:
+                    types.append(type(ast.literal_eval(value)))
+                except (ValueError, SyntaxError):
+                    types.append(str)
+
+        return types
+
+    def _csv_column(self, type_, values):
+        """Converts the values of a column of a CSV file. Empty values are NULLs, except in strings."""
+        if type_ is str:
+            return values
+        try:
+            return list(map(type_, values))
+        except ValueError:
+            return [None if value == "" else type_(value) for value in values]
 
     def join(self, step, context):
         source = step.name
 
         source_table = context.tables[source]
-        source_context = self.context({source: source_table})
         column_ranges = {source: range(0, len(source_table.columns))}
+        columns = source_table.columns
+        # the rows of the source are streamed through the joins, which only store the joined tables
+        rows = source_table.iter_rows()
 
         for name, join in step.joins.items():
             table = context.tables[name]
-            start = max(r.stop for r in column_ranges.values())
-            column_ranges[name] = range(start, len(table.columns) + start)
+            source_context = self._join_context(columns, column_ranges)
             join_context = self.context({name: table})
 
+            start = len(columns)
+            column_ranges[name] = range(start, len(table.columns) + start)
+            columns = columns + table.columns
+
             if join.get("source_key"):
-                table = self.hash_join(join, source_context, join_context)
+                rows = self.hash_join(join, source_context, join_context, rows)
             else:
-                table = self.nested_loop_join(join, source_context, join_context)
+                rows = self.nested_loop_join(join, source_context, join_context, rows)
 
-            source_context = self.context(
-                {
-                    name: Table(table.columns, table.rows, column_range)
-                    for name, column_range in column_ranges.items()
-                }
-            )
-            condition = self.generate(join["condition"])
-            if condition:
-                source_context.filter(condition)
+            if join["condition"]:
+                rows = self._join_filter(
+                    self._join_context(columns, column_ranges), join["condition"], rows
+                )
 
-        if not step.condition and not step.projections:
-            return source_context
+        source_context = self._join_context(columns, column_ranges)
 
-        sink = self._project_and_filter(
-            source_context,
-            step,
-            (reader for reader, _ in iter(source_context)),
-        )
+        if step.condition or step.projections:
+            sink = self._project_and_filter(source_context, step, rows)
+            if step.projections:
+                return self.context({step.name: sink})
+            rows = sink.rows
 
-        if step.projections:
-            return self.context({step.name: sink})
-        else:
-            return self.context(
-                {
-                    name: Table(table.columns, sink.rows, table.column_range)
-                    for name, table in source_context.tables.items()
-                }
-            )
+        # the joined tables share their rows, so they're stored rather than streamed
+        rows = list(rows)
+        return self.context(
+            {
+                name: Table(columns, rows, column_range)
+                for name, column_range in column_ranges.items()
+            }
+        )
 
-    def nested_loop_join(self, _join, source_context, join_context):
-        table = Table(source_context.columns + join_context.columns)
+    def _join_context(self, columns, column_ranges):
+        return self.context(
+            {
+                name: Table(columns, column_range=column_range)
+                for name, column_range in column_ranges.items()
+            }
+        )
 
-        for reader_a, _ in source_context:
-            for reader_b, _ in join_context:
-                table.append(reader_a.row + reader_b.row)
+    def _keys(self, context, expressions, rows):
+        """
+        Yields each row along with the tuple of values of the expressions on it, which are
+        computed by the process pool if there's one.
+        """
+        source = self._pool and self.generate_rows_source(context, expressions)
+
+        if source:
+            for morsel, keys in self._map_morsels(_evaluate_morsel, source, rows):
+                yield from zip(morsel, keys)
+            return
+
+        func = self.generate_rows(context, expressions, output="pairs")
+
+        if func:
+            yield from func(rows)
+            return
+
+        codes = self.generate_tuple(expressions)
+        for row in rows:
+            context.set_row(row)
+            yield row, context.eval_tuple(codes)
+
+    def _join_filter(self, context, condition, rows):
+        func = self.generate_rows(context, condition=condition, output="rows")
+
+        if func:
+            yield from func(rows)
+            return
+
+        condition = self.generate(condition)
+        for row in rows:
+            context.set_row(row)
+            if context.eval(condition):
+                yield row
+
+    def nested_loop_join(self, _join, source_context, join_context, rows):
+        join_rows = join_context.table.rows
+
+        for row in rows:
+            for join_row in join_rows:
+                yield row + join_row
+
+    def hash_join(self, join, source_context, join_context, rows):
+        """
+        Joins the streamed source rows with the rows of the joined table, which are stored in a hash
+        table by key. The source rows are read in a single pass, and are joined in the same order.
+
+        If the hash table exceeds the memory limit, both tables are split into partitions by key
+        instead, and the partitions are joined one by one, i.e. it becomes a grace hash join.
+        """
+        join_rows = join_context.table.iter_rows()
+        join_pairs = self._keys(join_context, join["join_key"], join_rows)
+        pairs = self._keys(source_context, join["source_key"], rows)
+
+        hashed = collections.defaultdict(list)
+        tracker = self.memory_limit and MemoryTracker(self.memory_limit)
+
+        for row, key in join_pairs:
+            hashed[key].append(row)
+
+            if tracker and tracker.add(row):
+                yield from self._grace_hash_join(
+                    join, source_context, join_context, hashed, join_pairs, pairs
+                )
+                return
 
-        return table
+        yield from self._probe(join, source_context, join_context, hashed, pairs)
 
-    def hash_join(self, join, source_context, join_context):
-        source_key = self.generate_tuple(join["source_key"])
-        join_key = self.generate_tuple(join["join_key"])
+    def _probe(self, join, source_context, join_context, hashed, pairs):
         left = join.get("side") == "LEFT"
         right = join.get("side") == "RIGHT"
-
-        results = collections.defaultdict(lambda: ([], []))
-
-        for reader, ctx in source_context:
-            results[ctx.eval_tuple(source_key)][0].append(reader.row)
-        for reader, ctx in join_context:
-            results[ctx.eval_tuple(join_key)][1].append(reader.row)
-
-        table = Table(source_context.columns + join_context.columns)
-        nulls = [(None,) * len(join_context.columns if left else source_context.columns)]
-
-        for a_group, b_group in results.values():
-            if left:
-                b_group = b_group or nulls
-            elif right:
-                a_group = a_group or nulls
-
-            for a_row, b_row in itertools.product(a_group, b_group):
-                table.append(a_row + b_row)
-
-        return table
+        nulls = (None,) * len(join_context.columns)
+        matched = set()
+
+        for row, key in pairs:
+            matches = hashed.get(key)
+
+            if matches:
+                if right:
+                    matched.add(key)
+                for join_row in matches:
+                    yield row + join_row
+            elif left:
+                yield row + nulls
+
+        if right:
+            nulls = (None,) * len(source_context.columns)
+
+            for key, unmatched in hashed.items():
+                if key not in matched:
+                    for join_row in unmatched:
+                        yield nulls + join_row
+
+    def _grace_hash_join(self, join, source_context, join_context, hashed, join_pairs, pairs):
+        limit = self.memory_limit // 2
+        join_partitions = Partitions(self._spill, limit)
+        partitions = Partitions(self._spill, limit)
+        width = len(join["join_key"])
+
+        for key, key_rows in hashed.items():
+            for row in key_rows:
+                join_partitions.add(key, key + row)
+        hashed.clear()
+
+        for row, key in join_pairs:
+            join_partitions.add(key, key + row)
+        for row, key in pairs:
+            partitions.add(key, key + row)
+
+        for join_rows, rows in zip(join_partitions, partitions):
+            hashed = collections.defaultdict(list)
+            for row in join_rows:
+                hashed[row[:width]].append(row[width:])
+
+            pairs = ((row[width:], row[:width]) for row in rows)
+            yield from self._probe(join, source_context, join_context, hashed, pairs)
 
     def aggregate(self, step, context):
         group_by = self.generate_tuple(step.group.values())
         aggregations = self.generate_tuple(step.aggregations)
-        operands = self.generate_tuple(step.operands)
 
-        if operands:
-            operand_table = Table(self.table(step.operands).columns)
+        columns = context.columns
+        column_ranges = {name: table.column_range for name, table in context.tables.items()}
+        rows = context.table.iter_rows()
 
-            for reader, ctx in context:
-                operand_table.append(ctx.eval_tuple(operands))
+        if step.operands:
+            width = len(columns)
+            columns = columns + self.table(step.operands).columns
+            column_ranges[None] = range(width, len(columns))
+            rows = (row + values for row, values in self._keys(context, step.operands, rows))
 
-            for i, (a, b) in enumerate(zip(context.table.rows, operand_table.rows)):
-                context.table.rows[i] = a + b
-
-            width = len(context.columns)
-            context.add_columns(*operand_table.columns)
-
-            operand_table = Table(
-                context.columns,
-                context.table.rows,
-                range(width, width + len(operand_table.columns)),
-            )
+        context = self._join_context(columns, column_ranges)
+        table = self.table(list(step.group) + step.aggregations)
+        condition = self.generate(step.condition)
+        accumulated = self._accumulate(step, context, rows)
 
+        if accumulated is None:
+            rows = list(rows)
             context = self.context(
                 {
-                    None: operand_table,
-                    **context.tables,
+                    name: Table(columns, rows, column_range)
+                    for name, column_range in column_ranges.items()
                 }
             )
 
-        context.sort(group_by)
-
-        group = None
-        start = 0
-        end = 1
-        length = len(context.table)
-        table = self.table(list(step.group) + step.aggregations)
-        condition = self.generate(step.condition)
-
-        def add_row():
-            if not condition or context.eval(condition):
-                table.append(group + context.eval_tuple(aggregations))
-
-        if length:
-            for i in range(length):
-                context.set_index(i)
-                key = context.eval_tuple(group_by)
-                group = key if group is None else group
-                end += 1
-                if key != group:
-                    context.set_range(start, end - 2)
-                    add_row()
-                    group = key
-                    start = end - 2
-                if len(table.rows) >= step.limit:
-                    break
-                if i == length - 1:
-                    context.set_range(start, end - 1)
-                    add_row()
-        elif step.limit > 0 and not group_by:
+            if rows:
+                for group, start, end in self._group(context, group_by):
+                    context.set_range(start, end)
+                    if not condition or context.eval(condition):
+                        table.append(group + context.eval_tuple(aggregations))
+                    if len(table.rows) >= step.limit:
+                        break
+            elif step.limit > 0 and not group_by:
+                context.set_range(0, 0)
+                table.append(context.eval_tuple(aggregations))
+        elif accumulated or group_by:
+            table.rows = accumulated
+        elif step.limit > 0:
             context.set_range(0, 0)
             table.append(context.eval_tuple(aggregations))
 
@@ -308,29 +674,211 @@ class PythonExecutor:
             return self.scan(step, context)
         return context
 
+    def _accumulate(self, step, context, rows):
+        """
+        Computes the groups of an aggregate step in a single pass over its input, by hashing the
+        group key of every row and updating the running results of the group's aggregate functions.
+
+        Returns None, without consuming the rows, if some aggregate function can't be computed
+        incrementally, in which case the rows of each group have to be gathered instead. Group keys
+        that can't be hashed, e.g. because they contain arrays, are wrapped in a `_GroupKey`.
+
+        Once the groups exceed the memory limit, the rows of new groups are split into partitions
+        by key instead, and the groups of each partition are then computed one partition at a time.
+        """
+        funcs = {}
+        expressions = [e.copy() for e in step.aggregations]
+        if step.condition:
+            expressions.append(step.condition.copy())
+
+        for expression in expressions:
+            for func in list(expression.find_all(exp.AggFunc)):
+                if (
+                    type(func) not in ACCUMULATORS
+                    or isinstance(func.this, exp.Distinct)
+                    or any(v for k, v in func.args.items() if k != "this")
+                ):
+                    return None
+                name = funcs.setdefault(func, f"_acc{len(funcs)}")
+                func.replace(exp.column(name, quoted=True))
+
+        accumulators = [ACCUMULATORS[type(func)] for func in funcs]
+        group_by = list(step.group.values())
+        width = len(group_by)
+        # the group key of a row and the operands of its aggregate functions are computed together
+        steps = tuple(
+            zip(range(len(funcs)), range(width, width + len(funcs)), [a[1] for a in accumulators])
+        )
+
+        def accumulate(rows, tracker=None):
+            groups = {}
+            partitions = None
+
+            for row, values in self._keys(context, group_by + [func.this for func in funcs], rows):
+                key = values[:width]
+                try:
+                    results = groups.get(key)
+                except TypeError:
+                    key = _GroupKey(key)
+                    results = groups.get(key)
+                if results is None:
+                    if partitions is not None:
+                        partitions.add(key, row)
+                        continue
+                    results = groups[key] = [a[0] for a in accumulators]
+                    if tracker and tracker.add(key):
+                        partitions = Partitions(self._spill, self.memory_limit)
+
+                for i, j, update in steps:
+                    value = values[j]
+                    if value is not None:
+                        results[i] = update(results[i], value)
+
+            return groups, partitions
+
+        groups, partitions = accumulate(
+            rows, self.memory_limit and MemoryTracker(self.memory_limit)
+        )
+
+        def all_groups():
+            yield from groups.items()
+            for partition in partitions or ():
+                yield from accumulate(partition)[0].items()
+
+        aggregations = self.generate_tuple(expressions[: len(step.aggregations)])
+        condition = self.generate(step.condition and expressions[-1])
+        results_context = self.context({None: Table(funcs.values())})
+        accumulated = []
+
+        for key, results in all_groups():
+            results_context.set_row(tuple(a[2](result) for a, result in zip(accumulators, results)))
+            if not condition or results_context.eval(condition):
+                accumulated.append(key + results_context.eval_tuple(aggregations))
+                if len(accumulated) >= step.limit:
+                    break
+
+        return accumulated
+
+    def _group(self, context, group_by):
+        """
+        Rearranges the rows of a context so that the rows of each group are contiguous, and returns
+        the key, start and end of every group.
+
+        Rows are partitioned by hashing their group keys, in a single pass, and the groups are kept
+        in the order in which they first appear, so that sorted inputs stay sorted. If some key
+        can't be hashed, e.g. because it contains an array, the rows are sorted by key instead.
+        """
+        groups = {}
+
+        for reader, ctx in context:
+            key = ctx.eval_tuple(group_by)
+            try:
+                rows = groups.get(key)
+            except TypeError:
+                return self._sort_group(context, group_by)
+            if rows is None:
+                groups[key] = [reader.row]
+            else:
+                rows.append(reader.row)
+
+        rows = []
+        ranges = []
+
+        for key, group_rows in groups.items():
+            ranges.append((key, len(rows), len(rows) + len(group_rows)))
+            rows.extend(group_rows)
+
+        for table in context.tables.values():
+            table.rows = rows
+
+        return ranges
+
+    def _sort_group(self, context, group_by):
+        context.sort(group_by)
+
+        ranges = []
+        group = None
+        start = 0
+
+        for i in range(len(context.table)):
+            context.set_index(i)
+            key = context.eval_tuple(group_by)
+            if i == 0:
+                group = key
+            elif key != group:
+                ranges.append((group, start, i))
+                group = key
+                start = i
+
+        ranges.append((group, start, len(context.table)))
+        return ranges
+
     def sort(self, step, context):
-        projections = self.generate_tuple(step.projections)
+        """
+        Sorts the rows of a context. If they exceed the memory limit, they're written to disk in
+        sorted runs, which are then merged, i.e. it becomes an external merge sort.
+
+        With a LIMIT, the rows are streamed through a heap that only keeps the first `limit` of
+        them, so that the input is never held in memory.
+        """
         projection_columns = [p.alias_or_name for p in step.projections]
         all_columns = list(context.columns) + projection_columns
         sink = self.table(all_columns)
-        for reader, ctx in context:
-            sink.append(reader.row + ctx.eval_tuple(projections))
-
         sort_ctx = self.context(
             {
                 None: sink,
                 **{table: sink for table in context.tables},
             }
         )
-        sort_ctx.sort(self.generate_tuple(step.key))
+        key = self.generate_key(sort_ctx, step.key) or self.generate_tuple(step.key)
+        sort_key = key if callable(key) else sort_ctx.sort_key(key)
+        tracker = self.memory_limit and MemoryTracker(self.memory_limit)
+        rows = self._keys(context, step.projections, context.table.iter_rows())
+        runs = []
+
+        if step.limit < math.inf:
+            limit = int(step.limit)
+            # The heap's top is the last of the rows kept so far, the one that's replaced when a
+            # row that sorts before it comes in. Rows are numbered so that ties stay stable.
+            heap = []
+
+            for index, (row, values) in enumerate(rows if limit else ()):
+                row = row + values
+                entry = (reverse_key((sort_key(row), index)), row)
+
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                    if tracker and tracker.add(row):
+                        runs.append(self._spill.write([r for _, r in sorted(heap, reverse=True)]))
+                        heap = []
+                        tracker.reset()
+                else:
+                    heapq.heappushpop(heap, entry)
 
-        if not math.isinf(step.limit):
-            sort_ctx.table.rows = sort_ctx.table.rows[0 : step.limit]
+            sink.rows = [row for _, row in sorted(heap, reverse=True)]
+        else:
+            for row, values in rows:
+                row = row + values
+                sink.append(row)
+
+                if tracker and tracker.add(row):
+                    sort_ctx.sort(sort_key)
+                    runs.append(self._spill.write(sink.rows))
+                    sink.rows = []
+                    tracker.reset()
+
+            sort_ctx.sort(sort_key)
+
+        width = len(context.columns)
+
+        if runs:
+            rows = heapq.merge(*runs, sink.rows, key=sort_key)
+            if step.limit < math.inf:
+                rows = itertools.islice(rows, int(step.limit))
+            output = TableStream(projection_columns, (r[width:] for r in rows))
+        else:
+            output = Table(projection_columns, rows=[r[width:] for r in sink.rows])
 
-        output = Table(
-            projection_columns,
-            rows=[r[len(context.columns) : len(all_columns)] for r in sort_ctx.table.rows],
-        )
         return self.context({step.name: output})
 
     def set_operation(self, step, context):
@@ -351,6 +899,43 @@ class PythonExecutor:
         return self.context({step.name: sink})
 
 
+class _GroupKey(tuple):
+    """A group key that can't be hashed, which is hashed by a copy of it whose arrays are tuples."""
+
+    __slots__ = ()
+
+    def __hash__(self):
+        return hash(_hashable(self))
+
+
+def _hashable(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_hashable, value))
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    return value
+
+
+def _define(source, env):
+    """Defines the function `_step` of the given Python code, in which `env` is the global scope."""
+    namespace = dict(env)
+    exec(compile(source, "<step>", "exec", optimize=2), namespace)
+    return namespace["_step"]
+
+
+@lru_cache(maxsize=None)
+def _step_function(source):
+    return _define(source, ENV)
+
+
+def _evaluate_morsel(source, rows):
+    """
+    Calls the function compiled by `PythonExecutor.generate_rows` on a morsel of rows in a worker
+    process, and returns its results.
+    """
+    return list(_step_function(source)(rows))
+
+
 def _ordered_py(self, expression):
     this = self.sql(expression, "this")
     desc = "True" if expression.args.get("desc") else "False"
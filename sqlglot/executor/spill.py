@@ -0,0 +1,152 @@
+"""
+Temporary storage for the steps of `PythonExecutor` that exceed its memory limit.
+
+Steps that hold rows in memory, i.e. hash joins, aggregations and sorts, estimate the size of these
+rows with a `MemoryTracker`. Once it exceeds the limit, sorts write sorted runs of rows to disk and
+merge them, while hash joins and aggregations split their rows into `Partitions` by the hash of
+their keys, so that each partition can then be processed in memory on its own.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import typing as t
+
+from sqlglot.errors import ExecuteError
+from sqlglot.executor.table import MappedTable, write_table
+
+logger = logging.getLogger("sqlglot")
+
+# One in every SAMPLE_INTERVAL rows is measured to estimate the size of the rows held by a step
+SAMPLE_INTERVAL = 64
+
+# The number of partitions that the rows of a hash join or an aggregation are split into
+PARTITIONS = 16
+
+
+def row_size(row: t.Tuple) -> int:
+    """Estimates the number of bytes used by a row."""
+    return sys.getsizeof(row) + sum(map(sys.getsizeof, row))
+
+
+class MemoryTracker:
+    """Estimates the number of bytes used by the rows held by a step, by sampling their sizes."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.rows = 0
+        self._samples = 0
+        self._sampled_size = 0
+
+    @property
+    def size(self) -> int:
+        return self._sampled_size * self.rows // self._samples if self._samples else 0
+
+    def add(self, row: t.Tuple) -> bool:
+        """Accounts for a row and returns whether the memory limit is exceeded."""
+        if self.rows % SAMPLE_INTERVAL == 0:
+            self._samples += 1
+            self._sampled_size += row_size(row)
+        self.rows += 1
+        return self.size > self.limit
+
+    def reset(self) -> None:
+        """Accounts for the rows having been released."""
+        self.rows = 0
+
+
+class Run:
+    """Rows that have been written to a temporary file, which can be read back any number of times."""
+
+    def __init__(self, path: str, mapped: bool) -> None:
+        self.path = path
+        self.mapped = mapped
+
+    def __iter__(self) -> t.Iterator[t.Tuple]:
+        if self.mapped:
+            with MappedTable(self.path) as table:
+                yield from table.rows
+        else:
+            with open(self.path, "rb") as file:
+                rows = pickle.load(file)
+            yield from rows
+
+
+class Spill:
+    """
+    The temporary files that the rows of an execution are written to. Rows are stored in the format
+    of `MappedTable` when their values allow it, and pickled otherwise.
+    """
+
+    def __init__(self) -> None:
+        self.bytes = 0
+        self._directory: t.Optional[tempfile.TemporaryDirectory] = None
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def write(self, rows: t.Sequence[t.Tuple]) -> Run:
+        with self._lock:
+            if self._directory is None:
+                self._directory = tempfile.TemporaryDirectory(prefix="sqlglot-")
+            path = os.path.join(self._directory.name, f"{next(self._ids)}.tbl")
+
+        width = len(rows[0]) if rows else 0
+
+        try:
+            write_table(path, [f"_{i}" for i in range(width)], rows)
+            run = Run(path, mapped=True)
+        except ExecuteError:
+            with open(path, "wb") as file:
+                pickle.dump(rows, file, protocol=pickle.HIGHEST_PROTOCOL)
+            run = Run(path, mapped=False)
+
+        size = os.path.getsize(path)
+        with self._lock:
+            self.bytes += size
+
+        logger.debug("Spilled %d rows (%d bytes) to %s", len(rows), size, path)
+        return run
+
+    def close(self) -> None:
+        """Deletes the temporary files."""
+        if self._directory is not None:
+            logger.debug("Spilled %d bytes in total", self.bytes)
+            self._directory.cleanup()
+            self._directory = None
+        self.bytes = 0
+
+
+class Partitions:
+    """
+    Rows that are split into partitions by the hash of their keys. The partitions are buffered in
+    memory, and the buffers are written to disk whenever their size exceeds the memory limit.
+    """
+
+    def __init__(self, spill: Spill, limit: int, count: int = PARTITIONS) -> None:
+        self.spill = spill
+        self.tracker = MemoryTracker(limit)
+        self.buffers: t.List[t.List[t.Tuple]] = [[] for _ in range(count)]
+        self.runs: t.List[t.List[Run]] = [[] for _ in range(count)]
+
+    def add(self, key: t.Tuple, row: t.Tuple) -> None:
+        self.buffers[hash(key) % len(self.buffers)].append(row)
+        if self.tracker.add(row):
+            self.flush()
+
+    def flush(self) -> None:
+        for buffer, runs in zip(self.buffers, self.runs):
+            if buffer:
+                runs.append(self.spill.write(buffer))
+                buffer.clear()
+        self.tracker.reset()
+
+    def __iter__(self) -> t.Iterator[t.Iterator[t.Tuple]]:
+        """Yields the rows of each partition."""
+        for buffer, runs in zip(self.buffers, self.runs):
+            yield itertools.chain(*runs, buffer)
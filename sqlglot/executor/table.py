@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import datetime
+import itertools
+import json
+import mmap
+import os
+import sys
 import typing as t
+from array import array
 
+from sqlglot.errors import ExecuteError
 from sqlglot.helper import dict_depth
 from sqlglot.schema import AbstractMappingSchema
 
@@ -41,6 +49,10 @@ class Table:
     def __iter__(self):
         return TableIter(self)
 
+    def iter_rows(self):
+        """Returns an iterator over the table's rows, without going through its reader."""
+        return iter(self.rows)
+
     def __getitem__(self, index):
         self.reader.row = self.rows[index]
         return self.reader
@@ -66,6 +78,59 @@ class Table:
         return "\n".join(lines)
 
 
+class TableStream(Table):
+    """
+    A table whose rows are lazily produced by an iterator, so that steps can be pipelined.
+
+    Iterating over the table consumes the iterator one row at a time, without storing the rows,
+    and can only be done once. Accessing the table's rows in any other way, e.g. by index, stores
+    all of them first.
+    """
+
+    def __init__(self, columns, rows: t.Iterator[t.Tuple], column_range=None):
+        super().__init__(columns, column_range=column_range)
+        self._stream: t.Optional[t.Iterator[t.Tuple]] = rows
+
+    @property  # type: ignore
+    def rows(self):
+        if self._stream is not None:
+            stream, self._stream = self._stream, None
+            self._rows = list(stream)
+        if self._rows is None:
+            raise ExecuteError("The rows of a pipelined table have already been consumed")
+        return self._rows
+
+    @rows.setter
+    def rows(self, rows):
+        self._stream = None
+        self._rows = rows
+
+    def __iter__(self):
+        if self._stream is None:
+            return super().__iter__()
+        return self._consume()
+
+    def iter_rows(self):
+        if self._stream is None:
+            return super().iter_rows()
+        stream, self._stream = self._stream, None
+        self._rows = None
+        return stream
+
+    def _consume(self):
+        stream, self._stream = self._stream, None
+        self._rows = None
+        reader = self.reader
+
+        for row in stream:
+            reader.row = row
+            yield reader
+
+    def __repr__(self):
+        self.rows
+        return super().__repr__()
+
+
 class TableIter:
     def __init__(self, table):
         self.table = table
@@ -104,6 +169,249 @@ class RowReader:
         return self.row[self.columns[column]]
 
 
+# The first bytes of the files written by `write_table`
+MAGIC = b"SQLGLOT\x01"
+
+
+class MappedTable(Table):
+    """
+    A table that's stored in a file written by `write_table`, which is memory-mapped instead of
+    read: opening the table only parses its header and string dictionaries, and its rows are
+    decoded from the mapped columns when they're accessed.
+
+    The file starts with `MAGIC`, followed by the length of a JSON header that describes where
+    the columns are stored. Each column is a fixed-width array of native int64, float64, bool or
+    date ordinal values, or an array of int32 codes into a dictionary of strings, along with a
+    byte per row that's set for NULLs if the column has any.
+
+    The mapping is released by `close`, or when the table is used as a context manager and the
+    `with` block exits, after which its rows can't be accessed anymore.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._views: t.List[memoryview] = []
+
+        try:
+            header = bytes(self.buffer[: len(MAGIC) + 8])
+            if header[: len(MAGIC)] != MAGIC:
+                raise ExecuteError(f"'{path}' is not a table file")
+
+            start = len(header)
+            size = int.from_bytes(header[len(MAGIC) :], "little")
+            self.header = json.loads(self.buffer[start : start + size])
+            if self.header["byteorder"] != sys.byteorder:
+                raise ExecuteError(f"'{path}' was written on a machine with a different byte order")
+        except Exception:
+            self.buffer.close()
+            raise
+
+        self.data_offset = _align(start + size)
+        length = self.header["length"]
+        super().__init__(
+            self.header["columns"],
+            MappedRows([self._column(layout) for layout in self.header["layout"]], length),
+        )
+
+    def section(self, layout: t.List[int], format: str) -> memoryview:
+        """Returns a view of the values of a section of the file, given its offset and size."""
+        offset, size = layout
+        offset += self.data_offset
+        view = memoryview(self.buffer)
+        section = view[offset : offset + size].cast(format)  # type: ignore
+        self._views.extend((view, section))
+        return section
+
+    def close(self) -> None:
+        """
+        Releases the views of the file and unmaps it. If arrays that share the memory of its
+        columns are still referenced, the file is only unmapped once they're garbage-collected.
+        """
+        try:
+            while self._views:
+                self._views[-1].release()
+                self._views.pop()
+            self.buffer.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> MappedTable:
+        return self
+
+    def __exit__(self, *exc: t.Any) -> None:
+        self.close()
+
+    def dictionary(self, layout: t.Dict) -> t.List[str]:
+        offsets = self.section(layout["offsets"], "q")
+        strings = bytes(self.section(layout["strings"], "B"))
+        return [
+            strings[start:end].decode("utf-8", "surrogatepass")
+            for start, end in zip(offsets, offsets[1:])
+        ]
+
+    def _column(self, layout: t.Dict) -> t.Any:
+        kind = layout["kind"]
+        length = self.header["length"]
+
+        if kind == "null":
+            return _Decoded(lambda _: None, range(length))
+
+        values: t.Any = self.section(layout["values"], MAPPED_FORMATS[kind])
+
+        if kind == "str":
+            values = _Decoded(self.dictionary(layout).__getitem__, values)
+        elif kind == "date":
+            values = _Decoded(datetime.date.fromordinal, values)
+
+        if layout.get("nulls"):
+            values = _Nullable(values, self.section(layout["nulls"], "?"))
+
+        return values
+
+
+# The array formats of the values of the columns of a `MappedTable`, by kind
+MAPPED_FORMATS = {"int": "q", "float": "d", "bool": "?", "date": "i", "str": "i"}
+
+
+class MappedRows:
+    """The rows of a `MappedTable`, which are assembled from its columns when accessed."""
+
+    def __init__(self, columns: t.List[t.Any], length: int) -> None:
+        self.columns = columns
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(self.length)[index]]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("table index out of range")
+        return tuple(column[index] for column in self.columns)
+
+    def __iter__(self) -> t.Iterator[t.Tuple]:
+        if not self.columns:
+            return itertools.repeat((), self.length)
+        return zip(*self.columns)
+
+
+class _Decoded:
+    def __init__(self, decode: t.Callable, values: t.Any) -> None:
+        self.decode = decode
+        self.values = values
+
+    def __getitem__(self, index: int) -> t.Any:
+        return self.decode(self.values[index])
+
+    def __iter__(self) -> t.Iterator:
+        return map(self.decode, self.values)
+
+
+class _Nullable:
+    def __init__(self, values: t.Any, nulls: t.Sequence) -> None:
+        self.values = values
+        self.nulls = nulls
+
+    def __getitem__(self, index: int) -> t.Any:
+        return None if self.nulls[index] else self.values[index]
+
+    def __iter__(self) -> t.Iterator:
+        return (None if null else value for value, null in zip(self.values, self.nulls))
+
+
+def write_table(
+    path: str | os.PathLike, columns: t.Sequence[str], rows: t.Sequence[t.Tuple]
+) -> None:
+    """
+    Writes rows to a file that can be opened as a `MappedTable`.
+
+    Args:
+        path: the path of the file.
+        columns: the names of the columns.
+        rows: the rows, whose values can be ints, floats, bools, strings, dates or NULLs. The
+            non-NULL values of a column must all have the same type.
+    """
+    layouts = []
+    sections: t.List[bytes] = []
+    offset = 0
+
+    def add(data: bytes) -> t.List[int]:
+        nonlocal offset
+        start = offset
+        padding = _align(len(data)) - len(data)
+        sections.append(data + b"\x00" * padding)
+        offset += len(data) + padding
+        return [start, len(data)]
+
+    for column, values in zip(columns, zip(*rows) if rows else [()] * len(columns)):
+        kinds = {type(value) for value in values if value is not None}
+        kind = kinds.pop().__name__ if len(kinds) == 1 else ("null" if not kinds else None)
+
+        if kind not in (*MAPPED_FORMATS, "null"):
+            raise ExecuteError(f"Column '{column}' can't be stored: unsupported value types")
+
+        layout: t.Dict[str, t.Any] = {"kind": kind}
+
+        if kind == "str":
+            dictionary: t.Dict[str, int] = {}
+            codes = array(
+                "i", (0 if v is None else dictionary.setdefault(v, len(dictionary)) for v in values)
+            )
+            strings = [s.encode("utf-8", "surrogatepass") for s in dictionary]
+            offsets = array("q", [0])
+            for string in strings:
+                offsets.append(offsets[-1] + len(string))
+            layout["offsets"] = add(offsets.tobytes())
+            layout["strings"] = add(b"".join(strings))
+            layout["values"] = add(codes.tobytes())
+        elif kind == "date":
+            layout["values"] = add(
+                array("i", (1 if v is None else v.toordinal() for v in values)).tobytes()
+            )
+        elif kind != "null":
+            default = False if kind == "bool" else 0
+            try:
+                data = array(
+                    MAPPED_FORMATS[kind] if kind != "bool" else "b",
+                    (default if v is None else v for v in values),
+                )
+            except OverflowError:
+                raise ExecuteError(f"Column '{column}' can't be stored: integer out of range")
+            layout["values"] = add(data.tobytes())
+
+        if kind != "null" and None in values:
+            layout["nulls"] = add(bytes(v is None for v in values))
+
+        layouts.append(layout)
+
+    header = json.dumps(
+        {
+            "columns": list(columns),
+            "length": len(rows),
+            "layout": layouts,
+            "byteorder": sys.byteorder,
+        }
+    ).encode()
+    start = len(MAGIC) + 8 + len(header)
+
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(header).to_bytes(8, "little"))
+        file.write(header)
+        file.write(b"\x00" * (_align(start) - start))
+        for section in sections:
+            file.write(section)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
 class Tables(AbstractMappingSchema[Table]):
     pass
 
@@ -125,6 +433,8 @@ def _ensure_tables(d: t.Optional[t.Dict]) -> t.Dict:
     for name, table in d.items():
         if isinstance(table, Table):
             result[name] = table
+        elif isinstance(table, (str, os.PathLike)):
+            result[name] = MappedTable(table)
         else:
             columns = tuple(table[0]) if table else ()
             rows = [tuple(row[c] for c in columns) for row in table]
@@ -83,7 +83,7 @@ class Expression(metaclass=_Expression):
 
     key = "expression"
     arg_types = {"this": True}
-    __slots__ = ("args", "parent", "arg_key", "comments", "_type", "_meta", "_hash")
+    __slots__ = ("args", "parent", "arg_key", "comments", "_type", "_meta", "_hash", "_dirty")
 
     def __init__(self, **args: t.Any):
         self.args: t.Dict[str, t.Any] = args
@@ -93,6 +93,7 @@ class Expression(metaclass=_Expression):
         self._type: t.Optional[DataType] = None
         self._meta: t.Optional[t.Dict[str, t.Any]] = None
         self._hash: t.Optional[int] = None
+        self._dirty = True
 
         for arg_key, value in self.args.items():
             self._set_parent(arg_key, value)
@@ -236,17 +237,43 @@ class Expression(metaclass=_Expression):
         return self._meta
 
     def __deepcopy__(self, memo):
-        copy = self.__class__(**deepcopy(self.args))
-        if self.comments is not None:
-            copy.comments = deepcopy(self.comments)
-
-        if self._type is not None:
-            copy._type = self._type.copy()
-
-        if self._meta is not None:
-            copy._meta = deepcopy(self._meta)
-
-        return copy
+        # The tree is copied iteratively, node by node, which is much faster than recursing
+        # through copy.deepcopy for every arg and doesn't hit the recursion limit on deep trees
+        root = self.__class__()
+        stack = [(self, root)]
+
+        while stack:
+            node, copy = stack.pop()
+
+            if node.comments is not None:
+                copy.comments = list(node.comments)
+            if node._type is not None:
+                copy._type = node._type.copy()
+            if node._meta is not None:
+                copy._meta = deepcopy(node._meta)
+
+            args = copy.args
+            for k, vs in node.args.items():
+                if isinstance(vs, Expression):
+                    args[k] = child = vs.__class__()
+                    child.parent = copy
+                    child.arg_key = k
+                    stack.append((vs, child))
+                elif type(vs) is list:
+                    args[k] = values = []
+                    for v in vs:
+                        if isinstance(v, Expression):
+                            child = v.__class__()
+                            child.parent = copy
+                            child.arg_key = k
+                            stack.append((v, child))
+                            values.append(child)
+                        else:
+                            values.append(_copy_value(v))
+                else:
+                    args[k] = _copy_value(vs)
+
+        return root
 
     def copy(self):
         """
@@ -274,6 +301,7 @@ class Expression(metaclass=_Expression):
             self.args[arg_key] = []
         self.args[arg_key].append(value)
         self._set_parent(arg_key, value)
+        self._invalidate_hash()
 
     def set(self, arg_key: str, value: t.Any) -> None:
         """
@@ -285,14 +313,28 @@ class Expression(metaclass=_Expression):
         """
         self.args[arg_key] = value
         self._set_parent(arg_key, value)
+        self._invalidate_hash()
+
+    def _invalidate_hash(self) -> None:
+        # A cached hash depends on the whole subtree, so it's stale for all ancestors as well. The
+        # nodes whose subtree changed are also marked dirty, see helper.while_changing
+        node: t.Optional[Expression] = self
+        while node is not None and node._hash is not None:
+            node._hash = None
+            node._dirty = True
+            node = node.parent
 
     def _set_parent(self, arg_key: str, value: t.Any) -> None:
         if hasattr(value, "parent"):
+            if value.parent is not self or value.arg_key != arg_key:
+                value._dirty = True
             value.parent = self
             value.arg_key = arg_key
         elif type(value) is list:
             for v in value:
                 if hasattr(v, "parent"):
+                    if v.parent is not self or v.arg_key != arg_key:
+                        v._dirty = True
                     v.parent = self
                     v.arg_key = arg_key
 
@@ -4680,6 +4722,13 @@ def _norm_arg(arg):
     return arg.lower() if type(arg) is str else arg
 
 
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _copy_value(value: t.Any) -> t.Any:
+    return value if isinstance(value, _IMMUTABLE_TYPES) else deepcopy(value)
+
+
 ALL_FUNCTIONS = subclasses(__name__, Func, (AggFunc, Anonymous, Func))
 
 
@@ -5722,6 +5771,8 @@ def replace_children(expression: Expression, fun: t.Callable, *args, **kwargs) -
     """
     Replace children of an expression with the result of a lambda fun(child) -> exp.
     """
+    changed = False
+
     for k, v in expression.args.items():
         is_list_arg = type(v) is list
 
@@ -5730,7 +5781,13 @@ def replace_children(expression: Expression, fun: t.Callable, *args, **kwargs) -
 
         for cn in child_nodes:
             if isinstance(cn, Expression):
-                for child_node in ensure_collection(fun(cn, *args, **kwargs)):
+                new_nodes = ensure_collection(fun(cn, *args, **kwargs))
+                changed = changed or len(new_nodes) != 1
+
+                for child_node in new_nodes:
+                    # Nodes that are moved here are dirty, because their context has changed
+                    if child_node is not cn or child_node.parent is not expression:
+                        child_node._dirty = changed = True
                     new_child_nodes.append(child_node)
                     child_node.parent = expression
                     child_node.arg_key = k
@@ -5739,6 +5796,9 @@ def replace_children(expression: Expression, fun: t.Callable, *args, **kwargs) -
 
         expression.args[k] = new_child_nodes if is_list_arg else seq_get(new_child_nodes, 0)
 
+    if changed:
+        expression._invalidate_hash()
+
 
 def column_table_names(expression: Expression, exclude: str = "") -> t.Set[str]:
     """
@@ -11,10 +11,6 @@ from sqlglot.tokens import TokenType
 
 logger = logging.getLogger("sqlglot")
 
-global need_fk_for_index, exclude_fk_constraint
-need_fk_for_index = False
-exclude_fk_constraint = False
-
 
 class Generator:
     """
@@ -51,6 +47,15 @@ class Generator:
             Default: 80
         comments: Whether or not to preserve comments in the output SQL code.
             Default: True
+        fk_index: Whether or not to append a CREATE INDEX statement for each foreign key
+            after the statement that defines it.
+            Default: False
+        fk_constraint_in_create: Whether or not to move the foreign key constraints of a CREATE
+            statement into separate ALTER TABLE statements that follow it.
+            Default: False
+
+    All the state of a generator is kept in its instance, so different generators can be used
+    concurrently, e.g. from multiple threads. A single generator is not thread-safe.
     """
 
     TRANSFORMS = {
@@ -311,10 +316,13 @@ class Generator:
         "leading_comma",
         "max_text_width",
         "comments",
+        "fk_index",
+        "fk_constraint_in_create",
         "unsupported_messages",
         "_escaped_quote_end",
         "_escaped_identifier_end",
         "_cache",
+        "_hashed",
     )
 
     def __init__(
@@ -345,6 +353,8 @@ class Generator:
         self.leading_comma = leading_comma
         self.max_text_width = max_text_width
         self.comments = comments
+        self.fk_index = fk_index
+        self.fk_constraint_in_create = fk_constraint_in_create
 
         # This is both a Dialect property and a Generator argument, so we prioritize the latter
         self.normalize_functions = (
@@ -355,6 +365,7 @@ class Generator:
         self._escaped_quote_end: str = self.STRING_ESCAPE + self.QUOTE_END
         self._escaped_identifier_end: str = self.IDENTIFIER_ESCAPE + self.IDENTIFIER_END
         self._cache: t.Optional[t.Dict[int, str]] = None
+        self._hashed: t.List[exp.Expression] = []
 
     def generate(
         self,
@@ -367,26 +378,31 @@ class Generator:
 
         Args:
             expression: The syntax tree.
-            cache: An optional sql string cache. This leverages the hash of an Expression
-                which can be slow to compute, so only use it if you set _hash on each node.
+            cache: An optional sql string cache, keyed by the hash of each Expression, so that
+                repeated subtrees are only generated once. The hashes of the tree's nodes are
+                computed bottom-up in a single pass and cached until the generation is done.
 
         Returns:
             The SQL string corresponding to `expression`.
         """
-        global need_fk_for_index
-        global exclude_fk_constraint
         fk_index = opts.get("fk_index")
         fk_constraint_in_create = opts.get("fk_constraint_in_create")
         if fk_index is not None:
-            need_fk_for_index = fk_index
+            self.fk_index = fk_index
         if fk_constraint_in_create is not None:
-            exclude_fk_constraint = fk_constraint_in_create
+            self.fk_constraint_in_create = fk_constraint_in_create
 
         if cache is not None:
             self._cache = cache
         self.unsupported_messages = []
-        sql = self.sql(expression).strip()
-        self._cache = None
+
+        try:
+            sql = self.sql(expression).strip()
+        finally:
+            self._cache = None
+            for node in self._hashed:
+                node._hash = None
+            self._hashed = []
 
         if self.unsupported_level == ErrorLevel.IGNORE:
             return sql
@@ -510,6 +526,9 @@ class Generator:
             return self.sql(expression.args.get(key))
 
         if self._cache is not None:
+            # Trees that were copied by a transform, e.g. in transforms.preprocess, are hashed too
+            if expression._hash is None:
+                self._hashed.extend(_cache_hashes(expression))
             expression_id = hash(expression)
 
             if expression_id in self._cache:
@@ -771,17 +790,15 @@ class Generator:
 
         expression_sql = f"CREATE{modifiers} {kind}{exists_sql} {this}{properties_sql}{expression_sql}{postexpression_props_sql}{index_sql}{no_schema_binding}{clone}"
         create_table_exp = self.prepend_ctes(expression, expression_sql)
-        global need_fk_for_index
-        global exclude_fk_constraint
 
-        if need_fk_for_index:
+        if self.fk_index:
             foreign_key_ind = expression.foreign_key_index
             if foreign_key_ind and foreign_key_ind != "":
                 for index_sql in foreign_key_ind:
                     if index_sql != "":
                         create_table_exp += ";\n" + index_sql
 
-        if exclude_fk_constraint is True:
+        if self.fk_constraint_in_create is True:
             alter_fk_constraint = expression.foreign_key_constraint
             if alter_fk_constraint:
                 for constraint_sql in alter_fk_constraint:
@@ -2167,7 +2184,7 @@ class Generator:
         exists = " IF EXISTS" if expression.args.get("exists") else ""
         alterTable_sql = f"ALTER TABLE{exists} {self.sql(expression, 'this')} {actions}"
 
-        if need_fk_for_index:
+        if self.fk_index:
             if expression.args.get("foreign_key_index"):
                 foreign_index_exp = expression.args.get("foreign_key_index")
                 if foreign_index_exp is not None:
@@ -2494,3 +2511,23 @@ def cached_generator(
     cache = {} if cache is None else cache
     generator = Generator(normalize=True, identify="safe")
     return lambda e: generator.generate(e, cache)
+
+
+def _cache_hashes(expression: exp.Expression) -> t.List[exp.Expression]:
+    """
+    Caches the hash of every node in the tree that doesn't have one yet, bottom-up, so that each
+    hash is computed in constant time from the hashes of its children. Returns the hashed nodes.
+    """
+    # The descendants of a node whose hash is cached have cached hashes too, so they're skipped
+    hashed = [expression]
+    for node in hashed:
+        for value in node.args.values():
+            if type(value) is list:
+                hashed.extend(v for v in value if isinstance(v, exp.Expression) and v._hash is None)
+            elif isinstance(value, exp.Expression) and value._hash is None:
+                hashed.append(value)
+
+    for node in reversed(hashed):
+        node._hash = hash(node)
+
+    return hashed
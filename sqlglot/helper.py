@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import inspect
+import io
 import logging
 import re
 import sys
@@ -18,6 +19,8 @@ if t.TYPE_CHECKING:
 
 CAMEL_CASE_PATTERN = re.compile("(?<!^)(?=[A-Z])")
 PYTHON_VERSION = sys.version_info[:2]
+# The number of bytes that are read at a time from the files opened by `open_file`
+FILE_BUFFER_SIZE = 1 << 20
 logger = logging.getLogger("sqlglot")
 
 
@@ -192,6 +195,12 @@ def while_changing(expression: Expression, func: t.Callable[[Expression], E]) ->
     """
     Applies a transformation to a given expression until a fix point is reached.
 
+    The fix point is detected by comparing the hash of the expression before and after each pass.
+    The hashes of the nodes are cached for the duration of the transformation, so that only the
+    nodes modified by a pass need to be rehashed. These nodes, along with the nodes that were moved,
+    are marked dirty, which means that transformations can skip the subtrees that aren't dirty
+    in the next pass and unmark the ones that are as they visit them.
+
     Args:
         expression: The expression to be transformed.
         func: The transformation to be applied.
@@ -199,21 +208,43 @@ def while_changing(expression: Expression, func: t.Callable[[Expression], E]) ->
     Returns:
         The transformed expression.
     """
-    while True:
-        for n, *_ in reversed(tuple(expression.walk())):
-            n._hash = hash(n)
+    for n, *_ in expression.walk():
+        n._hash = None
+
+    try:
+        start = _rehash(expression)
 
-        start = hash(expression)
-        expression = func(expression)
+        while True:
+            expression = func(expression)
+            end = _rehash(expression)
 
+            if start == end:
+                break
+            start = end
+    finally:
         for n, *_ in expression.walk():
             n._hash = None
-        if start == hash(expression):
-            break
 
     return expression
 
 
+def _rehash(expression: Expression) -> int:
+    """
+    Caches the hashes of the nodes whose hash was invalidated, bottom-up, and marks them dirty.
+    The descendants of a node whose hash is still cached are unchanged, so they're skipped.
+    """
+    nodes = [expression] if expression._hash is None else []
+
+    for node in nodes:
+        nodes.extend(child for _, child in node.iter_expressions() if child._hash is None)
+
+    for node in reversed(nodes):
+        node._hash = hash(node)
+        node._dirty = True
+
+    return hash(expression)
+
+
 def tsort(dag: t.Dict[T, t.Set[T]]) -> t.List[T]:
     """
     Sorts a given directed acyclic graph in topological order.
@@ -249,16 +280,32 @@ def tsort(dag: t.Dict[T, t.Set[T]]) -> t.List[T]:
 
 
 def open_file(file_name: str) -> t.TextIO:
-    """Open a file that may be compressed as gzip and return it in universal newline mode."""
+    """
+    Open a file that may be compressed as gzip, bzip2 or xz and return it in universal newline mode.
+    The file is read in chunks of `FILE_BUFFER_SIZE` bytes.
+    """
     with open(file_name, "rb") as f:
-        gzipped = f.read(2) == b"\x1f\x8b"
+        magic = f.read(6)
 
-    if gzipped:
+    file: t.Optional[io.BufferedIOBase] = None
+
+    if magic.startswith(b"\x1f\x8b"):
         import gzip
 
-        return gzip.open(file_name, "rt", newline="")
+        file = gzip.open(file_name)
+    elif magic.startswith(b"BZh"):
+        import bz2
+
+        file = bz2.open(file_name)
+    elif magic == b"\xfd7zXZ\x00":
+        import lzma
+
+        file = lzma.open(file_name)
+
+    if file is None:
+        return open(file_name, encoding="utf-8", newline="", buffering=FILE_BUFFER_SIZE)
 
-    return open(file_name, encoding="utf-8", newline="")
+    return io.TextIOWrapper(io.BufferedReader(file, FILE_BUFFER_SIZE), encoding="utf-8", newline="")
 
 
 @contextmanager
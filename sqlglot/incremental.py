@@ -0,0 +1,173 @@
+"""
+Incremental re-parsing of edited SQL scripts.
+
+Editors and other tools that parse a SQL script after every change can use `reparse` instead of
+`sqlglot.parse`, so that only the statements affected by an edit are tokenized and parsed again:
+
+    >>> import sqlglot
+    >>> from sqlglot.incremental import reparse
+    >>> sql = "SELECT a FROM x; SELECT b FROM y"
+    >>> tokens = sqlglot.Dialect.get_or_raise(None)().tokenize(sql)
+    >>> expressions = sqlglot.parse(sql)
+    >>> sql, tokens, new_expressions = reparse(sql, tokens, expressions, 7, 1, "c")
+    >>> [expression.sql() for expression in new_expressions]
+    ['SELECT c FROM x', 'SELECT b FROM y']
+    >>> new_expressions[1] is expressions[1]
+    True
+
+----
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from sqlglot.dialects.dialect import Dialect
+from sqlglot.tokens import Token, TokenType
+
+if t.TYPE_CHECKING:
+    from sqlglot import expressions as exp
+    from sqlglot.dialects.dialect import DialectType
+
+
+def reparse(
+    sql: str,
+    tokens: t.List[Token],
+    expressions: t.List[t.Optional[exp.Expression]],
+    offset: int,
+    removed: int,
+    inserted: str,
+    read: DialectType = None,
+    **opts,
+) -> t.Tuple[str, t.List[Token], t.List[t.Optional[exp.Expression]]]:
+    """
+    Applies a text edit to a SQL script that has already been tokenized and parsed, and returns the
+    tokens and syntax trees of the edited script, which are the same as the ones `tokenize` and
+    `parse` would produce for it.
+
+    Tokenization restarts near the beginning of the statement that contains the edit and stops
+    right after the first semicolon that follows the edit and was also a statement boundary before
+    it, so only the statements in between are parsed again. The tokens that follow are shifted to their new
+    positions, whereas the syntax trees of all the other statements are reused as they are.
+
+    Since each damaged statement is parsed on its own, its syntax tree may differ from the one
+    `parse` produces with `ErrorLevel.IGNORE` or `ErrorLevel.WARN` if a preceding statement
+    is invalid, because then the parser is affected by the errors it has already recorded.
+
+    Args:
+        sql: the SQL code string before the edit.
+        tokens: the tokens of `sql`, e.g. as returned by `Dialect.tokenize`.
+        expressions: the syntax trees of `sql`, e.g. as returned by `sqlglot.parse`.
+        offset: the position in `sql` where the edit starts.
+        removed: the number of characters that are removed at `offset`.
+        inserted: the text that is inserted at `offset`.
+        read: the SQL dialect that was used to tokenize and parse `sql`.
+        **opts: other `sqlglot.parser.Parser` options.
+
+    Returns:
+        A tuple containing the edited SQL code string, its tokens and its syntax trees.
+    """
+    if not 0 <= offset <= offset + removed <= len(sql):
+        raise ValueError(f"Edit at {offset} removing {removed} characters is out of bounds")
+
+    dialect = Dialect.get_or_raise(read)()
+    new_sql = sql[:offset] + inserted + sql[offset + removed :]
+    delta = len(inserted) - removed
+    edit_end = offset + len(inserted)
+
+    if dialect.tokenizer_class.CONDITIONAL_COMMENT_VERSIONS and ("/*!" in sql or "/*!" in new_sql):
+        # Conditional comments can span multiple statements, so the script is parsed in full
+        new_tokens = dialect.tokenize(new_sql)
+        return new_sql, new_tokens, dialect.parser(**opts).parse(new_tokens, new_sql)
+
+    semicolons = [i for i, token in enumerate(tokens) if token.token_type == TokenType.SEMICOLON]
+
+    # The damaged statement is the first one whose terminating semicolon isn't before the edit
+    statement = 0
+    while statement < len(semicolons) and tokens[semicolons[statement]].end < offset:
+        statement += 1
+
+    # Unchanged semicolons after the edit that are followed by a token, by their new position
+    boundaries = {
+        tokens[index].start + delta: (number, index)
+        for number, index in enumerate(semicolons[statement:], start=statement)
+        if tokens[index].start >= offset + removed and index + 1 < len(tokens)
+    }
+
+    # Tokenization restarts one statement earlier, because the comments that follow the
+    # semicolon which precedes the damaged statement are attached to it and may be edited
+    restart = max(statement - 1, 0)
+    tokenizer = dialect.tokenizer_class()
+    tokenizer.reset()
+
+    start = 0
+    if restart:
+        previous = tokens[semicolons[restart - 1]]
+        start = previous.end + 1
+        tokenizer._resume(previous.line, previous.col)
+
+    first = len(tokenizer.tokens)
+    resync: t.List[t.Tuple[int, int]] = []
+
+    # Scanning stops after the token that follows an unchanged semicolon, because only then
+    # all the comments around the semicolon have been attached to it
+    def until() -> bool:
+        scanned = tokenizer.tokens
+        if len(scanned) - first > 1:
+            semicolon = scanned[-2]
+            if semicolon.token_type == TokenType.SEMICOLON and semicolon.start >= edit_end:
+                boundary = boundaries.get(semicolon.start)
+                if boundary and scanned[-1].start == tokens[boundary[1] + 1].start + delta:
+                    resync.append(boundary)
+                    return True
+        return False
+
+    scanned = t.cast(t.List[Token], tokenizer._tokenize(new_sql, start, until))[first:]
+    new_tokens = tokens[: semicolons[restart - 1] + 1] if restart else []
+    new_tokens.extend(scanned[:-1] if resync else scanned)
+
+    # The statement before the damaged one is unchanged, so it's not parsed again, and neither
+    # is the one that starts with the last scanned token, if we resynchronized
+    damaged = scanned[:-1] if resync else scanned
+    if statement > restart:
+        damaged = damaged[_index_of_semicolon(damaged) + 1 :]
+
+    # Like in Parser._parse, a semicolon at the end doesn't start a new statement
+    parsed = dialect.parser(**opts).parse(damaged, new_sql) if damaged or not statement else []
+    new_expressions = expressions[:statement] + parsed
+
+    if resync:
+        number, index = resync[0]
+        old = tokens[index + 1]
+        new = scanned[-1]
+        line_delta = new.line - old.line
+        col_delta = new.col - old.col
+
+        # The tokens that follow are the same as before, but their positions may have changed.
+        # The last scanned token is replaced too, since its trailing comments weren't scanned.
+        for token in tokens[index + 1 :]:
+            cols = col_delta if token.line == old.line else 0
+            new_tokens.append(_shift(token, delta, line_delta, cols))
+
+        new_expressions.extend(expressions[number + 1 :])
+
+    return new_sql, new_tokens, new_expressions
+
+
+def _shift(token: Token, offset: int, lines: int, cols: int) -> Token:
+    if not (offset or lines or cols):
+        return token
+
+    return Token(
+        token.token_type,
+        token.text,
+        line=token.line + lines,
+        col=token.col + cols,
+        start=token.start + offset,
+        end=token.end + offset,
+        comments=token.comments,
+    )
+
+
+def _index_of_semicolon(tokens: t.List[Token]) -> int:
+    return next(i for i, token in enumerate(tokens) if token.token_type == TokenType.SEMICOLON)
@@ -1,2 +1,2 @@
-from sqlglot.optimizer.optimizer import RULES, optimize
+from sqlglot.optimizer.optimizer import RULES, RuleProfile, optimize
 from sqlglot.optimizer.scope import Scope, build_scope, traverse_scope
@@ -17,6 +17,7 @@ def annotate_types(
     schema: t.Optional[t.Dict | Schema] = None,
     annotators: t.Optional[t.Dict[t.Type[E], t.Callable[[TypeAnnotator, E], E]]] = None,
     coerces_to: t.Optional[t.Dict[exp.DataType.Type, t.Set[exp.DataType.Type]]] = None,
+    root_scope: t.Optional[Scope] = None,
 ) -> E:
     """
     Infers the types of an expression, annotating its AST accordingly.
@@ -34,6 +35,7 @@ def annotate_types(
         schema: Database schema.
         annotators: Maps expression type to corresponding annotation function.
         coerces_to: Maps expression type to set of types that it can be coerced into.
+        root_scope: The scope tree of the expression, if it's already built.
 
     Returns:
         The expression annotated with types.
@@ -41,7 +43,7 @@ def annotate_types(
 
     schema = ensure_schema(schema)
 
-    return TypeAnnotator(schema, annotators, coerces_to).annotate(expression)
+    return TypeAnnotator(schema, annotators, coerces_to).annotate(expression, root_scope)
 
 
 def _annotate_with_type_lambda(data_type: exp.DataType.Type) -> t.Callable[[TypeAnnotator, E], E]:
@@ -232,8 +234,8 @@ class TypeAnnotator(metaclass=_TypeAnnotator):
         self.annotators = annotators or self.ANNOTATORS
         self.coerces_to = coerces_to or self.COERCES_TO
 
-    def annotate(self, expression: E) -> E:
-        for scope in traverse_scope(expression):
+    def annotate(self, expression: E, root_scope: t.Optional[Scope] = None) -> E:
+        for scope in traverse_scope(expression, root_scope):
             selects = {}
             for name, source in scope.sources.items():
                 if not isinstance(source, Scope):
@@ -1,7 +1,7 @@
 from sqlglot.optimizer.scope import Scope, build_scope
 
 
-def eliminate_ctes(expression):
+def eliminate_ctes(expression, root_scope=None):
     """
     Remove unused CTEs from an expression.
 
@@ -14,10 +14,12 @@ def eliminate_ctes(expression):
 
     Args:
         expression (sqlglot.Expression): expression to optimize
+        root_scope (sqlglot.optimizer.scope.Scope): the scope tree of the expression, if it's
+            already built
     Returns:
         sqlglot.Expression: optimized expression
     """
-    root = build_scope(expression)
+    root = build_scope(expression, root_scope)
 
     if root:
         ref_count = root.ref_count()
@@ -30,6 +32,7 @@ def eliminate_ctes(expression):
                     cte_node = scope.expression.parent
                     with_node = cte_node.parent
                     cte_node.pop()
+                    scope.parent.clear_cache()
 
                     # Pop the entire WITH clause if this is the last CTE
                     if len(with_node.expressions) <= 0:
@@ -3,7 +3,7 @@ from sqlglot.optimizer.normalize import normalized
 from sqlglot.optimizer.scope import Scope, traverse_scope
 
 
-def eliminate_joins(expression):
+def eliminate_joins(expression, root_scope=None):
     """
     Remove unused joins from an expression.
 
@@ -18,10 +18,12 @@ def eliminate_joins(expression):
 
     Args:
         expression (sqlglot.Expression): expression to optimize
+        root_scope (sqlglot.optimizer.scope.Scope): the scope tree of the expression, if it's
+            already built
     Returns:
         sqlglot.Expression: optimized expression
     """
-    for scope in traverse_scope(expression):
+    for scope in traverse_scope(expression, root_scope):
         # If any columns in this scope aren't qualified, it's hard to determine if a join isn't used.
         # It's probably possible to infer this from the outputs of derived tables.
         # But for now, let's just skip this rule.
@@ -5,7 +5,7 @@ from sqlglot.helper import find_new_name
 from sqlglot.optimizer.scope import build_scope
 
 
-def eliminate_subqueries(expression):
+def eliminate_subqueries(expression, root_scope=None):
     """
     Rewrite derived tables as CTES, deduplicating if possible.
 
@@ -22,15 +22,19 @@ def eliminate_subqueries(expression):
 
     Args:
         expression (sqlglot.Expression): expression
+        root_scope (sqlglot.optimizer.scope.Scope): the scope tree of the expression, if it's
+            already built
     Returns:
         sqlglot.Expression: expression
     """
     if isinstance(expression, exp.Subquery):
         # It's possible to have subqueries at the root, e.g. (SELECT * FROM x) LIMIT 1
         eliminate_subqueries(expression.this)
+        if root_scope:
+            root_scope.clear_cache()
         return expression
 
-    root = build_scope(expression)
+    root = build_scope(expression, root_scope)
 
     if not root:
         return expression
@@ -54,15 +58,25 @@ def eliminate_subqueries(expression):
             }
         )
 
+    # The scopes that are eliminated are replaced in, or removed from, their parent scopes
+    modified = [
+        scope.parent
+        for scope in root.traverse()
+        if (scope.is_union or scope.is_derived_table or scope.is_cte)
+        and scope not in root.cte_scopes
+    ]
+
     # Map of Expression->alias
     # Existing CTES in the root expression. We'll use this for deduplication.
     existing_ctes = {}
 
     with_ = root.expression.args.get("with")
     recursive = False
+    root_ctes = []
     if with_:
         recursive = with_.args.get("recursive")
-        for cte in with_.expressions:
+        root_ctes = list(with_.expressions)
+        for cte in root_ctes:
             existing_ctes[cte.this] = cte.alias
     new_ctes = []
 
@@ -91,6 +105,12 @@ def eliminate_subqueries(expression):
     if new_ctes:
         expression.set("with", exp.With(expressions=new_ctes, recursive=recursive))
 
+    if list(map(id, new_ctes)) != list(map(id, root_ctes)):
+        modified.append(root)
+
+    for scope in modified:
+        scope.clear_cache()
+
     return expression
 
 
@@ -143,7 +163,7 @@ def _eliminate_derived_table(scope, existing_ctes, taken):
     parent = scope.expression.parent
     name, cte = _new_cte(scope, existing_ctes, taken)
 
-    table = exp.alias_(exp.table_(name), alias=parent.alias or name)
+    table = exp.alias_(exp.table_(name), alias=parent.alias or name, copy=False)
     parent.replace(table)
 
     return cte
@@ -4,10 +4,11 @@ from sqlglot.optimizer.scope import traverse_scope
 from sqlglot.schema import ensure_schema
 
 
-def isolate_table_selects(expression, schema=None):
+def isolate_table_selects(expression, schema=None, root_scope=None):
     schema = ensure_schema(schema)
+    modified = []
 
-    for scope in traverse_scope(expression):
+    for scope in traverse_scope(expression, root_scope):
         if len(scope.selected_sources) == 1:
             continue
 
@@ -26,5 +27,9 @@ def isolate_table_selects(expression, schema=None):
                 )
                 .subquery(source.alias, copy=False)
             )
+            modified.append(scope)
+
+    for scope in modified:
+        scope.clear_cache()
 
     return expression
@@ -5,7 +5,7 @@ from sqlglot.helper import find_new_name
 from sqlglot.optimizer.scope import Scope, traverse_scope
 
 
-def merge_subqueries(expression, leave_tables_isolated=False):
+def merge_subqueries(expression, leave_tables_isolated=False, root_scope=None):
     """
     Rewrite sqlglot AST to merge derived tables into the outer query.
 
@@ -28,11 +28,13 @@ def merge_subqueries(expression, leave_tables_isolated=False):
     Args:
         expression (sqlglot.Expression): expression to optimize
         leave_tables_isolated (bool):
+        root_scope (sqlglot.optimizer.scope.Scope): the scope tree of the expression, if it's
+            already built
     Returns:
         sqlglot.Expression: optimized expression
     """
-    expression = merge_ctes(expression, leave_tables_isolated)
-    expression = merge_derived_tables(expression, leave_tables_isolated)
+    expression = merge_ctes(expression, leave_tables_isolated, root_scope)
+    expression = merge_derived_tables(expression, leave_tables_isolated, root_scope)
     return expression
 
 
@@ -47,8 +49,8 @@ UNMERGABLE_ARGS = set(exp.Select.arg_types) - {
 }
 
 
-def merge_ctes(expression, leave_tables_isolated=False):
-    scopes = traverse_scope(expression)
+def merge_ctes(expression, leave_tables_isolated=False, root_scope=None):
+    scopes = traverse_scope(expression, root_scope)
 
     # All places where we select from CTEs.
     # We key on the CTE scope so we can detect CTES that are selected from multiple times.
@@ -81,8 +83,8 @@ def merge_ctes(expression, leave_tables_isolated=False):
     return expression
 
 
-def merge_derived_tables(expression, leave_tables_isolated=False):
-    for outer_scope in traverse_scope(expression):
+def merge_derived_tables(expression, leave_tables_isolated=False, root_scope=None):
+    for outer_scope in traverse_scope(expression, root_scope):
         for subquery in outer_scope.derived_tables:
             from_or_join = subquery.find_ancestor(exp.From, exp.Join)
             alias = subquery.alias_or_name
@@ -377,3 +379,4 @@ def _pop_cte(inner_scope):
         with_.pop()
     else:
         cte.pop()
+    inner_scope.parent.clear_cache()
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import itertools
 import typing as t
 
 from sqlglot import exp
 from sqlglot.helper import tsort
 
+if t.TYPE_CHECKING:
+    from sqlglot.schema import ColumnStatistics, Schema
+
 JOIN_ATTRS = ("on", "side", "kind", "using", "method")
 
+# The selectivity of the predicates whose selectivity can't be estimated from statistics
+DEFAULT_SELECTIVITY = 1 / 3
+
+# Selects that join more tables than this are ordered greedily, rather than by dynamic programming
+DP_LIMIT = 10
 
-def optimize_joins(expression):
+
+def optimize_joins(expression, schema=None):
     """
-    Removes cross joins if possible and reorder joins based on predicate dependencies.
+    Removes cross joins if possible and reorder joins based on predicate dependencies, or based on
+    their estimated cost if the schema has statistics for the joined tables.
 
     Example:
         >>> from sqlglot import parse_one
@@ -44,17 +55,24 @@ def optimize_joins(expression):
                             predicate.replace(exp.true())
                             join.on(predicate, copy=False)
 
-    expression = reorder_joins(expression)
+    expression = reorder_joins(expression, schema)
     expression = normalize(expression)
     return expression
 
 
-def reorder_joins(expression):
+def reorder_joins(expression, schema: t.Optional[Schema] = None):
     """
     Reorder joins by topological sort order based on predicate references.
+
+    If a select only has inner joins and the schema has statistics for all of its tables, they're
+    reordered by estimated cost instead, see `reorder_joins_by_cost`.
     """
-    for from_ in expression.find_all(exp.From):
+    for from_ in list(expression.find_all(exp.From)):
         parent = from_.parent
+
+        if schema and reorder_joins_by_cost(parent, schema):
+            continue
+
         joins = {join.alias_or_name: join for join in parent.args.get("joins", [])}
         dag = {name: other_table_names(join) for name, join in joins.items()}
         parent.set(
@@ -64,6 +82,271 @@ def reorder_joins(expression):
     return expression
 
 
+def reorder_joins_by_cost(select: exp.Expression, schema: Schema) -> bool:
+    """
+    Reorder the tables of a select, including the one it selects from, so that the estimated
+    cost of its joins is minimal. The predicates of the joins are moved to the first join where
+    all of the tables they reference are available.
+
+    The cost of a sequence of joins is the sum of the estimated number of rows of each join and of
+    each joined table, which is hashed by engines that execute joins as hash joins, e.g. the
+    executor. The numbers of rows are estimated from the schema's statistics: the selectivity of
+    an equality is the inverse of the number of distinct values of its columns, and the
+    selectivity of the predicates that can't be estimated is `DEFAULT_SELECTIVITY`.
+
+    The joins of up to `DP_LIMIT` tables are ordered by dynamic programming, over every subset
+    of the tables, and larger joins are ordered greedily.
+
+    Returns:
+        Whether or not the joins could be reordered, i.e. whether they're all inner joins of
+        tables that have statistics.
+    """
+    from_ = select.args.get("from")
+    joins = select.args.get("joins")
+
+    if not from_ or not joins or not isinstance(select, exp.Select) or select.is_star:
+        return False
+
+    for join in joins:
+        if (
+            any(join.args.get(arg) for arg in ("side", "using", "method"))
+            or join.kind not in ("", "INNER", "CROSS")
+            or not isinstance(join.this, (exp.Table, exp.Subquery))
+        ):
+            return False
+
+    sources = [from_.this, *(join.this for join in joins)]
+    names = [source.alias_or_name for source in sources]
+    relations = [_relation(source, schema) for source in sources]
+
+    if len(set(names)) < len(names) or not all(relations):
+        return False
+
+    predicates = [
+        predicate
+        for join in joins
+        for predicate in _conjuncts(join.args.get("on"))
+        if not isinstance(predicate, exp.Boolean)
+    ]
+    where = select.args.get("where")
+    filters = [*predicates, *_conjuncts(where and where.this)]
+
+    indices = {name: i for i, name in enumerate(names)}
+    estimator = _Estimator(t.cast(t.List[_Relation], relations), indices, filters)
+
+    if len(sources) <= DP_LIMIT:
+        order = estimator.dynamic_order()
+    else:
+        order = estimator.greedy_order()
+
+    if order == list(range(len(sources))):
+        return True
+
+    positions = {index: position for position, index in enumerate(order)}
+    conditions: t.List[t.List[exp.Expression]] = [[] for _ in order]
+
+    for predicate in predicates:
+        tables = [indices[table] for table in exp.column_table_names(predicate) if table in indices]
+        conditions[max((positions[i] for i in tables), default=1) or 1].append(predicate)
+
+    from_.set("this", sources[order[0]])
+    select.set(
+        "joins",
+        [
+            exp.Join(
+                this=sources[index],
+                on=exp.and_(*conditions[position], copy=False) if conditions[position] else None,
+            )
+            for position, index in enumerate(order)
+            if position
+        ],
+    )
+    return True
+
+
+def _conjuncts(condition: t.Optional[exp.Expression]) -> t.List[exp.Expression]:
+    if isinstance(condition, exp.And):
+        return list(condition.flatten())
+    return [condition] if condition else []
+
+
+class _Relation:
+    """A table that's joined, along with the statistics of its columns."""
+
+    def __init__(
+        self, rows: float, columns: t.Dict[str, ColumnStatistics], names: t.Dict[str, str]
+    ) -> None:
+        self.rows = rows
+        self.columns = columns
+        self.names = names
+
+    def column(self, name: str) -> t.Optional[ColumnStatistics]:
+        return self.columns.get(self.names.get(name, name))
+
+
+def _relation(source: exp.Expression, schema: Schema) -> t.Optional[_Relation]:
+    """
+    Returns the statistics of a table, or of a subquery that selects from a single table, in which
+    case the number of rows is estimated from its filters.
+    """
+    if isinstance(source, exp.Table):
+        statistics = schema.table_statistics(source)
+        return _Relation(statistics.rows, statistics.columns, {}) if statistics else None
+
+    select = source.this
+
+    if (
+        not isinstance(select, exp.Select)
+        or not select.args.get("from")
+        or not isinstance(select.args["from"].this, exp.Table)
+        or any(select.args.get(arg) for arg in ("joins", "group", "having", "limit", "distinct"))
+        or any(projection.find(exp.AggFunc) for projection in select.expressions)
+    ):
+        return None
+
+    table = select.args["from"].this
+    statistics = schema.table_statistics(table)
+
+    if not statistics:
+        return None
+
+    names = {
+        projection.alias_or_name: projection.unalias().name
+        for projection in select.expressions
+        if isinstance(projection.unalias(), exp.Column)
+    }
+    relation = _Relation(statistics.rows, statistics.columns, {})
+    where = select.args.get("where")
+
+    if where:
+        estimator = _Estimator([relation], {table.alias_or_name: 0}, _conjuncts(where.this))
+        relation.rows = estimator.rows(frozenset([0]))
+
+    relation.names = names
+    return relation
+
+
+class _Estimator:
+    """Estimates the number of rows of the joins of subsets of relations."""
+
+    def __init__(
+        self,
+        relations: t.List[_Relation],
+        indices: t.Dict[str, int],
+        predicates: t.List[exp.Expression],
+    ) -> None:
+        self.relations = relations
+        self.indices = indices
+        self.predicates = [
+            (
+                frozenset(
+                    indices[table]
+                    for table in exp.column_table_names(predicate)
+                    if table in indices
+                ),
+                self.selectivity(predicate),
+            )
+            for predicate in predicates
+        ]
+        self._rows: t.Dict[t.FrozenSet[int], float] = {}
+
+    def rows(self, subset: t.FrozenSet[int]) -> float:
+        if subset not in self._rows:
+            rows = 1.0
+            for index in subset:
+                rows *= self.relations[index].rows
+            for tables, selectivity in self.predicates:
+                if tables and tables <= subset:
+                    rows *= selectivity
+            self._rows[subset] = rows
+        return self._rows[subset]
+
+    def cost(self, subset: t.FrozenSet[int], index: int) -> float:
+        """The cost of joining a relation to the join of a subset of relations."""
+        return self.rows(subset | {index}) + self.rows(frozenset([index]))
+
+    def dynamic_order(self) -> t.List[int]:
+        best: t.Dict[t.FrozenSet[int], t.Tuple[float, t.List[int]]] = {
+            frozenset([i]): (0.0, [i]) for i in range(len(self.relations))
+        }
+
+        for size in range(2, len(self.relations) + 1):
+            for subset in map(frozenset, itertools.combinations(range(len(self.relations)), size)):
+                # ties are broken in favor of the original order of the tables
+                for index in sorted(subset, reverse=True):
+                    cost, order = best[subset - {index}]
+                    cost += self.cost(subset - {index}, index)
+                    if subset not in best or cost < best[subset][0]:
+                        best[subset] = (cost, order + [index])
+
+        return best[frozenset(range(len(self.relations)))][1]
+
+    def greedy_order(self) -> t.List[int]:
+        indices = range(len(self.relations))
+        first, second = min(
+            ((i, j) for i in indices for j in indices if i != j),
+            key=lambda pair: self.cost(frozenset(pair[:1]), pair[1]),
+        )
+        order = [first, second]
+        remaining = [i for i in range(len(self.relations)) if i not in order]
+
+        while remaining:
+            subset = frozenset(order)
+            index = min(remaining, key=lambda i: self.cost(subset, i))
+            order.append(index)
+            remaining.remove(index)
+
+        return order
+
+    def column(self, column: exp.Expression) -> t.Optional[t.Tuple[_Relation, ColumnStatistics]]:
+        if not isinstance(column, exp.Column) or column.table not in self.indices:
+            return None
+        relation = self.relations[self.indices[column.table]]
+        statistics = relation.column(column.name)
+        return (relation, statistics) if statistics else None
+
+    def distinct(self, column: exp.Expression) -> t.Optional[float]:
+        resolved = self.column(column)
+        if not resolved:
+            return None
+        relation, statistics = resolved
+        return max(statistics.distinct or relation.rows, 1)
+
+    def not_null(self, column: exp.Expression) -> float:
+        resolved = self.column(column)
+        return 1 - resolved[1].null_fraction if resolved else 1
+
+    def selectivity(self, predicate: exp.Expression) -> float:
+        predicate = predicate.unnest()
+
+        if isinstance(predicate, exp.And):
+            return self.selectivity(predicate.left) * self.selectivity(predicate.right)
+        if isinstance(predicate, exp.Or):
+            left = self.selectivity(predicate.left)
+            right = self.selectivity(predicate.right)
+            return left + right - left * right
+        if isinstance(predicate, exp.Not):
+            return 1 - self.selectivity(predicate.this)
+        if isinstance(predicate, exp.Is) and isinstance(predicate.expression, exp.Null):
+            resolved = self.column(predicate.this)
+            return resolved[1].null_fraction if resolved else DEFAULT_SELECTIVITY
+        if isinstance(predicate, exp.EQ):
+            left, right = predicate.this, predicate.expression
+            distincts = [d for d in (self.distinct(left), self.distinct(right)) if d]
+            if not distincts or (
+                isinstance(left, exp.Column)
+                and isinstance(right, exp.Column)
+                and left.table == right.table
+            ):
+                return DEFAULT_SELECTIVITY
+            return self.not_null(left) * self.not_null(right) / max(distincts)
+        if isinstance(predicate, exp.In) and predicate.expressions:
+            distinct = self.distinct(predicate.this)
+            if distinct:
+                return min(len(predicate.expressions) / distinct, 1) * self.not_null(predicate.this)
+        return DEFAULT_SELECTIVITY
+
+
 def normalize(expression):
     """
     Remove INNER and OUTER from joins as they are optional.
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import time
 import typing as t
+from dataclasses import dataclass
 
 import sqlglot
 from sqlglot import Schema, exp
@@ -17,6 +19,7 @@ from sqlglot.optimizer.pushdown_predicates import pushdown_predicates
 from sqlglot.optimizer.pushdown_projections import pushdown_projections
 from sqlglot.optimizer.qualify import qualify
 from sqlglot.optimizer.qualify_columns import quote_identifiers
+from sqlglot.optimizer.scope import STATS, build_scope
 from sqlglot.optimizer.simplify import simplify
 from sqlglot.optimizer.unnest_subqueries import unnest_subqueries
 from sqlglot.schema import ensure_schema
@@ -39,6 +42,26 @@ RULES = (
 )
 
 
+@dataclass(frozen=True)
+class RuleProfile:
+    """The profile of the application of an optimizer rule, which is reported by `optimize`."""
+
+    rule: str
+    """The name of the rule."""
+
+    time: float
+    """The wall time spent in the rule, in seconds."""
+
+    nodes_before: int
+    """The number of nodes of the expression before the rule was applied."""
+
+    nodes_after: int
+    """The number of nodes of the expression after the rule was applied."""
+
+    scopes: int
+    """The number of scopes that were traversed by the rule, including the ones that were reused."""
+
+
 def optimize(
     expression: str | exp.Expression,
     schema: t.Optional[dict | Schema] = None,
@@ -46,11 +69,16 @@ def optimize(
     catalog: t.Optional[str] = None,
     dialect: DialectType = None,
     rules: t.Sequence[t.Callable] = RULES,
+    profile: t.Optional[t.Callable[[RuleProfile], t.Any]] = None,
     **kwargs,
 ) -> exp.Expression:
     """
     Rewrite a sqlglot AST into an optimized form.
 
+    The scope tree of the expression is shared by consecutive rules that take a `root_scope`
+    argument: these rules report the scopes they modify by clearing their cache, so that only
+    those are built again for the next rule, see `Scope.refresh`.
+
     Args:
         expression: expression to optimize
         schema: database schema.
@@ -66,6 +94,9 @@ def optimize(
         rules: sequence of optimizer rules to use.
             Many of the rules require tables and columns to be qualified.
             Do not remove `qualify` from the sequence of rules unless you know what you're doing!
+        profile: an optional callback that's called with a `RuleProfile` after each rule is
+            applied. The nodes of the expression are only counted when it's set, and
+            `sqlglot.optimize_cache` isn't used, so that all the rules are always applied.
         **kwargs: If a rule has a keyword argument with a same name in **kwargs, it will be passed in.
 
     Returns:
@@ -83,12 +114,59 @@ def optimize(
     }
 
     expression = exp.maybe_parse(expression, dialect=dialect, copy=True)
+    cache = sqlglot.optimize_cache if profile is None else None
+    key = (
+        cache.key(expression, dialect, rules, schema, db=db, catalog=catalog, **kwargs)
+        if cache is not None
+        else None
+    )
+
+    if cache is not None and key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    root_scope = None
+
     for rule in rules:
         # Find any additional rule parameters, beyond `expression`
-        rule_params = rule.__code__.co_varnames
+        code = rule.__code__
+        rule_params = code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
         rule_kwargs = {
             param: possible_kwargs[param] for param in rule_params if param in possible_kwargs
         }
+
+        # The scope tree that's built for a rule is accounted for in its profile
+        if profile is not None:
+            nodes_before = _count_nodes(t.cast(exp.Expression, expression))
+            scopes = STATS.scopes
+            start = time.perf_counter()
+
+        # The other rules don't keep the scope tree up-to-date, so it's built again after them
+        if "root_scope" in rule_params:
+            root_scope = build_scope(t.cast(exp.Expression, expression), root_scope)
+            rule_kwargs["root_scope"] = root_scope
+        else:
+            root_scope = None
+
         expression = rule(expression, **rule_kwargs)
 
+        if profile is not None:
+            profile(
+                RuleProfile(
+                    rule=rule.__name__,
+                    time=time.perf_counter() - start,
+                    nodes_before=nodes_before,
+                    nodes_after=_count_nodes(t.cast(exp.Expression, expression)),
+                    scopes=STATS.scopes - scopes,
+                )
+            )
+
+    if cache is not None and key is not None:
+        cache.put(key, t.cast(exp.Expression, expression))
+
     return t.cast(exp.Expression, expression)
+
+
+def _count_nodes(expression: exp.Expression) -> int:
+    return sum(1 for _ in expression.walk())
@@ -1,10 +1,10 @@
 from sqlglot import exp
 from sqlglot.optimizer.normalize import normalized
-from sqlglot.optimizer.scope import build_scope
+from sqlglot.optimizer.scope import Scope, build_scope
 from sqlglot.optimizer.simplify import simplify
 
 
-def pushdown_predicates(expression):
+def pushdown_predicates(expression, root_scope=None):
     """
     Rewrite sqlglot AST to pushdown predicates in FROMS and JOINS
 
@@ -17,17 +17,30 @@ def pushdown_predicates(expression):
 
     Args:
         expression (sqlglot.Expression): expression to optimize
+        root_scope (sqlglot.optimizer.scope.Scope): the scope tree of the expression, if it's
+            already built
     Returns:
         sqlglot.Expression: optimized expression
     """
-    root = build_scope(expression)
+    root = build_scope(expression, root_scope)
 
     if root:
         scope_ref_count = root.ref_count()
+        modified = []
 
         for scope in reversed(list(root.traverse())):
             select = scope.expression
             where = select.args.get("where")
+
+            if where or select.args.get("joins"):
+                # The conditions are simplified, and may be pushed down to the selected sources
+                modified.append(scope)
+                modified.extend(
+                    source
+                    for _, source in scope.selected_sources.values()
+                    if isinstance(source, Scope)
+                )
+
             if where:
                 selected_sources = scope.selected_sources
                 # a right join can only push down to itself and not the source FROM table
@@ -44,6 +57,9 @@ def pushdown_predicates(expression):
                 name = join.alias_or_name
                 pushdown(join.args.get("on"), {name: scope.selected_sources[name]}, scope_ref_count)
 
+        for scope in modified:
+            scope.clear_cache()
+
     return expression
 
 
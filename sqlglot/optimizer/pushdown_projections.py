@@ -12,7 +12,7 @@ SELECT_ALL = object()
 DEFAULT_SELECTION = lambda: alias("1", "_")
 
 
-def pushdown_projections(expression, schema=None, remove_unused_selections=True):
+def pushdown_projections(expression, schema=None, remove_unused_selections=True, root_scope=None):
     """
     Rewrite sqlglot AST to remove unused columns projections.
 
@@ -26,6 +26,8 @@ def pushdown_projections(expression, schema=None, remove_unused_selections=True)
     Args:
         expression (sqlglot.Expression): expression to optimize
         remove_unused_selections (bool): remove selects that are unused
+        root_scope (sqlglot.optimizer.scope.Scope): the scope tree of the expression, if it's
+            already built
     Returns:
         sqlglot.Expression: optimized expression
     """
@@ -36,7 +38,7 @@ def pushdown_projections(expression, schema=None, remove_unused_selections=True)
     # We build the scope tree (which is traversed in DFS postorder), then iterate
     # over the result in reverse order. This should ensure that the set of selected
     # columns for a particular scope are completely build by the time we get to it.
-    for scope in reversed(traverse_scope(expression)):
+    for scope in reversed(traverse_scope(expression, root_scope)):
         parent_selections = referenced_columns.get(scope, {SELECT_ALL})
 
         if scope.expression.args.get("distinct") or scope.parent and scope.parent.pivots:
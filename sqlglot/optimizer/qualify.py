@@ -12,6 +12,7 @@ from sqlglot.optimizer.qualify_columns import (
     validate_qualify_columns as validate_qualify_columns_func,
 )
 from sqlglot.optimizer.qualify_tables import qualify_tables
+from sqlglot.optimizer.scope import build_scope
 from sqlglot.schema import Schema, ensure_schema
 
 
@@ -61,20 +62,29 @@ def qualify(
     """
     schema = ensure_schema(schema, dialect=dialect)
     expression = normalize_identifiers(expression, dialect=dialect)
-    expression = qualify_tables(expression, db=db, catalog=catalog, schema=schema)
+
+    # The steps below share the scope tree, quoting identifiers doesn't modify it
+    root_scope = build_scope(expression)
+    expression = qualify_tables(
+        expression, db=db, catalog=catalog, schema=schema, root_scope=root_scope
+    )
 
     if isolate_tables:
-        expression = isolate_table_selects(expression, schema=schema)
+        expression = isolate_table_selects(expression, schema=schema, root_scope=root_scope)
 
     if qualify_columns:
         expression = qualify_columns_func(
-            expression, schema, expand_alias_refs=expand_alias_refs, infer_schema=infer_schema
+            expression,
+            schema,
+            expand_alias_refs=expand_alias_refs,
+            infer_schema=infer_schema,
+            root_scope=root_scope,
         )
 
     if quote_identifiers:
         expression = quote_identifiers_func(expression, dialect=dialect, identify=identify)
 
     if validate_qualify_columns:
-        validate_qualify_columns_func(expression)
+        validate_qualify_columns_func(expression, root_scope=root_scope)
 
     return expression
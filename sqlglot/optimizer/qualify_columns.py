@@ -17,6 +17,7 @@ def qualify_columns(
     schema: t.Dict | Schema,
     expand_alias_refs: bool = True,
     infer_schema: t.Optional[bool] = None,
+    root_scope: t.Optional[Scope] = None,
 ) -> exp.Expression:
     """
     Rewrite sqlglot AST to have fully qualified columns.
@@ -33,13 +34,16 @@ def qualify_columns(
         schema: Database schema
         expand_alias_refs: whether or not to expand references to aliases
         infer_schema: whether or not to infer the schema if missing
+        root_scope: the scope tree of the expression, if it's already built
     Returns:
         sqlglot.Expression: qualified expression
     """
     schema = ensure_schema(schema)
     infer_schema = schema.empty if infer_schema is None else infer_schema
 
-    for scope in traverse_scope(expression):
+    scopes = traverse_scope(expression, root_scope)
+
+    for scope in scopes:
         resolver = Resolver(scope, schema, infer_schema=infer_schema)
         _pop_table_column_aliases(scope.ctes)
         _pop_table_column_aliases(scope.derived_tables)
@@ -59,13 +63,17 @@ def qualify_columns(
         _expand_group_by(scope, resolver)
         _expand_order_by(scope)
 
+    # Columns are qualified, expanded and aliased in place throughout the scopes
+    for scope in scopes:
+        scope.clear_cache()
+
     return expression
 
 
-def validate_qualify_columns(expression):
+def validate_qualify_columns(expression, root_scope: t.Optional[Scope] = None):
     """Raise an `OptimizeError` if any columns aren't qualified"""
     unqualified_columns = []
-    for scope in traverse_scope(expression):
+    for scope in traverse_scope(expression, root_scope):
         if isinstance(scope.expression, exp.Select):
             unqualified_columns.extend(scope.unqualified_columns)
             if scope.external_columns and not scope.is_correlated_subquery and not scope.pivots:
@@ -406,6 +414,7 @@ def _qualify_outputs(scope):
             selection = alias(
                 selection,
                 alias=selection.output_name or f"_col_{i}",
+                copy=False,
             )
         if aliased_column:
             selection.set("alias", exp.to_identifier(aliased_column))
@@ -13,6 +13,7 @@ def qualify_tables(
     db: t.Optional[str] = None,
     catalog: t.Optional[str] = None,
     schema: t.Optional[Schema] = None,
+    root_scope: t.Optional[Scope] = None,
 ) -> E:
     """
     Rewrite sqlglot AST to have fully qualified tables. Additionally, this
@@ -33,6 +34,7 @@ def qualify_tables(
         db: Database name
         catalog: Catalog name
         schema: A schema to populate
+        root_scope: The scope tree of the expression, if it's already built.
 
     Returns:
         The qualified expression.
@@ -40,23 +42,27 @@ def qualify_tables(
     (*) See section 7.2.1.2 in https://www.postgresql.org/docs/current/queries-table-expressions.html
     """
     next_alias_name = name_sequence("_q_")
+    modified = []
 
-    for scope in traverse_scope(expression):
+    for scope in traverse_scope(expression, root_scope):
         for derived_table in itertools.chain(scope.ctes, scope.derived_tables):
             # Expand join construct
             if isinstance(derived_table, exp.Subquery):
                 unnested = derived_table.unnest()
                 if isinstance(unnested, exp.Table):
                     derived_table.this.replace(exp.select("*").from_(unnested.copy(), copy=False))
+                    modified.append(scope)
 
             if not derived_table.args.get("alias"):
                 alias_ = next_alias_name()
                 derived_table.set("alias", exp.TableAlias(this=exp.to_identifier(alias_)))
                 scope.rename_source(None, alias_)
+                modified.append(scope)
 
             pivots = derived_table.args.get("pivots")
             if pivots and not pivots[0].alias:
                 pivots[0].set("alias", exp.TableAlias(this=exp.to_identifier(next_alias_name())))
+                modified.append(scope)
 
         for name, source in scope.sources.items():
             if isinstance(source, exp.Table):
@@ -75,12 +81,18 @@ def qualify_tables(
                             table=True,
                         )
                     )
+                    modified.append(scope)
+
+                    # Lateral sources are tables of the parent scope
+                    if name in scope.lateral_sources:
+                        modified.append(scope.parent)
 
                 pivots = source.args.get("pivots")
                 if pivots and not pivots[0].alias:
                     pivots[0].set(
                         "alias", exp.TableAlias(this=exp.to_identifier(next_alias_name()))
                     )
+                    modified.append(scope)
 
                 if schema and isinstance(source.this, exp.ReadCSV):
                     with csv_reader(source.this) as reader:
@@ -95,6 +107,7 @@ def qualify_tables(
                     this=exp.to_identifier(next_alias_name())
                 )
                 udtf.set("alias", table_alias)
+                modified.append(scope)
 
                 if not table_alias.name:
                     table_alias.set("this", exp.to_identifier(next_alias_name()))
@@ -102,4 +115,7 @@ def qualify_tables(
                     for i, e in enumerate(udtf.expressions[0].expressions):
                         table_alias.append("columns", exp.to_identifier(f"_col_{i}"))
 
+    for scope in modified:
+        scope.clear_cache()
+
     return expression
@@ -1,4 +1,5 @@
 import itertools
+import threading
 import typing as t
 from collections import defaultdict
 from enum import Enum, auto
@@ -8,6 +9,19 @@ from sqlglot.errors import OptimizeError
 from sqlglot.helper import find_new_name
 
 
+class _Stats(threading.local):
+    # The number of scopes that traverse_scope returned in the current thread,
+    # see optimizer.RuleProfile
+    scopes = 0
+
+
+STATS = _Stats()
+
+# Whether the scope trees that are refreshed by traverse_scope are compared with ones that are built
+# from scratch. It's slow, so it's only meant to be enabled in tests and when debugging rules.
+CHECK_REFRESH = False
+
+
 class ScopeType(Enum):
     ROOT = auto()
     SUBQUERY = auto()
@@ -61,6 +75,7 @@ class Scope:
         self.sources = sources or {}
         self.lateral_sources = lateral_sources.copy() if lateral_sources else {}
         self.sources.update(self.lateral_sources)
+        self._base_sources = dict(self.sources)
         self.outer_column_list = outer_column_list or []
         self.parent = parent
         self.scope_type = scope_type
@@ -73,6 +88,7 @@ class Scope:
         self.clear_cache()
 
     def clear_cache(self):
+        self._modified = True
         self._collected = False
         self._raw_columns = None
         self._derived_tables = None
@@ -462,6 +478,52 @@ class Scope:
             yield from child_scope.traverse()
         yield self
 
+    def refresh(self):
+        """
+        Bring the scope tree from this node up-to-date with the expression it was built for.
+
+        Optimizer rules that modify the expression of a scope report it by clearing the scope's
+        cache, e.g. with `clear_cache`, `replace`, `add_source` or `remove_source`. Modified scopes
+        are built again, along with their child scopes, while the other scopes are kept as they
+        are, along with the nodes they've already collected.
+
+        Returns:
+            bool: whether any scope was built again
+        """
+        with_ = self.expression.args.get("with")
+
+        # The scopes of a recursive CTE get their sources from the scope that defines it
+        if self._modified or (
+            with_
+            and with_.recursive
+            and any(
+                scope._modified for cte_scope in self.cte_scopes for scope in cte_scope.traverse()
+            )
+        ):
+            self.sources = dict(self._base_sources)
+            self.subquery_scopes = []
+            self.derived_table_scopes = []
+            self.table_scopes = []
+            self.cte_scopes = []
+            self.union_scopes = []
+            self.udtf_scopes = []
+            self.clear_cache()
+            _mark_unmodified(_traverse_scope(self))
+            return True
+
+        refreshed = False
+        for child_scope in itertools.chain(
+            self.cte_scopes, self.union_scopes, self.table_scopes, self.subquery_scopes
+        ):
+            refreshed = child_scope.refresh() or refreshed
+
+        if refreshed:
+            # The columns of this scope depend on its child scopes, e.g. on their external columns
+            self.clear_cache()
+            self._modified = False
+
+        return refreshed
+
     def ref_count(self):
         """
         Count the number of times each scope in this tree is referenced.
@@ -478,7 +540,9 @@ class Scope:
         return scope_ref_count
 
 
-def traverse_scope(expression: exp.Expression) -> t.List[Scope]:
+def traverse_scope(
+    expression: exp.Expression, root_scope: t.Optional[Scope] = None
+) -> t.List[Scope]:
     """
     Traverse an expression by it's "scopes".
 
@@ -500,29 +564,95 @@ def traverse_scope(expression: exp.Expression) -> t.List[Scope]:
 
     Args:
         expression (exp.Expression): expression to traverse
+        root_scope (Scope): a scope tree that was built for the expression before, and that's
+            brought up-to-date with `Scope.refresh` instead of being built again
     Returns:
         list[Scope]: scope instances
     """
-    if not isinstance(expression, exp.Unionable):
-        return []
-    return list(_traverse_scope(Scope(expression)))
+    if root_scope is not None and root_scope.expression is expression:
+        root_scope.refresh()
+        scopes = list(root_scope.traverse())
+
+        if CHECK_REFRESH:
+            _check_refresh(scopes, list(_traverse_scope(Scope(expression))))
+    elif isinstance(expression, exp.Unionable):
+        scopes = _mark_unmodified(_traverse_scope(Scope(expression)))
+    else:
+        scopes = []
 
+    STATS.scopes += len(scopes)
+    return scopes
 
-def build_scope(expression: exp.Expression) -> t.Optional[Scope]:
+
+def build_scope(
+    expression: exp.Expression, root_scope: t.Optional[Scope] = None
+) -> t.Optional[Scope]:
     """
     Build a scope tree.
 
     Args:
         expression (exp.Expression): expression to build the scope tree for
+        root_scope (Scope): a scope tree that was built for the expression before, and that's
+            brought up-to-date with `Scope.refresh` instead of being built again
     Returns:
         Scope: root scope
     """
-    scopes = traverse_scope(expression)
+    scopes = traverse_scope(expression, root_scope)
     if scopes:
         return scopes[-1]
     return None
 
 
+def _check_refresh(scopes: t.List[Scope], fresh_scopes: t.List[Scope]) -> None:
+    for scope, fresh_scope in itertools.zip_longest(scopes, fresh_scopes):
+        if scope is None or fresh_scope is None or _state(scope) != _state(fresh_scope):
+            raise OptimizeError(f"Refreshed scope {scope} differs from the one built from scratch")
+
+
+def _state(scope: Scope) -> t.Tuple:
+    """The nodes that a scope refers to, identified by their id so that stale ones are noticed."""
+
+    def ids(nodes):
+        return [id(node.expression if isinstance(node, Scope) else node) for node in nodes]
+
+    # Sources can clash until the tables are qualified, in which case both trees fail the same way
+    try:
+        selected_sources = {name: ids(source) for name, source in scope.selected_sources.items()}
+    except OptimizeError as e:
+        selected_sources = str(e)
+
+    return (
+        scope.scope_type,
+        id(scope.expression),
+        id(scope.parent.expression) if scope.parent else None,
+        list(scope.sources),
+        ids(scope.sources.values()),
+        list(scope.lateral_sources),
+        scope.outer_column_list,
+        ids(scope.columns),
+        ids(scope.external_columns),
+        selected_sources,
+        *(
+            ids(child_scopes)
+            for child_scopes in (
+                scope.cte_scopes,
+                scope.union_scopes,
+                scope.table_scopes,
+                scope.derived_table_scopes,
+                scope.udtf_scopes,
+                scope.subquery_scopes,
+            )
+        ),
+    )
+
+
+def _mark_unmodified(scopes: t.Iterable[Scope]) -> t.List[Scope]:
+    result = list(scopes)
+    for scope in result:
+        scope._modified = False
+    return result
+
+
 def _traverse_scope(scope):
     if isinstance(scope.expression, exp.Select):
         yield from _traverse_select(scope)
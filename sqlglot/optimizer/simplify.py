@@ -28,6 +28,12 @@ def simplify(expression):
     generate = cached_generator()
 
     def _simplify(expression, root=True):
+        # The rules only depend on a node's subtree and its parent, so a subtree that wasn't
+        # modified or moved by the previous pass can't be simplified any further
+        if not expression._dirty and not root:
+            return expression
+        expression._dirty = False
+
         node = expression
         node = rewrite_between(node)
         node = uniq_sort(node, generate, root)
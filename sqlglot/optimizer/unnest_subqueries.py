@@ -3,7 +3,7 @@ from sqlglot.helper import name_sequence
 from sqlglot.optimizer.scope import ScopeType, traverse_scope
 
 
-def unnest_subqueries(expression):
+def unnest_subqueries(expression, root_scope=None):
     """
     Rewrite sqlglot AST to convert some predicates with subqueries into joins.
 
@@ -18,12 +18,15 @@ def unnest_subqueries(expression):
 
     Args:
         expression (sqlglot.Expression): expression to unnest
+        root_scope (sqlglot.optimizer.scope.Scope): the scope tree of the expression, if it's
+            already built
     Returns:
         sqlglot.Expression: unnested expression
     """
     next_alias_name = name_sequence("_u_")
+    modified = []
 
-    for scope in traverse_scope(expression):
+    for scope in traverse_scope(expression, root_scope):
         select = scope.expression
         parent = select.parent_select
         if not parent:
@@ -32,6 +35,18 @@ def unnest_subqueries(expression):
             decorrelate(select, parent, scope.external_columns, next_alias_name)
         elif scope.scope_type == ScopeType.SUBQUERY:
             unnest(select, parent, next_alias_name)
+        else:
+            continue
+
+        # Both the subquery and the select it's unnested into may have been modified
+        while scope:
+            modified.append(scope)
+            if scope.expression is parent:
+                break
+            scope = scope.parent
+
+    for scope in modified:
+        scope.clear_cache()
 
     return expression
 
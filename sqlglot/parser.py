@@ -8,7 +8,7 @@ from sqlglot import exp
 from sqlglot.errors import ErrorLevel, ParseError, concat_messages, merge_errors
 from sqlglot.helper import apply_index_offset, ensure_list, seq_get
 from sqlglot.time import format_time
-from sqlglot.tokens import Token, Tokenizer, TokenType
+from sqlglot.tokens import Token, Tokenizer, TokenStream, TokenType
 from sqlglot.trie import TrieResult, in_trie, new_trie
 
 if t.TYPE_CHECKING:
@@ -870,14 +870,14 @@ class Parser(metaclass=_Parser):
         self._prev_comments = None
 
     def parse(
-        self, raw_tokens: t.List[Token], sql: t.Optional[str] = None
+        self, raw_tokens: t.List[Token] | TokenStream, sql: t.Optional[str] = None
     ) -> t.List[t.Optional[exp.Expression]]:
         """
         Parses a list of tokens and returns a list of syntax trees, one tree
         per parsed SQL statement.
 
         Args:
-            raw_tokens: The list of tokens.
+            raw_tokens: The list of tokens, or a compact `TokenStream`.
             sql: The original SQL string, used to produce helpful debug messages.
 
         Returns:
@@ -890,7 +890,7 @@ class Parser(metaclass=_Parser):
     def parse_into(
         self,
         expression_types: exp.IntoType,
-        raw_tokens: t.List[Token],
+        raw_tokens: t.List[Token] | TokenStream,
         sql: t.Optional[str] = None,
     ) -> t.List[t.Optional[exp.Expression]]:
         """
@@ -900,7 +900,7 @@ class Parser(metaclass=_Parser):
 
         Args:
             expression_types: The expression type(s) to try and parse the token list into.
-            raw_tokens: The list of tokens.
+            raw_tokens: The list of tokens, or a compact `TokenStream`.
             sql: The original SQL string, used to produce helpful debug messages.
 
         Returns:
@@ -926,21 +926,29 @@ class Parser(metaclass=_Parser):
     def _parse(
         self,
         parse_method: t.Callable[[Parser], t.Optional[exp.Expression]],
-        raw_tokens: t.List[Token],
+        raw_tokens: t.List[Token] | TokenStream,
         sql: t.Optional[str] = None,
     ) -> t.List[t.Optional[exp.Expression]]:
         self.reset()
         self.sql = sql or ""
 
-        total = len(raw_tokens)
-        chunks: t.List[t.List[Token]] = [[]]
+        chunks: t.List[t.List[Token]] | t.List[TokenStream]
 
-        for i, token in enumerate(raw_tokens):
-            if token.token_type == TokenType.SEMICOLON:
-                if i < total - 1:
-                    chunks.append([])
-            else:
-                chunks[-1].append(token)
+        if isinstance(raw_tokens, TokenStream):
+            # Statements are views over the stream, so its tokens are only created when accessed
+            chunks = raw_tokens.split(TokenType.SEMICOLON)
+        else:
+            total = len(raw_tokens)
+            statements: t.List[t.List[Token]] = [[]]
+
+            for i, token in enumerate(raw_tokens):
+                if token.token_type == TokenType.SEMICOLON:
+                    if i < total - 1:
+                        statements.append([])
+                else:
+                    statements[-1].append(token)
+
+            chunks = statements
 
         expressions = []
 
@@ -2062,7 +2070,8 @@ class Parser(metaclass=_Parser):
                 expressions=expressions,
                 limit=limit,
             )
-            this.comments = comments
+            # Copied, since the comments list of a token may be shared (see TokenStream)
+            this.comments = list(comments) if comments else []
 
             into = self._parse_into()
             if into:
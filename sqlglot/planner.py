@@ -13,6 +13,7 @@ class Plan:
         self.expression = expression.copy()
         self.root = Step.from_expression(self.expression)
         self._dag: t.Dict[Step, t.Set[Step]] = {}
+        self._push_down_limits()
 
     @property
     def dag(self) -> t.Dict[Step, t.Set[Step]]:
@@ -34,6 +35,19 @@ class Plan:
     def leaves(self) -> t.Iterator[Step]:
         return (node for node, deps in self.dag.items() if not deps)
 
+    def _push_down_limits(self) -> None:
+        """
+        Pushes the limit of a scan into the sort that it reads from, e.g. in the query
+        `WITH t AS (SELECT x FROM y ORDER BY x) SELECT x FROM t LIMIT 10`, so that the sort only
+        needs to keep its first rows. This is only done when the scan doesn't filter the rows and
+        nothing else reads the sorted rows.
+        """
+        for step in self.dag:
+            if isinstance(step, Scan) and not step.condition and not math.isinf(step.limit):
+                for dependency in step.dependencies:
+                    if isinstance(dependency, Sort) and dependency.dependents == {step}:
+                        dependency.limit = min(dependency.limit, step.limit)
+
     def __repr__(self) -> str:
         return f"Plan\n----\n{repr(self.root)}"
 
@@ -199,7 +213,8 @@ class Step:
         limit = expression.args.get("limit")
 
         if limit:
-            step.limit = int(limit.text("expression"))
+            # the step may be the final step of a subquery, which can have a smaller limit
+            step.limit = min(step.limit, int(limit.text("expression")))
 
         return step
 
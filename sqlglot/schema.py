@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import abc
+import dataclasses
+import hashlib
+import json
 import typing as t
+from dataclasses import dataclass, field
 
 import sqlglot
 from sqlglot import expressions as exp
@@ -20,11 +24,36 @@ if t.TYPE_CHECKING:
 TABLE_ARGS = ("this", "db", "catalog")
 
 
+@dataclass(frozen=True)
+class ColumnStatistics:
+    """Statistics about the values of a column."""
+
+    distinct: t.Optional[int] = None
+    """The number of distinct non-NULL values, if it's known."""
+
+    null_fraction: float = 0.0
+    """The fraction of the values that are NULL."""
+
+
+@dataclass(frozen=True)
+class TableStatistics:
+    """Statistics about a table, which are used to estimate the cost of queries."""
+
+    rows: int
+    """The number of rows."""
+
+    columns: t.Dict[str, ColumnStatistics] = field(default_factory=dict)
+    """The statistics of the columns, by name."""
+
+
 class Schema(abc.ABC):
     """Abstract base class for database schemas"""
 
     dialect: DialectType
 
+    version: int = 0
+    """The number of times the schema was modified, e.g. by `add_table`."""
+
     @abc.abstractmethod
     def add_table(
         self,
@@ -79,6 +108,23 @@ class Schema(abc.ABC):
             The resulting column type.
         """
 
+    def table_statistics(
+        self,
+        table: exp.Table | str,
+        dialect: DialectType = None,
+    ) -> t.Optional[TableStatistics]:
+        """
+        Get the statistics of a table.
+
+        Args:
+            table: the `Table` expression instance or string representing the table.
+            dialect: the SQL dialect that will be used to parse `table` if it's a string.
+
+        Returns:
+            The statistics of the table, or None if they're unknown.
+        """
+        return None
+
     @property
     @abc.abstractmethod
     def supported_table_args(self) -> t.Tuple[str, ...]:
@@ -91,6 +137,13 @@ class Schema(abc.ABC):
         """Returns whether or not the schema is empty."""
         return True
 
+    def fingerprint(self) -> t.Optional[str]:
+        """
+        Returns a digest of the contents of the schema, which is the same across processes, or None
+        if it can't be computed. It's used to key the cache of optimized queries, see `OptimizeCache`.
+        """
+        return None
+
 
 class AbstractMappingSchema(t.Generic[T]):
     def __init__(
@@ -178,6 +231,9 @@ class MappingSchema(AbstractMappingSchema[t.Dict[str, str]], Schema):
             3. {catalog: {db: {table: set(*cols)}}}}
         dialect: The dialect to be used for custom type mappings & parsing string arguments.
         normalize: Whether to normalize identifier names according to the given dialect or not.
+        statistics: Optional mapping of the statistics of the tables, nested like the schema, e.g.
+            {table: {"rows": 1000, "columns": {col: {"distinct": 10, "null_fraction": 0.1}}}}.
+            The statistics of a table can also be given as a `TableStatistics` instance.
     """
 
     def __init__(
@@ -186,13 +242,16 @@ class MappingSchema(AbstractMappingSchema[t.Dict[str, str]], Schema):
         visible: t.Optional[t.Dict] = None,
         dialect: DialectType = None,
         normalize: bool = True,
+        statistics: t.Optional[t.Dict] = None,
     ) -> None:
         self.dialect = dialect
         self.visible = visible or {}
         self.normalize = normalize
         self._type_mapping_cache: t.Dict[str, exp.DataType] = {}
+        self._fingerprint: t.Optional[t.Tuple[int, t.Optional[str]]] = None
 
         super().__init__(self._normalize(schema or {}))
+        self.statistics = self._normalize_statistics(statistics or {})
 
     @classmethod
     def from_mapping_schema(cls, mapping_schema: MappingSchema) -> MappingSchema:
@@ -200,6 +259,7 @@ class MappingSchema(AbstractMappingSchema[t.Dict[str, str]], Schema):
             schema=mapping_schema.mapping,
             visible=mapping_schema.visible,
             dialect=mapping_schema.dialect,
+            statistics=mapping_schema.statistics,
         )
 
     def copy(self, **kwargs) -> MappingSchema:
@@ -208,6 +268,7 @@ class MappingSchema(AbstractMappingSchema[t.Dict[str, str]], Schema):
                 "schema": self.mapping.copy(),
                 "visible": self.visible.copy(),
                 "dialect": self.dialect,
+                "statistics": self.statistics.copy(),
                 **kwargs,
             }
         )
@@ -242,6 +303,7 @@ class MappingSchema(AbstractMappingSchema[t.Dict[str, str]], Schema):
 
         nested_set(self.mapping, tuple(reversed(parts)), normalized_column_mapping)
         new_trie([parts], self.mapping_trie)
+        self.version += 1
 
     def column_names(
         self,
@@ -287,6 +349,45 @@ class MappingSchema(AbstractMappingSchema[t.Dict[str, str]], Schema):
 
         return exp.DataType.build("unknown")
 
+    def table_statistics(
+        self,
+        table: exp.Table | str,
+        dialect: DialectType = None,
+    ) -> t.Optional[TableStatistics]:
+        if not self.statistics:
+            return None
+
+        normalized_table = self._normalize_table(
+            self._ensure_table(table, dialect=dialect), dialect=dialect
+        )
+        statistics = self.nested_get(
+            self.table_parts(normalized_table), self.statistics, raise_on_missing=False
+        )
+        return statistics if isinstance(statistics, TableStatistics) else None
+
+    def fingerprint(self) -> t.Optional[str]:
+        # The digest is only computed again once the schema has been modified
+        if self._fingerprint is None or self._fingerprint[0] != self.version:
+            dialect = Dialect.get_or_raise(self.dialect)
+            contents = {
+                "dialect": f"{dialect.__module__}.{dialect.__qualname__}",
+                "normalize": self.normalize,
+                "mapping": self.mapping,
+                "visible": self.visible,
+                "statistics": self.statistics,
+            }
+
+            try:
+                digest: t.Optional[str] = hashlib.sha256(
+                    json.dumps(contents, sort_keys=True, default=_to_json).encode()
+                ).hexdigest()
+            except (TypeError, ValueError):
+                digest = None
+
+            self._fingerprint = (self.version, digest)
+
+        return self._fingerprint[1]
+
     def _normalize(self, schema: t.Dict) -> t.Dict:
         """
         Normalizes all identifiers in the schema.
@@ -316,6 +417,34 @@ class MappingSchema(AbstractMappingSchema[t.Dict[str, str]], Schema):
 
         return normalized_mapping
 
+    def _normalize_statistics(self, statistics: t.Dict | TableStatistics) -> t.Any:
+        """
+        Normalizes the identifiers of a statistics mapping, and converts the statistics of each
+        table into a `TableStatistics` instance.
+        """
+        if isinstance(statistics, TableStatistics):
+            return statistics
+
+        if isinstance(statistics.get("rows"), int):
+            return TableStatistics(
+                rows=statistics["rows"],
+                columns={
+                    self._normalize_name(name, dialect=self.dialect): (
+                        column
+                        if isinstance(column, ColumnStatistics)
+                        else ColumnStatistics(**column)
+                    )
+                    for name, column in statistics.get("columns", {}).items()
+                },
+            )
+
+        return {
+            self._normalize_name(key, dialect=self.dialect, is_table=True): (
+                self._normalize_statistics(value)
+            )
+            for key, value in statistics.items()
+        }
+
     def _normalize_table(self, table: exp.Table, dialect: DialectType = None) -> exp.Table:
         normalized_table = table.copy()
 
@@ -378,6 +507,16 @@ class MappingSchema(AbstractMappingSchema[t.Dict[str, str]], Schema):
         return self._type_mapping_cache[schema_type]
 
 
+def _to_json(value: t.Any) -> t.Any:
+    if isinstance(value, exp.DataType):
+        return value.sql()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Can't fingerprint {value!r}")
+
+
 def ensure_schema(schema: Schema | t.Optional[t.Dict], **kwargs: t.Any) -> Schema:
     if isinstance(schema, Schema):
         return schema
@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import os
+import re
 import typing as t
+from array import array
 from enum import auto
+from functools import lru_cache
 
 from sqlglot.helper import AutoName
 from sqlglot.trie import TrieResult, in_trie, new_trie
 
+# Whether the tokenizers consume runs of characters, such as whitespace, identifiers, string
+# contents and comments, using precompiled regular expressions instead of scanning them one
+# character at a time. Both scanners produce identical tokens, but the gain is modest (about 13% of
+# the tokenization time), so it's off by default. Set the SQLGLOT_FAST_SCANNER environment variable
+# to "1" in order to enable it.
+USE_FAST_SCANNER = os.environ.get("SQLGLOT_FAST_SCANNER", "0") == "1"
+
 
 class TokenType(AutoName):
     L_PAREN = auto()
@@ -419,6 +430,200 @@ class Token:
         return f"<Token {attributes}>"
 
 
+_TOKEN_TYPES = list(TokenType)
+_TOKEN_TYPE_CODES = {token_type: code for code, token_type in enumerate(_TOKEN_TYPES)}
+
+# Shared by all tokens of a TokenStream that don't have any comments, so it must not be mutated
+_NO_COMMENTS: t.List[str] = []
+
+
+class TokenStream:
+    """
+    A compact sequence of tokens, which can be used instead of a list of `Token` objects.
+
+    The tokens' types and positions are stored in parallel typed arrays, their text is sliced
+    lazily from the SQL string unless it differs from it (e.g. for strings, whose quotes are
+    stripped) and only the tokens that have comments reference a list of them. `Token` objects
+    are created on access and aren't retained, so a stream holds a few dozen bytes per token.
+
+    Slicing a stream returns a view that shares its storage with the original stream.
+    """
+
+    __slots__ = (
+        "sql",
+        "_types",
+        "_lines",
+        "_cols",
+        "_starts",
+        "_ends",
+        "_texts",
+        "_comments",
+        "_offset",
+        "_stop",
+    )
+
+    def __init__(self, sql: str = "") -> None:
+        self.sql = sql
+        self._types = array("H")
+        self._lines = array("l")
+        self._cols = array("l")
+        self._starts = array("l")
+        self._ends = array("l")
+        self._texts: t.Dict[int, str] = {}
+        self._comments: t.Dict[int, t.List[str]] = {}
+        self._offset = 0
+        self._stop: t.Optional[int] = None
+
+    def add(
+        self,
+        token_type: TokenType,
+        text: t.Optional[str],
+        line: int,
+        col: int,
+        start: int,
+        end: int,
+        comments: t.List[str],
+    ) -> None:
+        """Appends a token to the stream. If `text` is None, it's the SQL between `start` and `end`."""
+        index = len(self._types)
+        self._types.append(_TOKEN_TYPE_CODES[token_type])
+        self._lines.append(line)
+        self._cols.append(col)
+        self._starts.append(start)
+        self._ends.append(end)
+
+        if text is not None and text != self.sql[start : end + 1]:
+            self._texts[index] = text
+        if comments:
+            self._comments[index] = comments
+
+    def append(self, token: Token) -> None:
+        self.add(
+            token.token_type,
+            token.text,
+            token.line,
+            token.col,
+            token.start,
+            token.end,
+            token.comments,
+        )
+
+    def add_comments(self, index: int, comments: t.List[str]) -> None:
+        """Attaches `comments` to the token at position `index`."""
+        if comments:
+            self._comments.setdefault(self._position(index), []).extend(comments)
+
+    def token_type(self, index: int) -> TokenType:
+        """Returns the type of the token at position `index`, without creating a `Token`."""
+        return _TOKEN_TYPES[self._types[self._position(index)]]
+
+    def split(self, token_type: TokenType) -> t.List[TokenStream]:
+        """
+        Splits the stream at the tokens of type `token_type`, which are excluded from the returned
+        views. A separator at the end of the stream doesn't produce an empty view.
+        """
+        code = _TOKEN_TYPE_CODES[token_type]
+        types = self._types
+        stop = self._end()
+        begin = self._offset
+        views = []
+
+        for position in range(begin, stop):
+            if types[position] == code:
+                views.append(self._view(begin, position))
+                begin = position + 1
+
+        if begin < stop or not views:
+            views.append(self._view(begin, stop))
+
+        return views
+
+    def _end(self) -> int:
+        return len(self._types) if self._stop is None else self._stop
+
+    def _position(self, index: int) -> int:
+        size = self._end() - self._offset
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("TokenStream index out of range")
+        return self._offset + index
+
+    def _view(self, start: int, stop: int) -> TokenStream:
+        view = TokenStream.__new__(TokenStream)
+        view.sql = self.sql
+        view._types = self._types
+        view._lines = self._lines
+        view._cols = self._cols
+        view._starts = self._starts
+        view._ends = self._ends
+        view._texts = self._texts
+        view._comments = self._comments
+        view._offset = start
+        view._stop = stop
+        return view
+
+    def _token(self, position: int) -> Token:
+        start = self._starts[position]
+        end = self._ends[position]
+        text = self._texts.get(position)
+
+        return Token(
+            _TOKEN_TYPES[self._types[position]],
+            self.sql[start : end + 1] if text is None else text,
+            line=self._lines[position],
+            col=self._cols[position],
+            start=start,
+            end=end,
+            comments=self._comments.get(position, _NO_COMMENTS),
+        )
+
+    def __len__(self) -> int:
+        return self._end() - self._offset
+
+    @t.overload
+    def __getitem__(self, index: int) -> Token:
+        ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> TokenStream:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("TokenStream slices don't support steps")
+            return self._view(self._offset + start, self._offset + max(start, stop))
+        return self._token(self._position(index))
+
+    def __delitem__(self, index: slice) -> None:
+        # Only truncation is supported, which the tokenizer needs when it scans commands
+        start, stop, _ = index.indices(len(self))
+        if self._stop is not None or stop < len(self) or index.step not in (None, 1):
+            raise ValueError("Only the end of a TokenStream can be deleted")
+
+        position = self._offset + start
+        for values in (self._types, self._lines, self._cols, self._starts, self._ends):
+            del values[position:]
+        for mapping in (self._texts, self._comments):
+            for key in [key for key in mapping if key >= position]:
+                del mapping[key]
+
+    def __iter__(self) -> t.Iterator[Token]:
+        for position in range(self._offset, self._end()):
+            yield self._token(position)
+
+    def __repr__(self) -> str:
+        return f"<TokenStream {len(self)} tokens>"
+
+
+@lru_cache(maxsize=None)
+def _run_pattern(excluded: str) -> t.Pattern[str]:
+    """Returns a pattern that matches a run of characters which are not contained in `excluded`."""
+    return re.compile(f"[^{re.escape(excluded)}]+")
+
+
 class _Tokenizer(type):
     def __new__(cls, clsname, bases, attrs):
         klass = super().__new__(cls, clsname, bases, attrs)
@@ -458,7 +663,7 @@ class _Tokenizer(type):
             "{#": "#}",  # Ensure Jinja comments are tokenized correctly in all dialects
         }
 
-        klass._KEYWORD_TRIE = new_trie(
+        trie_keys = [
             key.upper()
             for key in (
                 *klass.KEYWORDS,
@@ -467,7 +672,23 @@ class _Tokenizer(type):
                 *klass._FORMAT_STRINGS,
             )
             if " " in key or any(single in key for single in klass.SINGLE_TOKENS)
-        )
+        ]
+        klass._KEYWORD_TRIE = new_trie(trie_keys)
+
+        white_space = "".join(k for k in klass.WHITE_SPACE if k and len(k) == 1)
+        single_tokens = "".join(k for k in klass.SINGLE_TOKENS if len(k) == 1)
+        var_delimiters = "".join(k for k in single_tokens if k not in klass.VAR_SINGLE_TOKENS)
+
+        klass._BREAKS = tuple(k for k in white_space if klass.WHITE_SPACE[k] == TokenType.BREAK)
+        klass._BREAK_RE = re.compile(f"[{re.escape(''.join(klass._BREAKS))}]")
+        klass._WHITE_SPACE_RUN = re.compile(f"[{re.escape(white_space)}]+")
+        klass._VAR_RUN = re.compile(rf"[^\s{re.escape(var_delimiters)}]+")
+        klass._WORD_RUN = re.compile(rf"[^\s{re.escape(single_tokens)}]+")
+
+        # A word can only be the beginning of a key in the keyword trie if it's equal to the part
+        # of that key that precedes its first space or single token, since trie keys contain one
+        heads = (klass._WORD_RUN.match(key) for key in trie_keys)
+        klass._KEYWORD_HEADS = {head.group() for head in heads if head}
 
         return klass
 
@@ -528,6 +749,15 @@ class Tokenizer(metaclass=_Tokenizer):
     _QUOTES: t.Dict[str, str] = {}
     _STRING_ESCAPES: t.Set[str] = set()
     _KEYWORD_TRIE: t.Dict = {}
+    _BREAKS: t.Tuple[str, ...] = ()
+    _BREAK_RE: t.Pattern[str]
+    _WHITE_SPACE_RUN: t.Pattern[str]
+    _VAR_RUN: t.Pattern[str]
+    _WORD_RUN: t.Pattern[str]
+    _KEYWORD_HEADS: t.Set[str] = set()
+
+    # Whether to use the accelerated scanner, see USE_FAST_SCANNER
+    FAST_SCAN = USE_FAST_SCANNER
 
     KEYWORDS: t.Dict[str, TokenType] = {
         **{f"{{%{postfix}": TokenType.BLOCK_START for postfix in ("", "+", "-")},
@@ -805,6 +1035,14 @@ class Tokenizer(metaclass=_Tokenizer):
 
     COMMENTS = ["--", ("/*", "*/")]
 
+    # MySQL-style conditional comments (/*!NNNNN ... */) are unwrapped, i.e. their contents are
+    # tokenized as regular SQL, if their version NNNNN is within this inclusive range of targeted
+    # server versions. Version-less conditional comments (/*! ... */) are considered version 0.
+    # Any other conditional comment is treated as a regular one, as are all of them if set to None.
+    # Only /*!50100 ... */ is unwrapped by default, as mysqldump uses it for partitioning clauses,
+    # whereas older versions usually guard session settings that shouldn't be transpiled.
+    CONDITIONAL_COMMENT_VERSIONS: t.Optional[t.Tuple[int, int]] = (50100, 50100)
+
     __slots__ = (
         "sql",
         "size",
@@ -818,6 +1056,7 @@ class Tokenizer(metaclass=_Tokenizer):
         "_end",
         "_peek",
         "_prev_token_line",
+        "_conditional_comment",
     )
 
     def __init__(self) -> None:
@@ -826,7 +1065,7 @@ class Tokenizer(metaclass=_Tokenizer):
     def reset(self) -> None:
         self.sql = ""
         self.size = 0
-        self.tokens: t.List[Token] = []
+        self.tokens: t.List[Token] | TokenStream = []
         self._start = 0
         self._current = 0
         self._line = 1
@@ -837,23 +1076,109 @@ class Tokenizer(metaclass=_Tokenizer):
         self._end = False
         self._peek = ""
         self._prev_token_line = -1
+        self._conditional_comment = False
 
     def tokenize(self, sql: str) -> t.List[Token]:
         """Returns a list of tokens corresponding to the SQL string `sql`."""
         self.reset()
+        return self._tokenize(sql)  # type: ignore
+
+    def tokenize_compact(self, sql: str) -> TokenStream:
+        """
+        Returns a `TokenStream` corresponding to the SQL string `sql`. It contains the same tokens
+        as the list returned by `tokenize`, but uses much less memory for large inputs.
+        """
+        self.reset()
+        self.tokens = TokenStream(sql)
+        return self._tokenize(sql)  # type: ignore
+
+    def tokenize_stream(
+        self, sql: t.IO[str], chunk_size: int = 1024 * 1024
+    ) -> t.Iterator[t.Tuple[t.List[Token], str]]:
+        """
+        Lazily tokenizes the SQL text read from `sql`, one statement at a time.
+
+        The input is consumed in chunks and only the text of the statements that haven't been
+        yielded yet is kept in memory, so arbitrarily large scripts (e.g. database dumps) can be
+        processed with bounded memory. Token positions are the same as the ones `tokenize` would
+        produce for the whole text, except for `start` and `end`, which are relative to the
+        accompanying SQL string.
+
+        Args:
+            sql: a file-like object opened in text mode.
+            chunk_size: the number of characters to read at a time.
+
+        Yields:
+            Tuples containing the tokens of a statement, without the terminating semicolon,
+            and the SQL string that the tokens' offsets refer to.
+        """
+        buffer = ""
+        size = chunk_size
+        line, col = 1, 0
+        emitted = False
+        eof = False
+
+        while not eof:
+            chunk = sql.read(size)
+            eof = not chunk
+            buffer += chunk
+
+            self.reset()
+
+            if emitted:
+                self._resume(line, col)
+
+            try:
+                tokens = t.cast(t.List[Token], self._tokenize(buffer))[1 if emitted else 0 :]
+            except ValueError:
+                if eof:
+                    raise
+                # The buffer probably ends in the middle of a string, so we need more text. Its
+                # size is doubled every time, to avoid re-tokenizing huge statements quadratically
+                size = max(chunk_size, len(buffer))
+                continue
+
+            statement: t.List[Token] = []
+            consumed = None
+
+            for token in tokens:
+                if token.token_type == TokenType.SEMICOLON:
+                    yield statement, buffer
+                    statement = []
+                    consumed = token
+                    emitted = True
+                else:
+                    statement.append(token)
+
+            if eof:
+                if statement or not emitted:
+                    yield statement, buffer
+            elif consumed:
+                # Everything up to the last semicolon was yielded, so we only need to keep the
+                # text that comes after it, which is then tokenized along with the next chunk
+                buffer = buffer[consumed.end + 1 :]
+                line, col = consumed.line, consumed.col
+                size = chunk_size
+            else:
+                size = max(chunk_size, len(buffer))
+
+    def _resume(self, line: int, col: int) -> None:
+        # Resume from the state right after a semicolon, so that line numbers are preserved and
+        # trailing comments aren't attached to the next statement. The placeholder semicolon
+        # token must be removed from the produced tokens.
+        self.tokens.append(Token(TokenType.SEMICOLON, ";", line, col, comments=[]))
+        self._prev_token_line = self._line = line
+        self._col = col
+
+    def _tokenize(
+        self, sql: str, start: int = 0, until: t.Optional[t.Callable] = None
+    ) -> t.List[Token] | TokenStream:
         self.sql = sql
         self.size = len(sql)
+        self._current = start
+        self._end = start >= self.size
         try:
-            # mysql dumps partition details as conditional commands. The command starts with the same version number always, the below code is used to make it compatible with NuoDB
-            while self.sql.find("!50100") != -1:
-                index_50100 = self.sql.find("/*!50100 PARTITION")
-                if index_50100 != -1:
-                    index_close_comment = self.sql.find("*/", index_50100)
-                    if index_close_comment != -1:
-                        sql = self.sql[:index_close_comment] + self.sql[index_close_comment + 2:]
-                        self.sql = sql.replace("/*!50100", "", 1)
-            self.size = len(self.sql)
-            self._scan()
+            self._scan(until)
         except Exception as e:
             start = max(self._current - 50, 0)
             end = min(self._current + 50, self.size - 1)
@@ -875,14 +1200,22 @@ class Tokenizer(metaclass=_Tokenizer):
                     self._scan_number()
                 elif self._char in self._IDENTIFIERS:
                     self._scan_identifier(self._IDENTIFIERS[self._char])
+                elif self._conditional_comment and self._char == "*" and self._peek == "/":
+                    # Skip the end delimiter of an unwrapped conditional comment
+                    self._advance()
+                    self._conditional_comment = False
                 else:
                     self._scan_keywords()
+            elif self.FAST_SCAN:
+                match = self._WHITE_SPACE_RUN.match(self.sql, self._current)
+                if match:
+                    self._advance_run(match.end() - self._current)
 
             if until and until():
                 break
 
         if self.tokens and self._comments:
-            self.tokens[-1].comments.extend(self._comments)
+            self._add_comments_to_last_token()
 
     def _chars(self, size: int) -> str:
         if size == 1:
@@ -924,6 +1257,28 @@ class Tokenizer(metaclass=_Tokenizer):
             self._peek = _peek
             self._char = self.sql[_current - 1]
 
+    def _advance_run(self, size: int) -> None:
+        # Equivalent to calling _advance() `size` times, but lines and columns are computed in bulk
+        start = self._current - 1
+        run = self.sql[start : start + size]
+        last_break = -1
+        for b in self._BREAKS:
+            index = run.rfind(b)
+            if index > last_break:
+                last_break = index
+
+        if last_break < 0:
+            self._col += size
+        else:
+            for b in self._BREAKS:
+                self._line += run.count(b)
+            self._col = size - last_break
+
+        self._current += size
+        self._end = self._current >= self.size
+        self._char = self.sql[self._current - 1]
+        self._peek = "" if self._end else self.sql[self._current]
+
     @property
     def _text(self) -> str:
         return self.sql[self._start : self._current]
@@ -936,17 +1291,30 @@ class Tokenizer(metaclass=_Tokenizer):
 
     def _add(self, token_type: TokenType, text: t.Optional[str] = None) -> None:
         self._prev_token_line = self._line
-        self.tokens.append(
-            Token(
+
+        if isinstance(self.tokens, TokenStream):
+            # The text of the token is sliced lazily from the SQL string when it's not given
+            self.tokens.add(
                 token_type,
-                text=self._text if text is None else text,
-                line=self._line,
-                col=self._col,
-                start=self._start,
-                end=self._current - 1,
-                comments=self._comments,
+                text,
+                self._line,
+                self._col,
+                self._start,
+                self._current - 1,
+                self._comments,
+            )
+        else:
+            self.tokens.append(
+                Token(
+                    token_type,
+                    text=self._text if text is None else text,
+                    line=self._line,
+                    col=self._col,
+                    start=self._start,
+                    end=self._current - 1,
+                    comments=self._comments,
+                )
             )
-        )
         self._comments = []
 
         # If we have either a semicolon or a begin token before the command's token, we'll parse
@@ -959,12 +1327,29 @@ class Tokenizer(metaclass=_Tokenizer):
             start = self._current
             tokens = len(self.tokens)
             self._scan(lambda: self._peek == ";")
-            self.tokens = self.tokens[:tokens]
+            del self.tokens[tokens:]
             text = self.sql[start : self._current].strip()
             if text:
                 self._add(TokenType.STRING, text)
 
+    def _add_comments_to_last_token(self) -> None:
+        if isinstance(self.tokens, TokenStream):
+            self.tokens.add_comments(-1, self._comments)
+        else:
+            self.tokens[-1].comments.extend(self._comments)
+
     def _scan_keywords(self) -> None:
+        if self.FAST_SCAN:
+            # Plain words that can't start a multi-word keyword don't need to be looked up in the trie
+            match = self._WORD_RUN.match(self.sql, self._current - 1)
+            if (
+                match
+                and self.sql[match.end() : match.end() + 1] not in self.VAR_SINGLE_TOKENS
+                and match.group().upper() not in self._KEYWORD_HEADS
+            ):
+                self._scan_var()
+                return
+
         size = 0
         word = None
         chars = self._text
@@ -1027,6 +1412,9 @@ class Tokenizer(metaclass=_Tokenizer):
         if comment_start not in self._COMMENTS:
             return False
 
+        if comment_start == "/*" and self.peek(1) == "!" and self._scan_conditional_comment():
+            return True
+
         comment_start_line = self._line
         comment_start_size = len(comment_start)
         comment_end = self._COMMENTS[comment_start]
@@ -1036,25 +1424,57 @@ class Tokenizer(metaclass=_Tokenizer):
             self._advance(comment_start_size)
 
             comment_end_size = len(comment_end)
-            while not self._end and self._chars(comment_end_size) != comment_end:
-                self._advance(alnum=True)
+            if self.FAST_SCAN and not comment_end[0].isalnum():
+                index = self.sql.find(comment_end, self._current - 1)
+                size = self.size - self._current if index < 0 else index - self._current + 1
+                if size:
+                    self._advance_run(size)
+            else:
+                while not self._end and self._chars(comment_end_size) != comment_end:
+                    self._advance(alnum=True)
 
             self._comments.append(self._text[comment_start_size : -comment_end_size + 1])
             self._advance(comment_end_size - 1)
         else:
-            while not self._end and not self.WHITE_SPACE.get(self._peek) is TokenType.BREAK:
-                self._advance(alnum=True)
+            if self.FAST_SCAN and self._BREAKS:
+                match = self._BREAK_RE.search(self.sql, self._current)
+                size = (match.start() if match else self.size) - self._current
+                if size:
+                    self._advance_run(size)
+            else:
+                while not self._end and not self.WHITE_SPACE.get(self._peek) is TokenType.BREAK:
+                    self._advance(alnum=True)
             self._comments.append(self._text[comment_start_size:])
 
         # Leading comment is attached to the succeeding token, whilst trailing comment to the preceding.
         # Multiple consecutive comments are preserved by appending them to the current comments list.
         if comment_start_line == self._prev_token_line:
-            self.tokens[-1].comments.extend(self._comments)
+            self._add_comments_to_last_token()
             self._comments = []
             self._prev_token_line = self._line
 
         return True
 
+    def _scan_conditional_comment(self) -> bool:
+        if not self.CONDITIONAL_COMMENT_VERSIONS:
+            return False
+
+        # The current character is the comment's "/", so the version starts right after "*!"
+        start = self._current + 2
+        end = start
+        while end < self.size and self.sql[end].isdigit():
+            end += 1
+
+        version = int(self.sql[start:end]) if end > start else 0
+        low, high = self.CONDITIONAL_COMMENT_VERSIONS
+        if not low <= version <= high:
+            return False
+
+        # Skip the start delimiter and the version, so that the comment's contents are scanned next
+        self._advance(end - self._current)
+        self._conditional_comment = True
+        return True
+
     def _scan_number(self) -> None:
         if self._char == "0":
             peek = self._peek.upper()
@@ -1172,12 +1592,17 @@ class Tokenizer(metaclass=_Tokenizer):
         self._add(TokenType.IDENTIFIER, text)
 
     def _scan_var(self) -> None:
-        while True:
-            char = self._peek.strip()
-            if char and (char in self.VAR_SINGLE_TOKENS or char not in self.SINGLE_TOKENS):
-                self._advance(alnum=True)
-            else:
-                break
+        if self.FAST_SCAN:
+            match = self._VAR_RUN.match(self.sql, self._current)
+            if match:
+                self._advance_run(match.end() - self._current)
+        else:
+            while True:
+                char = self._peek.strip()
+                if char and (char in self.VAR_SINGLE_TOKENS or char not in self.SINGLE_TOKENS):
+                    self._advance(alnum=True)
+                else:
+                    break
 
         self._add(
             TokenType.VAR
@@ -1190,6 +1615,13 @@ class Tokenizer(metaclass=_Tokenizer):
         delim_size = len(delimiter)
         escapes = self._STRING_ESCAPES if escapes is None else escapes
 
+        # Characters that can't start an escape sequence or the delimiter are consumed in bulk
+        run = (
+            _run_pattern(delimiter[0] + "".join(sorted(escapes)))
+            if self.FAST_SCAN and delimiter
+            else None
+        )
+
         while True:
             if self._char in escapes and (self._peek == delimiter or self._peek in escapes):
                 if self._peek == delimiter:
@@ -1211,6 +1643,14 @@ class Tokenizer(metaclass=_Tokenizer):
                     raise RuntimeError(f"Missing {delimiter} from {self._line}:{self._start}")
 
                 current = self._current - 1
-                self._advance(alnum=True)
-                text += self.sql[current : self._current - 1]
+                if run:
+                    # The current character is always consumed, but the last one of the input
+                    # can't be, because then we need to report that the delimiter is missing
+                    match = run.match(self.sql, self._current)
+                    size = min(match.end() - current if match else 1, self.size - self._current)
+                    self._advance_run(size)
+                    text += self.sql[current : current + size]
+                else:
+                    self._advance(alnum=True)
+                    text += self.sql[current : self._current - 1]
         return text
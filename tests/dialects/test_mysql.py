@@ -53,6 +53,12 @@ class TestMySQL(Validator):
             "CREATE TABLE `datatypes1` (`c14` tinyblob)",
             write={"nuodb": "CREATE TABLE `datatypes1` (`c14` BLOB)"},
         )
+        self.validate_all(
+            "CREATE TABLE t (a INT) /*!50100 PARTITION BY HASH (a) PARTITIONS 2 */",
+            write={
+                "nuodb": "CREATE TABLE t (a INTEGER, p_a INT GENERATED ALWAYS AS (a%4) PERSISTED) PARTITION BY LIST (p_a) (\nPARTITION p0 VALUES IN (0) STORE IN UNPARTITIONED,\nPARTITION p1 VALUES IN (1) STORE IN UNPARTITIONED\n)",
+            },
+        )
 
     def test_identity(self):
         self.validate_identity("CAST(x AS ENUM('a', 'b'))")
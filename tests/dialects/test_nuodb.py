@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlglot import transpile
 from tests.dialects.test_dialect import Validator
 
 
@@ -48,3 +51,31 @@ class TestNuoDB(Validator):
             "CREATE INDEX titles_emp_no ON titles (emp_no)",
             write={"nuodb": "CREATE INDEX titles_emp_no ON titles (emp_no)"},
         )
+
+    def test_concurrent_transpile(self):
+        # The generator's state, e.g. the schema of the last CREATE DATABASE, must not leak
+        # between transpile calls that run concurrently in different threads
+        jobs = [
+            (
+                f"CREATE DATABASE db{i}; CREATE TABLE orders{i} (id INT PRIMARY KEY, c INT, "
+                f"CONSTRAINT fk{i} FOREIGN KEY (c) REFERENCES customers (id))",
+                {"fk_index": i % 2 == 0, "fk_constraint_in_create": i % 3 != 0},
+            )
+            for i in range(60)
+        ]
+
+        def run(job):
+            sql, opts = job
+            return transpile(sql, read="mysql", write="nuodb", **opts)
+
+        expected = [run(job) for job in jobs]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for _ in range(5):
+                self.assertEqual(list(executor.map(run, jobs)), expected)
+
+        self.assertEqual(
+            expected[1][1],
+            "CREATE TABLE orders1 (id INTEGER PRIMARY KEY, c INTEGER);\n"
+            "ALTER TABLE db1.orders1 ADD CONSTRAINT fk1 FOREIGN KEY (c) REFERENCES customers(id)",
+        )
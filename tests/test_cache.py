@@ -0,0 +1,152 @@
+import os
+import tempfile
+import unittest
+
+import sqlglot
+from sqlglot import (
+    DiskStore,
+    MappingSchema,
+    OptimizeCache,
+    ParseCache,
+    exp,
+    optimizer,
+    parse,
+    parse_one,
+    transpile,
+)
+from sqlglot.errors import ErrorLevel, ParseError
+from sqlglot.optimizer import optimize
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        sqlglot.parse_cache = ParseCache(max_entries=3)
+
+    def tearDown(self):
+        sqlglot.parse_cache = None
+
+    def test_parse_cache(self):
+        cache = sqlglot.parse_cache
+
+        select = parse_one("SELECT a FROM x")
+        self.assertEqual(
+            cache.stats(), {"hits": 0, "misses": 1, "evictions": 0, "entries": 1, "size": 15}
+        )
+
+        # Callers get copies, so mutating them doesn't affect the cached trees
+        select.expressions[0].replace(exp.column("b"))
+        self.assertEqual(parse_one("SELECT a FROM x").sql(), "SELECT a FROM x")
+        self.assertIsNot(parse_one("SELECT a FROM x"), parse_one("SELECT a FROM x"))
+        self.assertEqual(cache.hits, 3)
+
+        self.assertEqual(exp.maybe_parse("SELECT a FROM x").sql(), "SELECT a FROM x")
+        self.assertEqual(transpile("SELECT a FROM x", write="spark"), ["SELECT a FROM x"])
+        self.assertEqual(parse("SELECT a FROM x; SELECT 1")[1].sql(), "SELECT 1")
+        self.assertEqual(cache.hits, 5)
+        self.assertEqual(cache.misses, 2)
+
+        # The dialect, the parser options and the target expression type are part of the key
+        parse_one("SELECT a FROM x", read="mysql")
+        parse_one("SELECT a FROM x", error_level=ErrorLevel.RAISE)
+        self.assertIsInstance(parse_one("x", into=exp.Table), exp.Table)
+        self.assertIsInstance(parse_one("x"), exp.Column)
+        self.assertEqual(cache.misses, 6)
+        self.assertEqual(cache.evictions, 3)
+        self.assertEqual(len(cache), 3)
+
+        cache.clear()
+        self.assertEqual(
+            cache.stats(), {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "size": 0}
+        )
+
+    def test_lru(self):
+        cache = sqlglot.parse_cache
+
+        for sql in ("SELECT 1", "SELECT 2", "SELECT 3", "SELECT 1", "SELECT 4"):
+            parse_one(sql)
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.hits, 1)
+
+        parse_one("SELECT 2")
+        self.assertEqual(cache.misses, 5)
+
+        sqlglot.parse_cache = cache = ParseCache(max_size=20)
+        for sql in ("SELECT 1", "SELECT 2", "SELECT 3", "SELECT 100000000000000000000"):
+            parse_one(sql)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, 16)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_errors(self):
+        cache = sqlglot.parse_cache
+
+        for _ in range(2):
+            with self.assertRaises(ParseError):
+                parse_one("SELECT 1 +")
+
+            parse("SELECT 1 )", error_level=ErrorLevel.IGNORE)
+
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_optimize_cache(self):
+        sqlglot.optimize_cache = cache = OptimizeCache(max_entries=2)
+        schema = MappingSchema({"x": {"a": "INT", "b": "INT"}})
+
+        try:
+            expected = 'SELECT "x"."a" AS "a" FROM "x" AS "x"'
+            self.assertEqual(optimize("SELECT a FROM x", schema=schema).sql(), expected)
+
+            # The key is the syntax tree, so equivalent SQL strings share it
+            optimized = optimize("select a  from x", schema=schema)
+            self.assertEqual(optimized.sql(), expected)
+            self.assertEqual(cache.hits, 1)
+
+            # Callers get copies, so mutating them doesn't affect the cached trees
+            optimized.set("expressions", [exp.column("b")])
+            self.assertEqual(optimize("SELECT a FROM x", schema=schema).sql(), expected)
+            self.assertEqual(cache.hits, 2)
+
+            # The dialect, the rules, the options and the schema are part of the key
+            optimize("SELECT a FROM x", schema=schema, dialect="mysql")
+            optimize("SELECT a FROM x", schema=schema, rules=optimizer.RULES[:1])
+            optimize("SELECT a FROM x", schema=schema, quote_identifiers=True)
+            schema.add_table("y", {"c": "INT"})
+            optimize("SELECT a FROM x", schema=schema)
+            self.assertEqual(cache.misses, 5)
+            self.assertEqual(cache.evictions, 3)
+
+            # Queries optimized with rules that can't be identified across processes aren't cached
+            optimize("SELECT a FROM x", schema=schema, rules=[lambda expression: expression])
+            self.assertEqual(cache.misses, 5)
+
+            # Profiled optimizations apply all the rules, so they bypass the cache
+            profiles: list = []
+            optimize("SELECT a FROM x", schema=schema, profile=profiles.append)
+            self.assertEqual(len(profiles), len(optimizer.RULES))
+            self.assertEqual((cache.hits, cache.misses), (2, 5))
+        finally:
+            sqlglot.optimize_cache = None
+
+    def test_optimize_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sqlglot.optimize_cache = OptimizeCache(store=DiskStore(directory))
+            schema = MappingSchema({"x": {"a": "INT", "b": "INT"}})
+
+            try:
+                optimized = optimize("SELECT a + 1 AS c FROM x", schema=schema)
+                self.assertEqual(len(os.listdir(directory)), 1)
+
+                # A new cache reads the optimized trees back from the store
+                sqlglot.optimize_cache = cache = OptimizeCache(store=DiskStore(directory))
+                cached = optimize("SELECT a + 1 AS c FROM x", schema=MappingSchema(schema.mapping))
+                self.assertEqual(cached.sql(), optimized.sql())
+                self.assertEqual(cached.selects[0].type.this, exp.DataType.Type.INT)
+                self.assertEqual(cache.stats()["store_hits"], 1)
+
+                optimize("SELECT a + 1 AS c FROM x", schema=schema)
+                self.assertEqual(cache.stats()["store_hits"], 1)
+                self.assertEqual(cache.hits, 2)
+            finally:
+                sqlglot.optimize_cache = None
@@ -1,17 +1,26 @@
+import bz2
 import datetime
+import io
+import lzma
+import os
+import sys
+import tempfile
 import unittest
 from datetime import date
 from multiprocessing import Pool
+from unittest import mock
 
 import duckdb
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
-from sqlglot import exp, parse_one
+from sqlglot import exp, parse_one, planner
 from sqlglot.errors import ExecuteError
 from sqlglot.executor import execute
-from sqlglot.executor.python import Python
-from sqlglot.executor.table import Table, ensure_tables
+from sqlglot.executor.python import Python, PythonExecutor
+from sqlglot.executor.spill import Spill
+from sqlglot.executor.table import MappedTable, Table, ensure_tables, write_table
+from sqlglot.optimizer import optimize
 from tests.helpers import (
     FIXTURES_DIR,
     SKIP_INTEGRATION,
@@ -524,6 +533,268 @@ class TestExecutor(unittest.TestCase):
         self.assertEqual(result.columns, ("_col_0",))
         self.assertEqual(result.rows, [(3,)])
 
+    def test_sort_limit(self):
+        tables = {"x": [{"a": a % 4, "b": b} for b, a in enumerate([3, 1, 2, 1, 3, 0, 2, 1])]}
+
+        for sql, rows in [
+            ("SELECT a, b FROM x ORDER BY a LIMIT 3", [(0, 5), (1, 1), (1, 3)]),
+            ("SELECT a, b FROM x ORDER BY a DESC, b LIMIT 3", [(3, 0), (3, 4), (2, 2)]),
+            ("SELECT a, b FROM x ORDER BY a LIMIT 0", []),
+            (
+                "SELECT a FROM x ORDER BY a DESC LIMIT 100",
+                [(3,), (3,), (2,), (2,), (1,), (1,), (1,), (0,)],
+            ),
+            ("SELECT a FROM (SELECT a FROM x ORDER BY a LIMIT 1) AS y LIMIT 5", [(0,)]),
+        ]:
+            with self.subTest(sql):
+                self.assertEqual(execute(sql, tables=tables).rows, rows)
+
+        # Only the first rows are kept, so they stay within the memory limit
+        tables = {"x": [{"a": i % 97, "b": i} for i in range(2000)]}
+        with mock.patch.object(Spill, "write") as write:
+            result = execute(
+                "SELECT b FROM x ORDER BY a, b DESC LIMIT 3", tables=tables, memory_limit=1000
+            )
+        write.assert_not_called()
+        self.assertEqual(result.rows, [(1940,), (1843,), (1746,)])
+
+        plan = planner.Plan(
+            parse_one("WITH y AS (SELECT a FROM x ORDER BY a) SELECT a FROM y LIMIT 2")
+        )
+        (sort,) = plan.root.dependencies
+        self.assertIsInstance(sort, planner.Sort)
+        self.assertEqual(sort.limit, 2)
+
+        plan = planner.Plan(
+            parse_one("WITH y AS (SELECT a FROM x ORDER BY a) SELECT a FROM y WHERE a > 1 LIMIT 2")
+        )
+        (sort,) = plan.root.dependencies
+        self.assertEqual(sort.limit, float("inf"))
+
+    def test_pipelined_limit(self):
+        class Rows(list):
+            reads = 0
+
+            def __getitem__(self, index):
+                Rows.reads += 1
+                return super().__getitem__(index)
+
+        tables = {
+            "x": Table(("a",), Rows((i % 10,) for i in range(1000))),
+            "y": Table(("a", "b"), [(i, str(i)) for i in range(10)]),
+        }
+
+        result = execute(
+            "SELECT x.a, y.b FROM x JOIN y ON x.a = y.a WHERE y.b <> '1' LIMIT 3", tables=tables
+        )
+        self.assertEqual(result.rows, [(0, "0"), (2, "2"), (3, "3")])
+        self.assertLess(Rows.reads, 10)
+
+    def test_generate_rows(self):
+        executor = PythonExecutor()
+        context = executor.context(
+            {"x": Table(("a", "b")), "y": Table(("a", "b", "c"), column_range=range(2, 3))}
+        )
+        rows = [(1, "a", 2.0), (2, "b", 3.0), (3, None, 4.0)]
+        projections = [parse_one("x.a + y.c"), parse_one("UPPER(x.b)")]
+        condition = parse_one("x.a > 1")
+
+        source = executor.generate_rows_source(context, projections, condition)
+        self.assertIn("row[0]", source)
+        self.assertNotIn("scope", source)
+        self.assertEqual(
+            list(executor.generate_rows(context, projections, condition)(rows)),
+            [(5.0, "B"), (7.0, None)],
+        )
+        self.assertEqual(
+            list(executor.generate_rows(context, condition=condition, output="rows")(rows)),
+            rows[1:],
+        )
+        self.assertEqual(
+            list(executor.generate_rows(context, projections[:1], output="pairs")(rows[:1])),
+            [(rows[0], (3.0,))],
+        )
+        self.assertEqual(executor.generate_key(context, projections[:1])(rows[0]), (3.0,))
+        self.assertIsNone(executor.generate_rows(context, [parse_one("z.a")]))
+
+    def test_concurrent_steps(self):
+        tables = ensure_tables(
+            {
+                "x": [{"a": i % 7, "b": i} for i in range(100)],
+                "y": [{"a": i, "c": str(i)} for i in range(5)],
+            }
+        )
+        schema = {"x": {"a": "INT", "b": "INT"}, "y": {"a": "INT", "c": "VARCHAR"}}
+
+        for sql in [
+            "SELECT x.a, y.c, SUM(x.b) AS s FROM x JOIN y ON x.a = y.a JOIN x AS z ON z.b = y.a "
+            "GROUP BY x.a, y.c ORDER BY x.a",
+            "SELECT a FROM x UNION SELECT a FROM y ORDER BY a",
+            "WITH t AS (SELECT a, COUNT(*) AS n FROM x GROUP BY a) "
+            "SELECT t1.a, t2.n FROM t AS t1 JOIN t AS t2 ON t1.a = t2.a ORDER BY t1.a",
+        ]:
+            with self.subTest(sql):
+                plan = planner.Plan(optimize(sql, schema, leave_tables_isolated=True))
+                expected = PythonExecutor(tables=tables).execute(plan)
+                result = PythonExecutor(tables=tables, workers=4).execute(plan)
+                self.assertEqual(result.columns, expected.columns)
+                self.assertEqual(result.rows, expected.rows)
+
+    def test_parallelism(self):
+        tables = {
+            "x": [{"a": i % 7, "b": i} for i in range(300)],
+            "y": [{"a": i, "c": str(i)} for i in range(5)],
+        }
+
+        with mock.patch("sqlglot.executor.python.MORSEL_SIZE", 40):
+            for sql in [
+                "SELECT a, b * 2 AS c FROM x WHERE b % 3 = 1",
+                "SELECT x.b, y.c FROM x JOIN y ON x.a = y.a WHERE x.b > 10",
+                "SELECT x.b, y.c FROM x LEFT JOIN y ON x.a = y.a",
+                "SELECT y.c, SUM(x.b) AS s FROM x JOIN y ON x.a = y.a GROUP BY y.c ORDER BY y.c",
+            ]:
+                with self.subTest(sql):
+                    expected = execute(sql, tables=tables)
+                    result = execute(sql, tables=tables, parallelism=2)
+                    self.assertEqual(result.columns, expected.columns)
+                    self.assertEqual(result.rows, expected.rows)
+
+    def test_read_csv(self):
+        data = "a|b|c|d\n1|2021-01-01|x|1.5\n2||y|\n3|2021-01-03||2\n"
+        schema = {"t": {"a": "INT", "b": "DATE", "c": "VARCHAR", "d": "DOUBLE"}}
+        rows = [
+            (1, date(2021, 1, 1), "x", 1.5),
+            (2, None, "y", None),
+            (3, date(2021, 1, 3), "", 2.0),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            for module, extension in ((io, "csv"), (bz2, "csv.bz2"), (lzma, "csv.xz")):
+                path = os.path.join(directory, f"t.{extension}")
+                with module.open(path, "wt") as file:
+                    file.write(data)
+
+                sql = f"SELECT a, b, c, d FROM READ_CSV('{path}', 'delimiter', '|') AS t"
+
+                for engine in ("python", "columnar"):
+                    with self.subTest(f"{extension} {engine}"):
+                        result = execute(sql, schema, engine=engine)
+                        self.assertEqual(result.rows, rows)
+
+                        with mock.patch("sqlglot.executor.python.CSV_CHUNK_SIZE", 2):
+                            result = execute(f"{sql} WHERE a > 1", schema, engine=engine)
+                            self.assertEqual(result.rows, rows[1:])
+
+    def test_mapped_table(self):
+        columns = ("a", "b", "c", "d", "e", "f")
+        rows = [
+            (1, 1.5, "x", True, date(2021, 1, 1), None),
+            (None, 2.5, "y", False, None, None),
+            (3, None, "x", None, date(2021, 1, 3), None),
+            (-4, 4.0, None, True, date(2021, 1, 3), None),
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "t.tbl")
+            write_table(path, columns, rows)
+
+            table = ensure_tables({"t": path}).find(exp.to_table("t"))
+            self.assertIsInstance(table, MappedTable)
+            self.assertEqual(table.columns, columns)
+            self.assertEqual(list(table.rows), rows)
+            self.assertEqual([table.rows[i] for i in range(-4, 4)], rows + rows)
+            table.close()
+            self.assertTrue(table.buffer.closed)
+
+            for engine in ("python", "columnar"):
+                with self.subTest(engine):
+                    result = execute(
+                        "SELECT c, SUM(a) AS s, MAX(e) AS e, COUNT(b) AS n FROM t "
+                        "WHERE NOT c IS NULL GROUP BY c ORDER BY c",
+                        tables={"t": path},
+                        engine=engine,
+                    )
+                    self.assertEqual(
+                        result.rows, [("x", 4, date(2021, 1, 3), 1), ("y", None, None, 1)]
+                    )
+
+            write_table(path, ("a",), [])
+            with MappedTable(path) as table:
+                self.assertEqual(len(table), 0)
+            self.assertTrue(table.buffer.closed)
+
+            with self.assertRaises(ExecuteError):
+                write_table(path, ("a",), [(1,), (1.5,)])
+
+    def test_memory_limit(self):
+        tables = {
+            "x": [{"a": i % 50, "b": i, "c": f"c{i % 7}"} for i in range(500)],
+            "y": [{"a": i, "d": i * 1.5 if i % 2 else i} for i in range(60)],
+        }
+
+        for sql, ordered in [
+            ("SELECT x.b, y.d FROM x JOIN y ON x.a = y.a", False),
+            ("SELECT x.b, y.d FROM y LEFT JOIN x ON x.a = y.a", False),
+            ("SELECT x.b, y.a FROM x RIGHT JOIN y ON x.a = y.a", False),
+            ("SELECT b, c, SUM(b) AS s, COUNT(*) AS n FROM x GROUP BY b, c", False),
+            ("SELECT a, c, SUM(b * 2) AS s, AVG(b) AS m FROM x GROUP BY a, c", False),
+            ("SELECT y, COUNT(*) AS n FROM (SELECT ARRAY(a) AS y FROM x) AS z GROUP BY y", False),
+            ("SELECT a, b FROM x ORDER BY c DESC, a, b", True),
+            ("SELECT a, b FROM x ORDER BY a DESC, c LIMIT 30", True),
+            ("SELECT d FROM y ORDER BY d", True),
+        ]:
+            with self.subTest(sql):
+                expected = execute(sql, tables=tables)
+
+                with self.assertLogs("sqlglot", level="DEBUG") as logs:
+                    result = execute(sql, tables=tables, memory_limit=1000)
+
+                self.assertTrue(any("Spilled" in line for line in logs.output))
+                self.assertEqual(result.columns, expected.columns)
+                if ordered:
+                    self.assertEqual(result.rows, expected.rows)
+                else:
+                    self.assertEqual(sorted(result.rows, key=repr), sorted(expected.rows, key=repr))
+
+        with self.assertRaises(ValueError):
+            execute("SELECT a FROM x", tables=tables, engine="columnar", memory_limit=1000)
+
+    def test_group_by(self):
+        tables = {
+            "x": [
+                {"a": 3, "b": 1.5},
+                {"a": 1, "b": None},
+                {"a": 3, "b": 2.5},
+                {"a": 2, "b": 1.0},
+                {"a": 1, "b": 4.0},
+            ]
+        }
+
+        for sql, rows in [
+            (
+                "SELECT a, COUNT(*), COUNT(b), SUM(b), AVG(b), MIN(b), MAX(b) FROM x GROUP BY a",
+                [
+                    (3, 2, 2, 4.0, 2.0, 1.5, 2.5),
+                    (1, 2, 1, 4.0, 4.0, 4.0, 4.0),
+                    (2, 1, 1, 1.0, 1.0, 1.0, 1.0),
+                ],
+            ),
+            ("SELECT a, SUM(b) * COUNT(*) AS c FROM x GROUP BY a LIMIT 2", [(3, 8.0), (1, 8.0)]),
+            (
+                "SELECT a, ARRAY_AGG(b) AS c FROM x GROUP BY a",
+                [(3, [1.5, 2.5]), (1, [None, 4.0]), (2, [1.0])],
+            ),
+            ("SELECT DISTINCT a FROM x ORDER BY a DESC", [(3,), (2,), (1,)]),
+        ]:
+            with self.subTest(sql):
+                self.assertEqual(execute(sql, tables=tables).rows, rows)
+
+        # GROUP BY doesn't specify the order of the groups
+        result = execute(
+            "SELECT y, COUNT(*) FROM (SELECT ARRAY(a) AS y FROM x) AS z GROUP BY y", tables=tables
+        )
+        self.assertEqual(sorted(result.rows), [([1], 2), ([2], 1), ([3], 2)])
+
     def test_scalar_functions(self):
         now = datetime.datetime.now()
 
@@ -643,3 +914,71 @@ class TestExecutor(unittest.TestCase):
 
         self.assertEqual(result.columns, ("id", "price"))
         self.assertEqual(result.rows, [(1, 1.0), (2, 2.0), (3, 3.0)])
+
+    def test_columnar_engine(self):
+        tables = {
+            "x": [
+                {"a": 1, "b": "foo", "c": 1.5, "d": "2022-01-01"},
+                {"a": 2, "b": "bar", "c": None, "d": "2022-02-15"},
+                {"a": 3, "b": None, "c": 2.5, "d": "2023-03-31"},
+                {"a": 2, "b": "baz", "c": 4.0, "d": "2023-12-25"},
+            ],
+            "y": [
+                {"a": 1, "e": 10, "f": True},
+                {"a": 2, "e": 20, "f": False},
+                {"a": 2, "e": 30, "f": True},
+                {"a": 4, "e": 40, "f": False},
+                {"a": 4, "e": None, "f": True},
+                {"a": 1, "e": None, "f": False},
+            ],
+        }
+        schema = {
+            "x": {"a": "INT", "b": "VARCHAR", "c": "DOUBLE", "d": "VARCHAR"},
+            "y": {"a": "INT", "e": "INT", "f": "BOOLEAN"},
+        }
+
+        for sql, ordered in [
+            ("SELECT a, b FROM x WHERE a > 1 AND NOT b IS NULL", False),
+            ("SELECT a, c * 2 AS c2 FROM x WHERE c IS NULL OR c > 2", False),
+            ("SELECT b FROM x WHERE b LIKE 'ba%' OR a IN (1, 3)", False),
+            ("SELECT x.a, y.e FROM x JOIN y ON x.a = y.a", False),
+            ("SELECT x.a, y.e FROM x LEFT JOIN y ON x.a = y.a", False),
+            ("SELECT x.a, y.e FROM x CROSS JOIN y WHERE x.a < y.a", False),
+            ("SELECT a, SUM(c) AS s, COUNT(*) AS n FROM x GROUP BY a", False),
+            ("SELECT COUNT(DISTINCT a) AS n, MIN(b) AS m, AVG(c) AS v FROM x", False),
+            ("SELECT a, MAX(e) AS m FROM y GROUP BY a ORDER BY m DESC LIMIT 2", True),
+            ("SELECT a, SUM(e) AS s, AVG(e) AS v, MIN(f) AS m FROM y GROUP BY a", False),
+            (
+                "SELECT a, SUM(e) AS s, MAX(e) AS m FROM y WHERE e IS NULL OR a = 2 GROUP BY a",
+                False,
+            ),
+            ("SELECT SUM(e) AS s, MAX(f) AS m, COUNT(*) AS n FROM y WHERE a > 3", False),
+            ("SELECT SUM(x) AS s, COUNT(x) AS n FROM (SELECT 1 AS x WHERE FALSE)", False),
+            ("SELECT y, COUNT(*) AS n FROM (SELECT ARRAY(a) AS y FROM y) AS z GROUP BY y", False),
+            (
+                "SELECT CASE WHEN a = 1 THEN 'one' WHEN a = 2 THEN 'two' ELSE b END AS v FROM x",
+                False,
+            ),
+            ("SELECT EXTRACT(year FROM CAST(d AS DATE)) AS y FROM x ORDER BY y, a DESC", True),
+            ("SELECT a FROM x UNION SELECT a FROM y", False),
+            ("SELECT a FROM x EXCEPT SELECT a FROM y", False),
+            ("SELECT 1 AS a, 'b' AS b", True),
+        ]:
+            with self.subTest(sql):
+                expected = execute(sql, schema=schema, tables=tables)
+                result = execute(sql, schema=schema, tables=tables, engine="columnar")
+                self.assertEqual(result.columns, expected.columns)
+                if ordered:
+                    self.assertEqual(result.rows, expected.rows)
+                else:
+                    self.assertEqual(
+                        sorted(map(repr, result.rows)), sorted(map(repr, expected.rows))
+                    )
+
+        with self.assertRaises(ValueError):
+            execute("SELECT 1", engine="foo")
+
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            sys.modules.pop("sqlglot.executor.columnar", None)
+            with self.assertRaisesRegex(ImportError, "sqlglot\\[numpy\\]"):
+                execute("SELECT 1", engine="columnar")
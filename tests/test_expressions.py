@@ -438,6 +438,35 @@ class TestExpressions(unittest.TestCase):
         expression.find(exp.Table).replace(parse_one("y"))
         self.assertEqual(expression.sql(), "SELECT c, b FROM y")
 
+    def test_copy(self):
+        expression = parse_one("SELECT a /* comment */, CAST(b AS INT) FROM x WHERE c IN (1, 2)")
+        expression.meta["key"] = ["value"]
+        expression.find(exp.Column).type = "int"
+        copy = expression.copy()
+
+        self.assertEqual(copy, expression)
+        self.assertEqual(copy.sql(), expression.sql())
+        self.assertEqual(copy.meta, {"key": ["value"]})
+        self.assertIsNot(copy.meta["key"], expression.meta["key"])
+        self.assertEqual(copy.find(exp.Column).type.sql(), "INT")
+
+        for node, original in zip(copy.walk(), expression.walk()):
+            self.assertIsNot(node[0], original[0])
+            self.assertEqual(node[0].arg_key, original[0].arg_key)
+            if node[1]:
+                self.assertIs(node[0].parent, node[1])
+
+        copy.find(exp.Column).comments.append("other")
+        copy.find(exp.Column).replace(exp.column("d"))
+        self.assertEqual(
+            expression.sql(), "SELECT a /* comment */, CAST(b AS INT) FROM x WHERE c IN (1, 2)"
+        )
+
+        deep = exp.Literal.number(1)
+        for _ in range(5000):
+            deep = exp.Paren(this=deep)
+        self.assertEqual(len(list(deep.copy().walk())), 5001)
+
     def test_pop(self):
         expression = parse_one("SELECT a, b FROM x")
         expression.find(exp.Column).pop()
@@ -1,7 +1,8 @@
 import unittest
 
-from sqlglot import parse_one
+from sqlglot import exp, parse_one
 from sqlglot.expressions import Func
+from sqlglot.generator import Generator
 from sqlglot.parser import Parser
 from sqlglot.tokens import Tokenizer
 
@@ -38,3 +39,29 @@ class TestGenerator(unittest.TestCase):
         assert parse_one("X").sql(identify="safe") == "X"
         assert parse_one("x as 1").sql(identify="safe") == '"x" AS "1"'
         assert parse_one("X as 1").sql(identify="safe") == 'X AS "1"'
+
+    def test_cache(self):
+        expression = parse_one("SELECT a + 1 AS x, (a + 1) * 2 AS y FROM t WHERE a + 1 > 0")
+        cache = {}
+
+        self.assertEqual(Generator().generate(expression, cache), expression.sql())
+        self.assertIn(hash(expression.find(exp.Add)), cache)
+        self.assertTrue(all(node._hash is None for node, *_ in expression.walk()))
+
+        expression.find(exp.Add).set("expression", exp.Literal.number(2))
+        self.assertEqual(
+            Generator().generate(expression, cache),
+            "SELECT a + 2 AS x, (a + 1) * 2 AS y FROM t WHERE a + 1 > 0",
+        )
+
+    def test_hash_invalidation(self):
+        expression = parse_one("SELECT a + 1 FROM t")
+        for node, *_ in reversed(tuple(expression.walk())):
+            node._hash = hash(node)
+
+        add = expression.find(exp.Add)
+        add.this.replace(exp.column("b"))
+        self.assertIsNone(add._hash)
+        self.assertIsNone(expression._hash)
+        self.assertIsNotNone(add.expression._hash)
+        self.assertEqual(expression, parse_one("SELECT b + 1 FROM t"))
@@ -1,7 +1,8 @@
 import unittest
 
+from sqlglot import exp, parse_one
 from sqlglot.dialects import BigQuery, Dialect, Snowflake
-from sqlglot.helper import name_sequence, tsort
+from sqlglot.helper import name_sequence, tsort, while_changing
 
 
 class TestHelper(unittest.TestCase):
@@ -30,6 +31,35 @@ class TestHelper(unittest.TestCase):
                 }
             )
 
+    def test_while_changing(self):
+        visits = []
+
+        def remove_double_negation(node):
+            if not node._dirty:
+                return node
+            node._dirty = False
+            visits[-1].append(node.sql())
+
+            if isinstance(node, exp.Not) and isinstance(node.this, exp.Not):
+                return node.this.this
+
+            exp.replace_children(node, remove_double_negation)
+            return node
+
+        def func(expression):
+            visits.append([])
+            return remove_double_negation(expression)
+
+        expression = while_changing(parse_one("a AND b AND NOT NOT NOT NOT c"), func)
+        self.assertEqual(expression.sql(), "a AND b AND c")
+
+        # Only the nodes that were modified or moved by the previous pass are visited
+        self.assertEqual(len(visits), 3)
+        self.assertEqual(len(visits[0]), 7)
+        self.assertEqual(visits[1], ["a AND b AND NOT NOT c", "NOT NOT c"])
+        self.assertEqual(visits[2], ["a AND b AND c", "c", "c"])
+        self.assertTrue(all(node._hash is None for node, *_ in expression.walk()))
+
     def test_compare_dialects(self):
         bigquery_class = Dialect["bigquery"]
         bigquery_object = BigQuery()
@@ -0,0 +1,78 @@
+import unittest
+
+from sqlglot import Dialect, parse
+from sqlglot.errors import ErrorLevel
+from sqlglot.incremental import reparse
+
+
+def _attributes(tokens):
+    return [
+        (token.token_type, token.text, token.line, token.col, token.start, token.end)
+        + (token.comments,)
+        for token in tokens
+    ]
+
+
+class TestIncremental(unittest.TestCase):
+    SQL = """/* header */ SELECT a, b FROM x; -- one
+INSERT INTO y VALUES (1, 'a;b');
+/* leading */ SELECT 'x' ; SELECT c
+FROM z WHERE d = 1 /* c */
+;
+SHOW TABLES;
+-- tail
+SELECT 1"""
+
+    def validate(self, sql, offset, removed, inserted, read=None):
+        dialect = Dialect.get_or_raise(read)()
+        tokens = dialect.tokenize(sql)
+        expressions = parse(sql, read=read, error_level=ErrorLevel.IGNORE)
+
+        new_sql, new_tokens, new_expressions = reparse(
+            sql, tokens, expressions, offset, removed, inserted, read=read
+        )
+        expected = sql[:offset] + inserted + sql[offset + removed :]
+
+        self.assertEqual(new_sql, expected)
+        self.assertEqual(_attributes(new_tokens), _attributes(dialect.tokenize(expected)))
+        self.assertEqual(
+            [e.sql(read, comments=True) if e else None for e in new_expressions],
+            [e.sql(read, comments=True) if e else None for e in parse(expected, read=read)],
+        )
+        return expressions, new_expressions
+
+    def test_reuse(self):
+        old, new = self.validate(self.SQL, self.SQL.index("'x'"), 3, "'y'\n\n")
+        self.assertEqual([a is b for a, b in zip(old, new)], [True, True, False, True, True, True])
+
+        old, new = self.validate(self.SQL, 0, 0, "SELECT 0;\n")
+        self.assertEqual(len(new), len(old) + 1)
+        self.assertTrue(all(a is b for a, b in zip(old[1:], new[2:])))
+
+        old, new = self.validate(self.SQL, len(self.SQL), 0, ";")
+        self.assertEqual(len(new), len(old))
+        self.assertTrue(all(a is b for a, b in zip(old[:-1], new[:-1])))
+
+    def test_edits(self):
+        sql = self.SQL
+        for i, piece in enumerate(("'", ";", " ", "\n", "--", "/*", "*/", "x", "SELECT 2;", "")):
+            for offset in range(0, len(sql) + 1, 7):
+                removed = min(i % 4, len(sql) - offset)
+                expected = sql[:offset] + piece + sql[offset + removed :]
+
+                try:
+                    parse(expected)
+                except Exception:
+                    continue
+
+                with self.subTest(offset=offset, removed=removed, inserted=piece):
+                    self.validate(sql, offset, removed, piece)
+
+    def test_dialects(self):
+        self.validate("SELECT 1; SELECT `a;b`; SELECT 2", 7, 1, "3", read="mysql")
+        self.validate("SELECT 1; SELECT $$a;b$$; SELECT 2", 0, 0, "-- $$\n", read="postgres")
+        self.validate("SELECT 1; /*!50100 SELECT 2; */ SELECT 3", 7, 1, "0", read="mysql")
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            reparse("SELECT 1", [], [], 5, 10, "")
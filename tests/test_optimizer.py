@@ -1,13 +1,15 @@
 import unittest
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from functools import partial
+from unittest import mock
 
 import duckdb
 from pandas.testing import assert_frame_equal
 
 import sqlglot
-from sqlglot import exp, optimizer, parse_one
+from sqlglot import exp, optimizer, parse_one, planner
 from sqlglot.errors import OptimizeError, SchemaError
+from sqlglot.optimizer import scope
 from sqlglot.optimizer.annotate_types import annotate_types
 from sqlglot.optimizer.scope import build_scope, traverse_scope, walk_in_scope
 from sqlglot.schema import MappingSchema
@@ -21,7 +23,9 @@ from tests.helpers import (
 
 
 def parse_and_optimize(func, sql, read_dialect, **kwargs):
-    return func(parse_one(sql, read=read_dialect), **kwargs)
+    # The scope trees that are shared across rules are checked against ones built from scratch
+    with mock.patch.object(scope, "CHECK_REFRESH", True):
+        return func(parse_one(sql, read=read_dialect), **kwargs)
 
 
 def qualify_columns(expression, **kwargs):
@@ -164,6 +168,30 @@ class TestOptimizer(unittest.TestCase):
             set_dialect=True,
         )
 
+    def test_optimize_profile(self):
+        profiles = []
+        sql = "SELECT a FROM (SELECT a, b FROM x) AS y WHERE 1 = 1"
+        expression = optimizer.optimize(
+            sql,
+            schema={"x": {"a": "INT", "b": "INT"}},
+            profile=profiles.append,
+        )
+        self.assertEqual(expression.sql(), 'SELECT "x"."a" AS "a" FROM "x" AS "x"')
+        self.assertEqual(
+            [profile.rule for profile in profiles], [rule.__name__ for rule in optimizer.RULES]
+        )
+        self.assertTrue(all(profile.time >= 0 for profile in profiles))
+        self.assertEqual(profiles[0].nodes_before, len(list(parse_one(sql).walk())))
+        self.assertEqual(profiles[-1].nodes_after, len(list(expression.walk())))
+
+        for before, after in zip(profiles, profiles[1:]):
+            self.assertEqual(before.nodes_after, after.nodes_before)
+
+        scopes = {profile.rule: profile.scopes for profile in profiles}
+        self.assertGreater(scopes["qualify"], 0)
+        self.assertGreater(scopes["merge_subqueries"], 0)
+        self.assertEqual(scopes["normalize"], 0)
+
     def test_isolate_table_selects(self):
         self.check_file(
             "isolate_table_selects",
@@ -280,6 +308,43 @@ class TestOptimizer(unittest.TestCase):
             optimizer.optimize_joins.optimize_joins,
         )
 
+    def test_optimize_joins_by_cost(self):
+        schema = MappingSchema(
+            self.schema,
+            statistics={
+                "x": {"rows": 1000000, "columns": {"a": {"distinct": 1000000}}},
+                "y": {"rows": 1000, "columns": {"b": {"distinct": 1000}, "c": {"distinct": 1000}}},
+                "z": {"rows": 1000, "columns": {"b": {"distinct": 1000}, "c": {"distinct": 100}}},
+            },
+        )
+
+        for sql, expected in [
+            (
+                "SELECT x.a FROM y JOIN x ON x.a = y.b JOIN z ON y.c = z.b WHERE z.c = 1",
+                "SELECT x.a FROM x JOIN y ON x.a = y.b JOIN z ON y.c = z.b WHERE z.c = 1",
+            ),
+            (
+                "SELECT x.a FROM z CROSS JOIN y JOIN x ON x.a = y.b AND y.c = z.b AND z.c = 1",
+                "SELECT x.a FROM x JOIN y ON x.a = y.b JOIN z ON y.c = z.b AND z.c = 1",
+            ),
+            (
+                "SELECT x.a FROM y LEFT JOIN x ON x.a = y.b JOIN z ON y.c = z.b",
+                "SELECT x.a FROM y LEFT JOIN x ON x.a = y.b JOIN z ON y.c = z.b",
+            ),
+            (
+                "SELECT x.a FROM y JOIN x ON x.a = y.b JOIN w ON x.a = w.d",
+                "SELECT x.a FROM y JOIN x ON x.a = y.b JOIN w ON x.a = w.d",
+            ),
+        ]:
+            with self.subTest(sql):
+                expression = optimizer.optimize_joins.optimize_joins(parse_one(sql), schema=schema)
+                self.assertEqual(expression.sql(), expected)
+
+        expression = optimizer.optimize(
+            "SELECT x.a FROM y JOIN x ON x.a = y.b JOIN z ON y.c = z.b WHERE z.c = 1", schema
+        )
+        self.assertEqual(list(planner.Plan(expression).root.joins), ["y", "z"])
+
     def test_eliminate_joins(self):
         self.check_file(
             "eliminate_joins",
@@ -400,6 +465,53 @@ FROM READ_CSV('tests/fixtures/optimizer/tpc-h/nation.csv.gz', 'delimiter', '|')
             {"s.b"},
         )
 
+    def test_scope_refresh(self):
+        expression = parse_one(
+            "SELECT y.b FROM (SELECT x.b FROM x) AS y JOIN (SELECT z.b FROM z) AS w ON y.b = w.b"
+        )
+        root = build_scope(expression)
+        y, w, _ = root.traverse()
+        self.assertFalse(root.refresh())
+
+        w.expression.where("z.c = 1", copy=False)
+        w.clear_cache()
+        self.assertTrue(root.refresh())
+        self.assertEqual(traverse_scope(expression, root), [y, w, root])
+        self.assertEqual({c.sql() for c in w.columns}, {"z.b", "z.c"})
+
+        expression.args["joins"][0].set("this", exp.to_table("z", alias="w"))
+        root.clear_cache()
+        root.refresh()
+        self.assertEqual(
+            [scope.expression.sql() for scope in root.traverse()],
+            ["SELECT x.b FROM x", expression.sql()],
+        )
+        self.assertIsInstance(root.sources["w"], exp.Table)
+
+        roots = []
+
+        def rule(expression, root_scope=None):
+            roots.append(root_scope)
+            return expression
+
+        optimizer.optimize(
+            "SELECT a FROM x", rules=(rule, rule, optimizer.normalize.normalize, rule)
+        )
+        self.assertIs(roots[0], roots[1])
+        self.assertIsNot(roots[1], roots[2])
+
+        def unreported_rule(expression, root_scope=None):
+            for child_scope in root_scope.traverse():
+                child_scope.columns
+            expression.find(exp.Column).replace(exp.column("b", "x"))
+            return expression
+
+        with mock.patch.object(scope, "CHECK_REFRESH", True):
+            with self.assertRaises(OptimizeError):
+                optimizer.optimize(
+                    "SELECT x.a FROM x AS x", rules=(unreported_rule, unreported_rule)
+                )
+
     def test_literal_type_annotation(self):
         tests = {
             "SELECT 5": exp.DataType.Type.INT,
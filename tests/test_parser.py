@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import patch
 
-from sqlglot import Parser, exp, parse, parse_one
+from sqlglot import Parser, Tokenizer, exp, parse, parse_one
 from sqlglot.errors import ErrorLevel, ParseError
 from tests.helpers import assert_logger_contains
 
@@ -72,6 +72,30 @@ class TestParser(unittest.TestCase):
         self.assertEqual(str(ctx.exception), expected_message)
         self.assertEqual(ctx.exception.errors, expected_errors)
 
+    def test_parse_token_stream(self):
+        sql = """
+        SELECT /* a */ x FROM y -- b
+        ;
+        SHOW TABLES;
+        CREATE TABLE z (w INT)  /* c */;
+        """
+        tokenizer = Tokenizer()
+        expressions = Parser().parse(tokenizer.tokenize_compact(sql), sql)
+
+        self.assertEqual(expressions, parse(sql))
+        self.assertEqual(
+            [expression.sql(comments=True) for expression in expressions],
+            [expression.sql(comments=True) for expression in parse(sql)],
+        )
+
+        select = expressions[0].select("1", copy=False)
+        select.add_comments(["d"])
+        self.assertEqual(select.comments, [" a ", "d"])
+        self.assertEqual(tokenizer.tokenize_compact("SELECT 1")[0].comments, [])
+
+        with self.assertRaises(ParseError):
+            Parser().parse(tokenizer.tokenize_compact("SELECT 1 +"), "SELECT 1 +")
+
     def test_column(self):
         columns = parse_one("select a, ARRAY[1] b, case when 1 then 1 end").find_all(exp.Column)
         assert len(list(columns)) == 1
@@ -2,7 +2,12 @@ import unittest
 
 from sqlglot import exp, parse_one, to_table
 from sqlglot.errors import SchemaError
-from sqlglot.schema import MappingSchema, ensure_schema
+from sqlglot.schema import (
+    ColumnStatistics,
+    MappingSchema,
+    TableStatistics,
+    ensure_schema,
+)
 
 
 class TestSchema(unittest.TestCase):
@@ -236,3 +241,38 @@ class TestSchema(unittest.TestCase):
         # ones. Also, ensure that tables aren't normalized, since they're case-sensitive by default.
         schema = MappingSchema(schema={"Foo": {"`BaR`": "int"}}, dialect="bigquery")
         self.assertEqual(schema.column_names("Foo"), ["bar"])
+
+    def test_schema_statistics(self):
+        schema = MappingSchema(
+            schema={"x": {"a": "INT", "b": "INT"}, "y": {"c": "INT"}},
+            statistics={
+                "X": {"rows": 100, "columns": {"A": {"distinct": 10, "null_fraction": 0.5}}},
+                "y": TableStatistics(rows=5),
+            },
+        )
+        self.assertEqual(
+            schema.table_statistics("x"),
+            TableStatistics(rows=100, columns={"a": ColumnStatistics(10, 0.5)}),
+        )
+        self.assertEqual(schema.table_statistics(exp.table_("y", alias="z")).rows, 5)
+        self.assertEqual(schema.copy().table_statistics("x").rows, 100)
+        self.assertIsNone(schema.table_statistics("w"))
+        self.assertIsNone(MappingSchema(schema={"x": {"a": "INT"}}).table_statistics("x"))
+
+    def test_schema_fingerprint(self):
+        schema = MappingSchema(schema={"x": {"a": "INT"}}, visible={"x": {"a"}})
+        fingerprint = schema.fingerprint()
+        self.assertEqual(schema.version, 0)
+        self.assertEqual(
+            fingerprint,
+            MappingSchema(schema={"x": {"a": "INT"}}, visible={"x": {"a"}}).fingerprint(),
+        )
+        self.assertNotEqual(fingerprint, MappingSchema(schema={"x": {"a": "TEXT"}}).fingerprint())
+
+        # Adding a table without a column mapping doesn't modify it
+        schema.add_table("x")
+        self.assertEqual(schema.version, 0)
+
+        schema.add_table("y", {"b": "INT"})
+        self.assertEqual(schema.version, 1)
+        self.assertNotEqual(schema.fingerprint(), fingerprint)
@@ -1,7 +1,11 @@
+import glob
+import io
+import os
 import unittest
 
-from sqlglot.dialects import BigQuery
-from sqlglot.tokens import Tokenizer, TokenType
+from sqlglot.dialects import BigQuery, Dialect
+from sqlglot.tokens import Tokenizer, TokenStream, TokenType
+from tests.helpers import FIXTURES_DIR
 
 
 class TestTokens(unittest.TestCase):
@@ -64,6 +68,149 @@ x"""
         self.assertEqual(tokens[2].token_type, TokenType.SHOW)
         self.assertEqual(tokens[3].token_type, TokenType.SEMICOLON)
 
+    def test_tokenize_stream(self):
+        sql = "SELECT 'a;b' /* c; */;\nSELECT x\n  FROM y; -- z\n\nSELECT 1;;"
+        expected = Tokenizer().tokenize(sql)
+
+        for chunk_size in (1, 2, 5, 100):
+            with self.subTest(chunk_size=chunk_size):
+                statements = list(
+                    Tokenizer().tokenize_stream(io.StringIO(sql), chunk_size=chunk_size)
+                )
+                self.assertEqual(len(statements), 4)
+                self.assertEqual(
+                    [
+                        (token.token_type, token.text, token.line, token.col, token.comments)
+                        for tokens, _ in statements
+                        for token in tokens
+                    ],
+                    [
+                        (token.token_type, token.text, token.line, token.col, token.comments)
+                        for token in expected
+                        if token.token_type != TokenType.SEMICOLON
+                    ],
+                )
+
+                for tokens, text in statements:
+                    for token in tokens:
+                        self.assertIn(token.text, text[token.start : token.end + 1])
+
+        self.assertEqual(len(list(Tokenizer().tokenize_stream(io.StringIO("")))), 1)
+
+        with self.assertRaises(ValueError):
+            list(Tokenizer().tokenize_stream(io.StringIO("SELECT 1; SELECT 'x"), chunk_size=4))
+
+    def test_conditional_comments(self):
+        tokens = Tokenizer().tokenize("SELECT 1 /*!50100 + 2 */, 3 /*!40101 x */ /*! y */")
+        self.assertEqual(
+            [(token.token_type, token.text) for token in tokens],
+            [
+                (TokenType.SELECT, "SELECT"),
+                (TokenType.NUMBER, "1"),
+                (TokenType.PLUS, "+"),
+                (TokenType.NUMBER, "2"),
+                (TokenType.COMMA, ","),
+                (TokenType.NUMBER, "3"),
+            ],
+        )
+        self.assertEqual(tokens[-1].comments, ["!40101 x ", "! y "])
+
+        # The unwrapped body is positioned relative to the original SQL
+        self.assertEqual((tokens[2].start, tokens[2].end, tokens[2].col), (18, 18, 19))
+
+        # An unknown bang, e.g. one that isn't followed by a version, doesn't hang the tokenizer
+        self.assertEqual(len(Tokenizer().tokenize("SELECT '!50100'; SELECT 1 /*!50100 + 2")), 7)
+
+        class Tokenizer80(Tokenizer):
+            CONDITIONAL_COMMENT_VERSIONS = (0, 80035)
+
+        tokens = Tokenizer80().tokenize("SELECT /*! 1 */ /*!80031 , 2*/ /*!80040 , 3 */")
+        self.assertEqual([token.text for token in tokens], ["SELECT", "1", ",", "2"])
+        self.assertEqual(tokens[-1].comments, ["!80040 , 3 "])
+
+        class NoConditionalComments(Tokenizer):
+            CONDITIONAL_COMMENT_VERSIONS = None
+
+        tokens = NoConditionalComments().tokenize("SELECT 1 /*!50100 + 2 */")
+        self.assertEqual([token.text for token in tokens], ["SELECT", "1"])
+
+    def test_fast_scanner_parity(self):
+        def tokenize(tokenizer, sql):
+            try:
+                return [
+                    (token.token_type, token.text, token.line, token.col, token.start, token.end)
+                    + (token.comments,)
+                    for token in tokenizer.tokenize(sql)
+                ]
+            except ValueError as e:
+                return str(e)
+
+        files = sorted(glob.glob(os.path.join(FIXTURES_DIR, "**", "*.sql"), recursive=True))
+        fixtures = {}
+        for file in files:
+            with open(file, encoding="utf-8") as f:
+                fixtures[os.path.relpath(file, FIXTURES_DIR)] = f.read()
+
+        edge_cases = [
+            "a\r\nb 'x\r\ny' -- c\r\n/* d\r\n */ e",
+            "SELECT x\t\t  \n\n  FROM\r\r y --",
+            "SELECT 'a''b', 'c\\'d', `e``f`, \"g\"\"h\" -- end",
+            "SELECT é, ñ, 'ü' FROM \"ß\"",
+            "SELECT x FROM y GROUP\n   BY x ORDER",
+            "SELECT $1, $$a$$, x$y, a@b, N'x', X'AB', E'\\n' FROM t --",
+            "{# jinja #} {{ x }} {% if y %}z{% endif %}",
+            "'abc",
+            "x /* unterminated",
+            "x -- unterminated",
+        ]
+
+        for name, dialect in Dialect.classes.items():
+            fast = type("Fast", (dialect.tokenizer_class,), {"FAST_SCAN": True})
+            slow = type("Slow", (dialect.tokenizer_class,), {"FAST_SCAN": False})
+
+            for fixture, sql in [*fixtures.items(), *enumerate(edge_cases)]:
+                # The TPC-DS queries are large, so they're only scanned by the default tokenizer
+                if "tpc-ds" in str(fixture) and name:
+                    continue
+
+                with self.subTest(dialect=name, sql=fixture):
+                    self.assertEqual(tokenize(fast(), sql), tokenize(slow(), sql))
+
+    def test_tokenize_compact(self):
+        def attributes(tokens):
+            return [
+                (token.token_type, token.text, token.line, token.col, token.start, token.end)
+                + (token.comments,)
+                for token in tokens
+            ]
+
+        sql = """SELECT a, 'b''c' /* d */ FROM t -- e
+        ;
+        /* f */ SHOW TABLES;
+        CREATE TABLE x (y INT) /* g */"""
+
+        tokenizer = Tokenizer()
+        tokens = tokenizer.tokenize(sql)
+        stream = tokenizer.tokenize_compact(sql)
+
+        self.assertIsInstance(stream, TokenStream)
+        self.assertEqual(len(stream), len(tokens))
+        self.assertEqual(attributes(stream), attributes(tokens))
+        self.assertEqual(attributes([stream[-1], stream[2]]), attributes([tokens[-1], tokens[2]]))
+        self.assertEqual(stream.token_type(-1), TokenType.R_PAREN)
+        self.assertEqual(attributes(stream[3:6]), attributes(tokens[3:6]))
+        self.assertEqual(attributes(stream[3:6][1:]), attributes(tokens[4:6]))
+
+        with self.assertRaises(IndexError):
+            stream[len(tokens)]
+
+        # Only the tokens whose text isn't the same as the SQL they were scanned from store it
+        self.assertEqual(stream._texts, {3: "b'c"})
+        self.assertIs(stream[0].comments, stream[1].comments)
+
+        views = stream.split(TokenType.SEMICOLON)
+        self.assertEqual([len(view) for view in views], [6, 2, 7])
+
     def test_error_msg(self):
         with self.assertRaisesRegex(ValueError, "Error tokenizing 'select /'"):
             Tokenizer().tokenize("select /*")
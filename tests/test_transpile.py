@@ -1,8 +1,9 @@
+import io
 import os
 import unittest
 from unittest import mock
 
-from sqlglot import parse_one, transpile
+from sqlglot import parse_one, transpile, transpile_parallel, transpile_stream
 from sqlglot.errors import ErrorLevel, ParseError, UnsupportedError
 from tests.helpers import (
     assert_logger_contains,
@@ -44,6 +45,98 @@ class TestTranspile(unittest.TestCase):
                 with self.assertRaises(ParseError):
                     self.validate(f"SELECT x {key}", "")
 
+    def test_transpile_stream(self):
+        sql = """
+            CREATE TABLE x (a INT, b TEXT);
+            INSERT INTO x VALUES (1, 'a;b'), (2, '/* ; */');
+            /* leading comment */ SELECT a FROM x WHERE b <> ';';;
+            SELECT IFNULL(a, 0) FROM x
+        """
+
+        for chunk_size in (1, 7, 64, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    list(
+                        transpile_stream(
+                            io.StringIO(sql), read="mysql", write="spark", chunk_size=chunk_size
+                        )
+                    ),
+                    transpile(sql, read="mysql", write="spark"),
+                )
+
+        self.assertEqual(list(transpile_stream(io.StringIO(""))), transpile(""))
+
+        with self.assertRaises(ParseError) as ctx:
+            list(transpile_stream(io.StringIO("SELECT 1;\nSELECT 1 +;"), chunk_size=3))
+        self.assertEqual(ctx.exception.errors[0]["line"], 2)
+
+    def test_transpile_parallel(self):
+        sql = """
+            CREATE TABLE x (a INT, b TEXT);
+            INSERT INTO x VALUES (1, 'a;b'), (2, '/* ; */');
+            /* leading comment */ SELECT a FROM x WHERE b <> ';';;
+            SELECT IFNULL(a, 0) FROM x -- trailing comment
+        """
+
+        expected = transpile(sql, read="mysql", write="spark")
+        for workers, batch_size in ((1, None), (2, 1), (2, 3)):
+            with self.subTest(workers=workers, batch_size=batch_size):
+                self.assertEqual(
+                    transpile_parallel(
+                        sql, read="mysql", write="spark", workers=workers, batch_size=batch_size
+                    ),
+                    expected,
+                )
+
+        self.assertEqual(transpile_parallel("", workers=2), transpile(""))
+        self.assertEqual(transpile_parallel("SELECT 1;", workers=2), transpile("SELECT 1;"))
+
+        invalid = "SELECT 1;\nSELECT 1 +;\nSELECT 2;\n\nSELECT (1"
+
+        with self.assertRaises(ParseError) as ctx:
+            transpile_parallel(invalid, workers=2, batch_size=1)
+        self.assertEqual([error["line"] for error in ctx.exception.errors], [2])
+
+        with self.assertRaises(ParseError) as ctx:
+            transpile_parallel(invalid, error_level=ErrorLevel.RAISE, workers=2, batch_size=1)
+        self.assertEqual([error["line"] for error in ctx.exception.errors], [2, 5])
+
+        # Tokenizer errors are reported as the error of the statement that can't be tokenized
+        untokenizable = "SELECT 1 +;\nSELECT 'a"
+
+        with self.assertRaises(ParseError) as ctx:
+            transpile_parallel(untokenizable, workers=2, batch_size=1)
+        self.assertEqual(ctx.exception.errors[0]["line"], 1)
+
+        with self.assertRaises(ParseError) as ctx:
+            transpile_parallel(untokenizable, error_level=ErrorLevel.RAISE, workers=2, batch_size=1)
+        self.assertEqual(len(ctx.exception.errors), 2)
+        self.assertIn("Error tokenizing", ctx.exception.errors[1]["description"])
+
+        with self.assertRaises(ValueError):
+            transpile_parallel("SELECT 1;\nSELECT 'a", workers=2, batch_size=1)
+
+    @mock.patch("sqlglot.parser.logger")
+    def test_transpile_parallel_warn(self, logger):
+        sql = "SELECT 1 +;\nSELECT 2;\nSELECT 'a"
+
+        # Without parser errors that are raised, tokenizer errors are raised as is, like transpile
+        for error_level in (ErrorLevel.WARN, ErrorLevel.IGNORE):
+            with self.subTest(error_level=error_level):
+                with self.assertRaises(ValueError) as ctx:
+                    transpile_parallel(sql, error_level=error_level, workers=1)
+                self.assertNotIsInstance(ctx.exception, ParseError)
+                self.assertIn("Error tokenizing", str(ctx.exception))
+
+                with self.assertRaises(ValueError):
+                    transpile(sql, error_level=error_level)
+
+        self.assertEqual(logger.error.call_count, 1)
+        self.assertEqual(
+            transpile_parallel("SELECT 1 +;\nSELECT 2", error_level=ErrorLevel.WARN, workers=1),
+            transpile("SELECT 1 +;\nSELECT 2", error_level=ErrorLevel.WARN),
+        )
+
     def test_asc(self):
         self.validate("SELECT x FROM y ORDER BY x ASC", "SELECT x FROM y ORDER BY x")
 